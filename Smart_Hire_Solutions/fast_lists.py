@@ -0,0 +1,121 @@
+"""
+values()-based list responses for the hot read-only API lists.
+
+A ModelSerializer list builds every row field by field through serializer objects. For
+big lists that is most of the response time. FastListMixin answers GET list requests
+from .values() rows with the same keys instead (FastJSONRenderer then writes them):
+
+- model columns and dotted sources (candidate.full_name) become values() lookups,
+  joined in the same query
+- file fields become their URLs and DecimalFields keep the serializer's text form
+- fields the database cannot produce on its own (methods, properties) come from the
+  view's `fast_sources`: {'key': 'lookup' or an expression}, or a (lookup, converter)
+  pair when the fetched value still needs the serializer method's Python step
+
+Writes, detail views and the browsable API keep using the serializer. Set
+API_FAST_LISTS=False to serve every list through the serializers again.
+"""
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db.models import F
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+def _file_url(model_field, request):
+    storage = model_field.storage
+
+    def to_url(name):
+        if not name:
+            return None
+        url = storage.url(name)
+        return request.build_absolute_uri(url) if request is not None else url
+    return to_url
+
+
+def values_queryset(queryset, serializer, sources=None, extra=()):
+    """
+    `queryset` as .values() dicts keyed like `serializer`'s output (plus the `extra` columns).
+    Returns the values queryset and the per-key converters to apply to the fetched rows.
+    """
+    serializer = getattr(serializer, 'child', serializer)
+    request = serializer.context.get('request')
+    model = queryset.model
+    sources = sources or {}
+    columns, aliases, converters = [], {}, {}
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        source = sources.get(name, field.source)
+        if isinstance(source, tuple):
+            source, converters[name] = source
+        if not isinstance(source, str):
+            aliases[name] = source  # Expression
+            continue
+        if source == '*':
+            raise ImproperlyConfigured(f"{type(serializer).__name__}.{name} needs a fast_sources entry.")
+        head = source.split('.')[0]
+        try:
+            model_field = model._meta.get_field(head)
+        except FieldDoesNotExist:
+            raise ImproperlyConfigured(f"{type(serializer).__name__}.{name} needs a fast_sources entry.")
+
+        lookup = source.replace('.', '__')
+        if lookup == name:
+            columns.append(name)
+        else:
+            aliases[name] = F(lookup)
+        if isinstance(field, serializers.FileField) and '.' not in source and \
+                getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL):
+            converters[name] = _file_url(model_field, request)
+        elif isinstance(field, serializers.DecimalField):
+            converters[name] = field.to_representation
+
+    columns.extend(c for c in extra if c not in columns and c not in aliases)
+    return queryset.values(*columns, **aliases), converters
+
+
+def convert_rows(rows, converters):
+    if converters:
+        for row in rows:
+            for name, convert in converters.items():
+                value = row[name]
+                row[name] = convert(value) if value is not None else None
+    return rows
+
+
+def serialize_values(queryset, serializer, sources=None):
+    """All of `queryset` as serializer-shaped dicts (see values_queryset)."""
+    queryset, converters = values_queryset(queryset, serializer, sources)
+    return convert_rows(list(queryset), converters)
+
+
+class FastListMixin:
+    """
+    Serves list() from values() rows (see the module docstring). `fast_sources` supplies
+    the keys the serializer computes in Python; `projection_extra` columns are fetched for
+    the paginator and dropped from the output unless the serializer outputs them too.
+    """
+    fast_sources = {}
+    projection_extra = ()
+
+    def list(self, request, *args, **kwargs):
+        if not settings.API_FAST_LISTS or request.accepted_renderer.format != 'json':
+            return super().list(request, *args, **kwargs)
+
+        serializer = self.get_serializer()
+        queryset, converters = values_queryset(
+            self.filter_queryset(self.get_queryset()), serializer, self.fast_sources, self.projection_extra
+        )
+        hidden = [c for c in self.projection_extra if c not in serializer.fields]
+
+        page = self.paginate_queryset(queryset)
+        rows = convert_rows(list(page if page is not None else queryset), converters)
+        for row in rows if hidden else ():
+            for column in hidden:
+                del row[column]
+        if page is not None:
+            return self.get_paginated_response(rows)
+        return Response(rows)
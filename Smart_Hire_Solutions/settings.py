@@ -42,6 +42,7 @@ INSTALLED_APPS = [
     'candidates',
     'frontend',
     'employees',
+    'tasks',
 ]
 
 SITE_ID = 1
@@ -127,8 +128,17 @@ REST_FRAMEWORK = {
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
+    # orjson-backed JSON (Smart_Hire_Solutions.renderers)
+    'DEFAULT_RENDERER_CLASSES': (
+        'Smart_Hire_Solutions.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
 }
 
+# Hot read-only lists (jobs, rankings, payroll, leaves) answered from values() rows
+# instead of per-row serializers (Smart_Hire_Solutions.fast_lists)
+API_FAST_LISTS = os.getenv('API_FAST_LISTS', 'True') == 'True'
+
 # Simple JWT settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
@@ -161,13 +171,94 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 X_FRAME_OPTIONS = 'SAMEORIGIN'
 
 # --- EMAIL CONFIGURATION ---
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
-EMAIL_HOST = 'smtp.gmail.com'
-EMAIL_PORT = 587
-EMAIL_USE_TLS = True
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+EMAIL_HOST = os.getenv('EMAIL_HOST', 'smtp.gmail.com')   # e.g. localhost + port 1025 for a local SMTP stand-in
+EMAIL_PORT = int(os.getenv('EMAIL_PORT', 587))
+EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'True') == 'True'
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')          # Secured
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')  # Secured
 
+# --- EMAIL OUTBOX ---
+# Invites are stored in the outbox with the status change and sent by the task workers
+# over one SMTP connection per batch (tasks.outbox).
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', 100))            # Emails per connection
+EMAIL_OUTBOX_RATE_PER_SECOND = float(os.getenv('EMAIL_OUTBOX_RATE_PER_SECOND', 5))  # 0 = no limit
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', 5))
+EMAIL_OUTBOX_RETRY_DELAY = int(os.getenv('EMAIL_OUTBOX_RETRY_DELAY', 60))           # Seconds, multiplied by attempt number
+
+# --- BACKGROUND TASK QUEUE ---
+# Postgres-backed queue processed by `python manage.py run_worker`
+TASK_WORKER_CONCURRENCY = int(os.getenv('TASK_WORKER_CONCURRENCY', 2))
+TASK_POLL_INTERVAL = float(os.getenv('TASK_POLL_INTERVAL', 1.0))   # Seconds between polls when idle
+TASK_MAX_ATTEMPTS = int(os.getenv('TASK_MAX_ATTEMPTS', 3))
+TASK_RETRY_DELAY = int(os.getenv('TASK_RETRY_DELAY', 30))          # Seconds, multiplied by attempt number
+TASK_LOCK_TIMEOUT = int(os.getenv('TASK_LOCK_TIMEOUT', 600))       # Reclaim tasks from crashed workers
+TASK_HEARTBEAT_INTERVAL = int(os.getenv('TASK_HEARTBEAT_INTERVAL', 60))  # Running tasks renew their lock this often (< TASK_LOCK_TIMEOUT)
+
+# --- EMBEDDING MICRO-BATCHING ---
+# Concurrent encode() calls are grouped into one Jina forward pass
+EMBEDDING_MAX_BATCH_SIZE = int(os.getenv('EMBEDDING_MAX_BATCH_SIZE', 16))
+EMBEDDING_MAX_WAIT_MS = float(os.getenv('EMBEDDING_MAX_WAIT_MS', 10))
+
+# --- SHARED MODEL SERVER ---
+# Path of the Unix socket served by `python manage.py run_model_server`.
+# Leave empty to load GLiNER/Jina inside each worker process instead.
+MODEL_SERVER_SOCKET = os.getenv('MODEL_SERVER_SOCKET', '')
+MODEL_SERVER_TIMEOUT = float(os.getenv('MODEL_SERVER_TIMEOUT', 60))
+
+# --- AI MODELS ---
+GLINER_MODEL_NAME = os.getenv('GLINER_MODEL_NAME', 'urchade/gliner_small-v2.1')
+JINA_MODEL_PATH = os.getenv('JINA_MODEL_PATH', str(BASE_DIR / 'ml_models' / 'my_finetuned_jina'))
+# Version stamped on cached embeddings (jobs.stages). Empty = fingerprint of the model directory,
+# so swapping the files in JINA_MODEL_PATH makes `manage.py reprocess` re-embed everything.
+JINA_MODEL_VERSION = os.getenv('JINA_MODEL_VERSION', '')
+# Models load on first use (jobs.model_registry); the dev server and run_worker warm them up
+# at startup unless MODEL_EAGER_WARMUP=False. Past the memory budget (0 = none), the least
+# recently used models are unloaded.
+MODEL_EAGER_WARMUP = os.getenv('MODEL_EAGER_WARMUP', 'True') == 'True'
+MODEL_MEMORY_BUDGET_MB = int(os.getenv('MODEL_MEMORY_BUDGET_MB', 0))
+MODEL_LOAD_RETRY_SECONDS = int(os.getenv('MODEL_LOAD_RETRY_SECONDS', 60))  # Wait after a failed load before trying again
+
+# --- PDF TEXT EXTRACTION ---
+PDF_MAX_PAGES = int(os.getenv('PDF_MAX_PAGES', 40))                 # Pages beyond this are ignored
+PDF_MAX_TEXT_CHARS = int(os.getenv('PDF_MAX_TEXT_CHARS', 400000))   # Characters (not bytes) of text kept per document
+PDF_PARALLEL_MIN_PAGES = int(os.getenv('PDF_PARALLEL_MIN_PAGES', 16))  # Use the process pool from this size
+PDF_PARALLEL_WORKERS = int(os.getenv('PDF_PARALLEL_WORKERS', 4))
+
+# --- GLINER SLIDING WINDOW ---
+# GLiNER truncates at ~384 words; longer texts are split into overlapping windows
+GLINER_WINDOW_WORDS = int(os.getenv('GLINER_WINDOW_WORDS', 300))
+GLINER_WINDOW_OVERLAP = int(os.getenv('GLINER_WINDOW_OVERLAP', 50))
+GLINER_BATCH_SIZE = int(os.getenv('GLINER_BATCH_SIZE', 16))  # Windows per forward pass in bulk ingestion
+
+# --- PIPELINE METRICS ---
+# Stage latencies, document sizes and error counts (jobs.metrics), served in the Prometheus
+# text format on /metrics and, for task workers, on `run_worker --metrics-port`.
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'False') == 'True'
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')                    # If set, scrapers must send it as a Bearer token
+METRICS_WORKER_PORT = int(os.getenv('METRICS_WORKER_PORT', 0))    # Default for run_worker --metrics-port (0 = off)
+
+# --- BULK CV INGESTION ---
+# HR bulk uploads (many PDFs or ZIP archives) are analysed in chunks by the task workers
+INGEST_CHUNK_SIZE = int(os.getenv('INGEST_CHUNK_SIZE', 32))     # Applications per ingestion task
+INGEST_MAX_FILES = int(os.getenv('INGEST_MAX_FILES', 2000))     # PDFs accepted per upload
+INGEST_MAX_FILE_MB = int(os.getenv('INGEST_MAX_FILE_MB', 10))   # Larger PDFs (also inside ZIPs) are skipped
+
+# --- SKILLS TAXONOMY ---
+# Keyword safety net for CV analysis: a text file with one skill per line ('#' comments), matched
+# in one Aho-Corasick pass (jobs.skills). The bundled file covers common tech skills; point this at
+# a larger taxonomy to extend it. Changing the file re-runs the CV entity stage on `manage.py reprocess`.
+SKILLS_TAXONOMY_PATH = os.getenv('SKILLS_TAXONOMY_PATH', str(BASE_DIR / 'jobs' / 'data' / 'skills_taxonomy.txt'))
+
+# --- TALENT POOL SEARCH ---
+# In-process HNSW index over every CV embedding (exact numpy search if hnswlib is missing)
+TALENT_INDEX_DIR = os.getenv('TALENT_INDEX_DIR', str(BASE_DIR / 'indexes' / 'talent_pool'))
+TALENT_INDEX_SAVE_INTERVAL = int(os.getenv('TALENT_INDEX_SAVE_INTERVAL', 300))  # Seconds between saves to disk
+TALENT_INDEX_M = int(os.getenv('TALENT_INDEX_M', 16))
+TALENT_INDEX_EF_CONSTRUCTION = int(os.getenv('TALENT_INDEX_EF_CONSTRUCTION', 200))
+TALENT_INDEX_EF_SEARCH = int(os.getenv('TALENT_INDEX_EF_SEARCH', 64))
+TALENT_POOL_SUGGESTIONS = int(os.getenv('TALENT_POOL_SUGGESTIONS', 20))  # Past applicants suggested per new job
+
 # --- Social Login Configuration ---
 SOCIALACCOUNT_PROVIDERS = {
     'google': {
@@ -2,9 +2,11 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from jobs.views import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),  # Prometheus scrape target
     path('accounts/', include('allauth.urls')),
     path("api/users/", include("users.urls", namespace="users")),
     path("api/jobs/", include("jobs.urls", namespace="jobs")),
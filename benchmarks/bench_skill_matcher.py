@@ -0,0 +1,94 @@
+"""
+Per-CV timing of the keyword safety net: one regex per skill vs. the Aho-Corasick matcher.
+
+    python -m benchmarks.bench_skill_matcher [--skills 5000] [--cvs 200]
+
+The real taxonomy is padded with synthetic skill names up to --skills entries so the
+scaling is visible; CVs are synthetic text that mention a handful of real skills.
+"""
+import argparse
+import random
+import re
+import statistics
+import time
+from pathlib import Path
+
+from jobs.skills import SkillMatcher, load_taxonomy
+
+TAXONOMY_PATH = Path(__file__).resolve().parent.parent / 'jobs' / 'data' / 'skills_taxonomy.txt'
+
+FILLER = (
+    "experienced engineer delivered projects with the team and improved performance "
+    "built services maintained pipelines designed systems mentored juniors led releases "
+    "good communication stakeholders agile scrum reporting analysis testing"
+).split()
+
+
+def build_taxonomy(size, rng):
+    skills = load_taxonomy(TAXONOMY_PATH)
+    while len(skills) < size:
+        name = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(4, 12)))
+        if rng.random() < 0.3:
+            name += rng.choice(['.js', ' studio', '-cloud', ' db'])
+        if name not in skills:
+            skills.append(name)
+    return skills
+
+
+def build_cv(real_skills, rng, words=600):
+    tokens = [rng.choice(FILLER) for _ in range(words)]
+    for skill in rng.sample(real_skills, 12):
+        tokens.insert(rng.randrange(len(tokens)), skill.title())
+    return ' '.join(tokens)
+
+
+def regex_loop(skills, text):
+    text_lower = text.lower()
+    return [s for s in skills if re.search(r'\b' + re.escape(s) + r'\b', text_lower)]
+
+
+def time_per_cv(fn, cvs):
+    timings = []
+    for cv in cvs:
+        started = time.perf_counter()
+        fn(cv)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def report(name, timings):
+    print(
+        f"{name:<16} mean {statistics.mean(timings):8.3f} ms   "
+        f"median {statistics.median(timings):8.3f} ms   max {max(timings):8.3f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--skills', type=int, default=5000, help='Taxonomy size (real skills padded with synthetic ones)')
+    parser.add_argument('--cvs', type=int, default=200, help='Number of synthetic CVs')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    real_skills = load_taxonomy(TAXONOMY_PATH)
+    skills = build_taxonomy(args.skills, rng)
+    cvs = [build_cv(real_skills, rng) for _ in range(args.cvs)]
+
+    started = time.perf_counter()
+    matcher = SkillMatcher(skills)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    # Same skills found either way, except symbol-ended ones ('c++', 'c#') that \b could never match
+    word_skills = {s for s in skills if re.match(r'\w', s[0]) and re.match(r'\w', s[-1])}
+    for cv in cvs[:20]:
+        assert set(regex_loop(skills, cv)) & word_skills == set(matcher.find_skills(cv)) & word_skills
+
+    print(f"📊 {len(skills)} skills, {len(cvs)} CVs (~{len(cvs[0].split())} words each)")
+    print(f"Automaton build  {build_ms:8.1f} ms (once per process)")
+    report('Regex loop', time_per_cv(lambda cv: regex_loop(skills, cv), cvs))
+    report('Aho-Corasick', time_per_cv(matcher.find_skills, cvs))
+
+
+if __name__ == '__main__':
+    main()
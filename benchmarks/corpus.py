@@ -0,0 +1,124 @@
+"""
+Deterministic synthetic CVs and job descriptions for the benchmarks.
+
+PDFs are rendered with the CV builder's own code (frontend.utils.generate_ats_cv), so
+extraction is measured on the same layout real builder CVs have. Page count is driven
+by the number of experience / project entries.
+"""
+import random
+from pathlib import Path
+
+from frontend.utils import generate_ats_cv
+
+TAXONOMY_PATH = Path(__file__).resolve().parent.parent / 'jobs' / 'data' / 'skills_taxonomy.txt'
+
+FIRST_NAMES = ['Ayesha', 'Rahim', 'Maria', 'John', 'Wei', 'Fatima', 'Carlos', 'Priya', 'Omar', 'Elena']
+LAST_NAMES = ['Khan', 'Smith', 'Garcia', 'Chen', 'Rahman', 'Ivanova', 'Okafor', 'Patel', 'Silva', 'Novak']
+TITLES = ['Software Engineer', 'Backend Developer', 'Data Analyst', 'DevOps Engineer', 'ML Engineer', 'Frontend Developer']
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark Industries', 'Wayne Enterprises']
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+FILLER = (
+    "designed and maintained services for internal teams improved latency and reliability of "
+    "production systems mentored junior engineers wrote documentation and automated releases "
+    "worked with product owners on requirements reviewed code and led incident postmortems"
+).split()
+
+# Roughly one page of builder output per this many experience entries
+ENTRIES_PER_PAGE = 5
+
+
+def load_skills():
+    with open(TAXONOMY_PATH, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+
+def _sentence(rng, skills, words=40):
+    tokens = [rng.choice(FILLER) for _ in range(words)]
+    for skill in rng.sample(skills, 3):
+        tokens.insert(rng.randrange(len(tokens)), skill)
+    return ' '.join(tokens).capitalize() + '.'
+
+
+def _date_range(rng, year):
+    start_month, end_month = rng.choice(MONTHS), rng.choice(MONTHS)
+    length = rng.randint(1, 3)
+    return f"{start_month} {year} - {end_month} {year + length}", year + length
+
+
+def cv_data(rng, skills, pages=1):
+    """Form data for generate_ats_cv that renders to about `pages` pages."""
+    entries = max(1, pages * ENTRIES_PER_PAGE)
+    year = 2000
+    experience = []
+    for _ in range(entries):
+        dates, year = _date_range(rng, year)
+        experience.append({
+            'title': rng.choice(TITLES), 'company': rng.choice(COMPANIES), 'dates': dates,
+            'position': _sentence(rng, skills),
+        })
+    return {
+        'full_name': f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        'email': 'candidate@example.com', 'phone': '+880 1700 000000', 'location': 'Dhaka',
+        'summary': _sentence(rng, skills, words=60),
+        'skills': ', '.join(rng.sample(skills, 15)),
+        'experience_list': experience,
+        'education_list': [{'degree': 'BSc in Computer Science', 'college': 'State University', 'dates': '1996 - 2000'}],
+        'projects_list': [
+            {'name': f"Project {i + 1}", 'tech': ', '.join(rng.sample(skills, 3)), 'desc': _sentence(rng, skills, words=30)}
+            for i in range(max(1, entries // 2))
+        ],
+    }
+
+
+def job_data(rng, skills, pages=1):
+    """A job description laid out with the same builder (summary = description, skills = requirements)."""
+    required = rng.sample(skills, 8)
+    years = rng.randint(1, 8)
+    return {
+        'full_name': rng.choice(TITLES),
+        'email': 'hr@example.com', 'phone': '', 'location': 'Remote',
+        'summary': f"We need a {rng.choice(TITLES)} with {years}+ years of experience. " + _sentence(rng, skills, words=80),
+        'skills': ', '.join(required),
+        'experience_list': [
+            {'title': 'Responsibility', 'company': '', 'dates': '', 'position': _sentence(rng, skills)}
+            for _ in range(max(1, pages * ENTRIES_PER_PAGE))
+        ],
+    }
+
+
+def cv_pdf(rng, skills, pages=1):
+    return generate_ats_cv(cv_data(rng, skills, pages)).getvalue()
+
+
+def job_pdf(rng, skills, pages=1):
+    return generate_ats_cv(job_data(rng, skills, pages)).getvalue()
+
+
+def cv_text(rng, skills, words=600):
+    """Plain CV-like text with dated roles, for the text-only benchmarks."""
+    parts, year = [], 2005
+    for _ in range(max(1, words // 60)):
+        dates, year = _date_range(rng, year)
+        parts.append(f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)} {dates}. {_sentence(rng, skills, words=50)}")
+    return ' '.join(parts)
+
+
+def write_corpus(directory, seed=0, page_counts=(1, 5, 20), per_size=3):
+    """Writes CV and job PDFs to `directory`; returns {pages: [cv paths]} and the job paths."""
+    rng = random.Random(seed)
+    skills = load_skills()
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    cvs = {}
+    for pages in page_counts:
+        cvs[pages] = []
+        for i in range(per_size):
+            path = directory / f"cv_{pages}p_{i}.pdf"
+            path.write_bytes(cv_pdf(rng, skills, pages))
+            cvs[pages].append(path)
+    jobs = []
+    for i in range(per_size):
+        path = directory / f"job_{i}.pdf"
+        path.write_bytes(job_pdf(rng, skills))
+        jobs.append(path)
+    return cvs, jobs
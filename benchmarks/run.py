@@ -0,0 +1,444 @@
+"""
+Offline benchmark suite for the CV / job pipeline: no GLiNER or Jina weights needed.
+
+    python -m benchmarks.run [--quick] [--only extract,ranking] [--output results.json]
+    python -m benchmarks.run --save-baseline            # store this machine's baseline
+    python -m benchmarks.run --compare [baseline.json]  # exit 1 on regressions
+
+CVs and job descriptions are synthetic PDFs rendered by the CV builder (benchmarks.corpus);
+the models are deterministic stubs (benchmarks.stubs). Ranking and serialization benchmarks
+run against a throwaway test database (like `manage.py test`), seeded with --applicants
+applicants (and --rows jobs, payroll rows and leave requests).
+Every benchmark reports the median / p95 time per run in ms; a run covers `items` documents.
+"""
+import argparse
+import contextlib
+import copy
+import io
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Smart_Hire_Solutions.settings')
+django.setup()
+
+import numpy as np  # noqa: E402
+from django.apps import apps  # noqa: E402
+
+from candidates.utils import calculate_cosine_similarity, calculate_experience_years, run_cv_stages  # noqa: E402
+from frontend.utils import generate_ats_cv  # noqa: E402
+from jobs.extraction import extract_text_from_pdf  # noqa: E402
+from jobs.skills import get_skill_matcher  # noqa: E402
+
+from . import corpus  # noqa: E402
+from .stubs import StubEmbedder, StubGLiNER  # noqa: E402
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+DEFAULT_BASELINE = RESULTS_DIR / 'baseline.json'
+EMBEDDING_DIM = 768
+
+
+# --- Timing ---
+def measure(fn, repeat, items=1, warmup=1):
+    """Runs fn() warmup + repeat times with stdout silenced (the pipeline prints a lot)."""
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            fn()
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - started) * 1000)
+    ordered = sorted(timings)
+    median = statistics.median(ordered)
+    return {
+        'unit': 'ms', 'runs': repeat, 'items': items,
+        'median': round(median, 3),
+        'mean': round(statistics.mean(ordered), 3),
+        'p95': round(ordered[math.ceil(0.95 * len(ordered)) - 1], 3),
+        'min': round(ordered[0], 3),
+        'items_per_s': round(items / (median / 1000), 1) if median else None,
+    }
+
+
+def cycle(values):
+    """Callable returning the next value on each call, so repeated runs do not hit the same input."""
+    state = {'i': 0}
+
+    def next_value():
+        value = values[state['i'] % len(values)]
+        state['i'] += 1
+        return value
+    return next_value
+
+
+# --- Benchmarks ---
+def bench_extract(ctx):
+    results = {}
+    for pages, paths in ctx.cv_paths.items():
+        next_path = cycle(paths)
+        results[f'extract_pdf_{pages}p'] = measure(lambda: extract_text_from_pdf(str(next_path())), ctx.repeat)
+    return results
+
+
+def bench_text(ctx):
+    texts = ctx.texts
+    next_text = cycle(texts)
+    matcher = get_skill_matcher()
+    matcher.find_skills('warm up')  # Automaton is built once per process
+    return {
+        'experience_years': measure(lambda: calculate_experience_years(next_text()), ctx.repeat * 5),
+        'skills_fallback': measure(lambda: matcher.find_skills(next_text()), ctx.repeat * 5),
+    }
+
+
+def bench_similarity(ctx):
+    rng = np.random.default_rng(ctx.seed)
+    vectors = rng.standard_normal((1001, EMBEDDING_DIM)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    job_vec, cv_vecs = vectors[0], vectors[1:]
+    return {
+        'cosine_similarity_x1000': measure(
+            lambda: [calculate_cosine_similarity(vec, job_vec) for vec in cv_vecs], ctx.repeat, items=len(cv_vecs)
+        ),
+    }
+
+
+def bench_render(ctx):
+    rng = random.Random(ctx.seed)
+    results = {}
+    for pages in (1, 5):
+        data = [corpus.cv_data(rng, ctx.skills, pages) for _ in range(3)]
+        next_data = cycle(data)
+        results[f'ats_pdf_render_{pages}p'] = measure(lambda: generate_ats_cv(next_data()), ctx.repeat)
+    return results
+
+
+def bench_pipeline(ctx):
+    """Extract -> clean -> entities (+ safety net) -> embed for a batch of fresh 1-page CVs."""
+    from candidates.models import ParsedCV
+
+    jobs_config = apps.get_app_config('jobs')
+    jobs_config.gliner_model, jobs_config.jina_model = ctx.gliner, ctx.embedder
+    paths = [str(p) for p in ctx.cv_paths[min(ctx.cv_paths)]]
+    batch = [paths[i % len(paths)] for i in range(ctx.batch)]
+    counter = iter(range(10 ** 9))
+
+    def run():
+        # Unique hashes so no stage is skipped as cached
+        rows = [ParsedCV(sha256=f"bench-{next(counter)}") for _ in batch]
+        run_cv_stages(rows, batch, ctx.gliner)
+
+    return {'cv_pipeline_batch': measure(run, ctx.repeat, items=len(batch))}
+
+
+@contextlib.contextmanager
+def test_database():
+    """A throwaway test database (like `manage.py test`) for the DB-backed groups."""
+    from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+    setup_test_environment()
+    with contextlib.redirect_stdout(io.StringIO()):
+        old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+
+
+def bench_ranking(ctx):
+    with test_database():
+        return _run_ranking(ctx)
+
+
+def _seed_ranking(ctx):
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.hashers import make_password
+
+    from candidates.models import Application, ApplicationSkill
+    from candidates.scoring import rank_job_applications
+    from jobs.models import Job
+    from jobs.skills import replace_skill_links, set_job_skills
+
+    User = get_user_model()
+    rng = random.Random(ctx.seed)
+    vectors = np.random.default_rng(ctx.seed).standard_normal((ctx.applicants + 1, EMBEDDING_DIM)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    hr = User.objects.create(email='bench-hr@example.com', full_name='Bench HR', role='HR', password=make_password(None))
+    required = rng.sample(ctx.skills, 8)
+    job = Job.objects.create(
+        posted_by=hr, title='Benchmark Engineer', description_text='Synthetic job', processing_status='SCORED',
+        gliner_entities=[{'label': 'Skill', 'text': s} for s in required] + [{'label': 'Min_Years_Req', 'text': '3'}],
+        jina_embedding=vectors[0],
+    )
+    set_job_skills(job)
+
+    password = make_password(None)
+    candidates = User.objects.bulk_create([
+        User(email=f'bench-{i}@example.com', full_name=f'Candidate {i}', role='Candidate', password=password)
+        for i in range(ctx.applicants)
+    ], batch_size=1000)
+    applications = Application.objects.bulk_create([
+        Application(
+            job=job, candidate=candidate, cv_file=f'cvs/bench-{i}.pdf', processing_status='SCORED',
+            cv_embedding=vectors[i + 1], similarity_score=round(rng.uniform(20, 90), 2),
+            skill_coverage=rng.random(), experience_years=round(rng.uniform(0, 15), 1),
+            extracted_data=[{'label': 'Skill', 'text': s} for s in rng.sample(ctx.skills, 12) + rng.sample(required, 3)],
+        )
+        for i, candidate in enumerate(candidates)
+    ], batch_size=1000)
+    replace_skill_links(ApplicationSkill, 'application_id', {a.id: a.extracted_data for a in applications})
+    with contextlib.redirect_stdout(io.StringIO()):
+        rank_job_applications(job)
+    return hr, job, required
+
+
+def _run_ranking(ctx):
+    from rest_framework.test import APIClient
+
+    from candidates.models import Application
+    from candidates.scoring import rank_job_applications, rescore_job_applications
+    from candidates.utils import filter_applications
+
+    hr, job, required = _seed_ranking(ctx)
+    client = APIClient()
+    client.force_authenticate(hr)
+    url = f'/api/candidates/job/{job.id}/ranking/'
+    skills = ','.join(required[:2])
+
+    def top_filtered():
+        queryset = filter_applications(Application.objects.filter(job=job), skills=skills, min_years='3')
+        return list(queryset.order_by('-match_score').values_list('id', flat=True)[:50])
+
+    return {
+        'ranking_api': measure(lambda: client.get(url), ctx.repeat, items=ctx.applicants),
+        'ranking_filter_top50': measure(top_filtered, ctx.repeat * 5),
+        'rank_job_applications': measure(lambda: rank_job_applications(job), ctx.repeat, items=ctx.applicants),
+        'rescore_job_applications': measure(lambda: rescore_job_applications(job), ctx.repeat, items=ctx.applicants),
+    }
+
+
+def bench_serialization(ctx):
+    """Hot list endpoints: per-row ModelSerializer + JSONRenderer vs. values() rows + orjson."""
+    with test_database():
+        return _run_serialization(ctx)
+
+
+def _seed_lists(ctx, rows):
+    import datetime
+    from decimal import Decimal
+
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.hashers import make_password
+
+    from employees.models import Employee, LeaveRequest, Payroll
+    from jobs.models import Job
+
+    hr, job, _ = _seed_ranking(ctx)  # `--applicants` applications for one job
+    User = get_user_model()
+    rng = random.Random(ctx.seed)
+    vectors = np.random.default_rng(ctx.seed).standard_normal((rows, EMBEDDING_DIM)).astype(np.float32)
+    Job.objects.bulk_create([
+        Job(
+            posted_by=hr, title=f'Job {i}', description_text=corpus.cv_text(rng, ctx.skills, words=120),
+            processed_text='synthetic', gliner_entities=[{'label': 'Skill', 'text': s} for s in rng.sample(ctx.skills, 8)],
+            jina_embedding=vectors[i], processing_status='SCORED',
+        )
+        for i in range(rows - 1)
+    ], batch_size=1000)
+
+    password = make_password(None)
+    users = User.objects.bulk_create([
+        User(email=f'bench-emp-{i}@example.com', full_name=f'Employee {i}', role='Employee', password=password)
+        for i in range(rows // 10)
+    ])
+    employees = Employee.objects.bulk_create([
+        Employee(user=user, department='Engineering', designation='Engineer', phone_number='0170000000') for user in users
+    ])
+    start = datetime.date(2020, 1, 1)
+    Payroll.objects.bulk_create([
+        Payroll(
+            employee=employees[i % len(employees)], month=start + datetime.timedelta(days=31 * (i // len(employees))),
+            basic_salary=Decimal(rng.randint(30000, 90000)), bonuses=Decimal('1500.00'), deductions=Decimal('250.50'),
+        )
+        for i in range(rows)
+    ], batch_size=1000)
+    LeaveRequest.objects.bulk_create([
+        LeaveRequest(
+            employee=employees[i % len(employees)], leave_type='CASUAL', reason='Family event',
+            start_date=start + datetime.timedelta(days=i), end_date=start + datetime.timedelta(days=i + 2),
+        )
+        for i in range(rows)
+    ], batch_size=1000)
+    return job
+
+
+def _run_serialization(ctx):
+    from rest_framework.renderers import JSONRenderer
+
+    from candidates.models import Application
+    from candidates.serializers import ApplicationDetailSerializer, project_queryset
+    from employees.models import LeaveRequest, Payroll
+    from employees.serializers import LeaveRequestSerializer, PayrollSerializer
+    from employees.views import TOTAL_SALARY
+    from jobs.models import Job
+    from jobs.serializers import JobSerializer
+    from jobs.views import JobListCreateView
+    from Smart_Hire_Solutions.fast_lists import serialize_values
+    from Smart_Hire_Solutions.renderers import FastJSONRenderer
+
+    largest = max(ctx.rows)
+    list_ctx = copy.copy(ctx)
+    list_ctx.applicants = max(ctx.applicants, largest)  # Enough applicants for the largest list
+    job = _seed_lists(list_ctx, largest)
+    applications = Application.objects.filter(job=job).order_by('-match_score', '-id')
+    lists = {
+        # name: (queryset as the list view builds it, serializer class, fast_sources)
+        'jobs': (Job.objects.order_by('-created_at'), JobSerializer, JobListCreateView.fast_sources),
+        'applications': (applications, ApplicationDetailSerializer, {}),
+        'payroll': (Payroll.objects.order_by('id'), PayrollSerializer, {'total_salary': TOTAL_SALARY}),
+        'leaves': (LeaveRequest.objects.order_by('id'), LeaveRequestSerializer, {}),
+    }
+    slow_renderer, fast_renderer = JSONRenderer(), FastJSONRenderer()
+    results = {}
+    for name, (queryset, serializer_class, sources) in lists.items():
+        serializer = serializer_class(context={})
+        if name == 'applications':
+            queryset = project_queryset(queryset, serializer)  # What the ranking view already does
+        for rows in ctx.rows:
+            sliced = queryset[:rows]
+            results[f'list_{name}_{rows}_serializer'] = measure(
+                lambda: slow_renderer.render(serializer_class(sliced, many=True, context={}).data),
+                ctx.list_repeat, items=rows,
+            )
+            results[f'list_{name}_{rows}_fast'] = measure(
+                lambda: fast_renderer.render(serialize_values(sliced, serializer, sources)),
+                ctx.list_repeat, items=rows,
+            )
+    return results
+
+
+BENCHMARKS = {
+    'extract': bench_extract,
+    'text': bench_text,
+    'similarity': bench_similarity,
+    'render': bench_render,
+    'pipeline': bench_pipeline,
+    'ranking': bench_ranking,
+    'serialization': bench_serialization,
+}
+
+
+# --- Baseline comparison ---
+def compare(results, baseline, tolerance):
+    """Prints current vs. baseline medians; returns the names that got slower than the tolerance allows."""
+    regressions = []
+    print(f"\n{'benchmark':<36}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, current in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name:<36}{'-':>12}{current['median']:>12.3f}{'new':>10}")
+            continue
+        change = current['median'] / before['median'] - 1 if before['median'] else 0.0
+        flag = ''
+        if change > tolerance:
+            flag = '  ⚠️ regression'
+            regressions.append(name)
+        elif change < -tolerance:
+            flag = '  ✅ faster'
+        print(f"{name:<36}{before['median']:>12.3f}{current['median']:>12.3f}{change:>+10.0%}{flag}")
+    return regressions
+
+
+def write_json(path, payload):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2))
+    print(f"💾 Wrote {path}")
+
+
+class Context:
+    def __init__(self, args, workdir):
+        self.seed = args.seed
+        self.repeat = args.repeat
+        self.batch = args.batch
+        self.applicants = args.applicants
+        self.rows = args.rows
+        self.list_repeat = max(3, args.repeat // 2)  # 10k-row serializer runs take seconds each
+        self.skills = corpus.load_skills()
+        rng = random.Random(args.seed)
+        self.cv_paths, self.job_paths = corpus.write_corpus(workdir, seed=args.seed, page_counts=args.pages, per_size=3)
+        self.texts = [corpus.cv_text(rng, self.skills) for _ in range(20)]
+        self.gliner = StubGLiNER(self.skills)
+        self.embedder = StubEmbedder(EMBEDDING_DIM)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--only', help=f"Comma-separated groups to run ({', '.join(BENCHMARKS)}).")
+    parser.add_argument('--quick', action='store_true', help="Fewer runs and a smaller corpus (smoke test).")
+    parser.add_argument('--repeat', type=int, default=10, help="Timed runs per benchmark (some multiply it).")
+    parser.add_argument('--pages', type=lambda v: [int(p) for p in v.split(',')], default=[1, 5, 20], help="CV page counts, e.g. 1,5,20.")
+    parser.add_argument('--batch', type=int, default=32, help="CVs per pipeline batch (like INGEST_CHUNK_SIZE).")
+    parser.add_argument('--applicants', type=int, default=2000, help="Applicants seeded for the ranking benchmarks.")
+    parser.add_argument('--rows', type=lambda v: [int(r) for r in v.split(',')], default=[1000, 10000], help="List sizes for the serialization benchmarks.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=str(RESULTS_DIR / 'latest.json'), help="Where to write the JSON results.")
+    parser.add_argument('--save-baseline', action='store_true', help=f"Also write the results to {DEFAULT_BASELINE}.")
+    parser.add_argument('--compare', nargs='?', const=str(DEFAULT_BASELINE), help="Baseline JSON to compare against.")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Slowdown (fraction of the baseline median) flagged as a regression.")
+    args = parser.parse_args()
+    if args.quick:
+        args.repeat, args.pages, args.batch, args.applicants, args.rows = 3, [1, 5], 8, 200, [1000]
+
+    groups = args.only.split(',') if args.only else list(BENCHMARKS)
+    unknown = set(groups) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"Unknown benchmark group(s): {', '.join(sorted(unknown))}")
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='smarthire-bench-') as workdir:
+        ctx = Context(args, workdir)
+        for group in groups:
+            started = time.perf_counter()
+            group_results = BENCHMARKS[group](ctx)
+            for name, result in group_results.items():
+                print(f"{name:<36} median {result['median']:10.3f} ms   p95 {result['p95']:10.3f} ms   ({result['items']} item(s)/run)")
+            results.update(group_results)
+            print(f"   ⏱️ {group} took {time.perf_counter() - started:.1f}s")
+
+    payload = {
+        'meta': {
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(), 'platform': platform.platform(),
+            'args': {k: v for k, v in vars(args).items() if k not in ('output', 'compare', 'save_baseline')},
+        },
+        'results': results,
+    }
+    write_json(args.output, payload)
+    if args.save_baseline:
+        write_json(DEFAULT_BASELINE, payload)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())['results']
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n✅ No regressions.")
+
+
+if __name__ == '__main__':
+    main()
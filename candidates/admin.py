@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Application
+from .models import Application, IngestionJob, ParsedCV, TalentSuggestion
 
 @admin.register(Application)
 class ApplicationAdmin(admin.ModelAdmin):
@@ -8,13 +8,14 @@ class ApplicationAdmin(admin.ModelAdmin):
         'candidate_name', 
         'job_title', 
         'match_score_display', 
+        'processing_status', 
         'status', 
         'has_reference', 
         'created_at'
     )
     
     # Sidebar filters
-    list_filter = ('job', 'status', 'has_reference', 'created_at')
+    list_filter = ('job', 'status', 'processing_status', 'has_reference', 'created_at')
     
     # Search by candidate name, email, or job title
     search_fields = (
@@ -30,12 +31,19 @@ class ApplicationAdmin(admin.ModelAdmin):
         'extracted_data', 
         'cv_embedding', 
         'match_score', 
+        'similarity_score', 
+        'skill_coverage', 
+        'match_report', 
+        'experience_years', 
+        'processing_status', 
+        'cv_sha256', 
+        'embedded_at', 
         'created_at'
     )
 
     fieldsets = (
         ('Application Info', {
-            'fields': ('job', 'candidate', 'status', 'cv_file')
+            'fields': ('job', 'candidate', 'status', 'cv_file', 'cv_sha256')
         }),
         ('Reference Info', {
             'fields': ('has_reference', 'reference_name')
@@ -45,7 +53,7 @@ class ApplicationAdmin(admin.ModelAdmin):
         }),
         ('AI Analysis', {
             'classes': ('collapse',),
-            'fields': ('match_score', 'extracted_data', 'cv_text_content', 'cv_embedding')
+            'fields': ('processing_status', 'match_score', 'similarity_score', 'skill_coverage', 'match_report', 'experience_years', 'extracted_data', 'cv_text_content', 'cv_embedding', 'embedded_at')
         }),
     )
 
@@ -60,4 +68,28 @@ class ApplicationAdmin(admin.ModelAdmin):
 
     def match_score_display(self, obj):
         return f"{obj.match_score}%"
-    match_score_display.short_description = 'AI Score'
\ No newline at end of file
+    match_score_display.short_description = 'AI Score'
+
+
+@admin.register(ParsedCV)
+class ParsedCVAdmin(admin.ModelAdmin):
+    list_display = ('sha256', 'created_at')
+    search_fields = ('sha256',)
+    readonly_fields = ('sha256', 'text_content', 'extracted_data', 'embedding', 'stage_keys', 'created_at')
+
+
+
+@admin.register(TalentSuggestion)
+class TalentSuggestionAdmin(admin.ModelAdmin):
+    list_display = ('job', 'rank', 'candidate', 'score', 'created_at')
+    list_filter = ('job',)
+    search_fields = ('candidate__full_name', 'candidate__email', 'job__title')
+    readonly_fields = ('job', 'candidate', 'application', 'score', 'rank', 'created_at')
+
+
+@admin.register(IngestionJob)
+class IngestionJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'job', 'status', 'total', 'processed', 'failed', 'created_by', 'created_at')
+    list_filter = ('status',)
+    search_fields = ('job__title',)
+    readonly_fields = ('job', 'created_by', 'total', 'processed', 'failed', 'errors', 'created_at', 'updated_at', 'finished_at')
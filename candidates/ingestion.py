@@ -0,0 +1,167 @@
+"""
+Bulk CV ingestion for HR uploads: many PDFs and/or ZIP archives of PDFs.
+
+The upload request only stores the files (content-addressed) and creates the placeholder
+candidates and their applications with bulk_create, then queues the analysis in chunks of
+INGEST_CHUNK_SIZE. Each chunk task runs the CV stages over all of its files at once
+(PDFs in the process pool, GLiNER windows in shared batches, embeddings through the
+micro-batcher) and writes the results back with bulk queries, so several workers can share
+one upload. Progress is counted on the IngestionJob row, which the upload page polls.
+"""
+import os
+import uuid
+import zipfile
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Application, IngestionJob
+from .storage import cv_storage_name, hash_file
+from .utils import process_applications_batch
+
+User = get_user_model()
+
+# Applications of a chunk that have not been scored or failed yet
+UNFINISHED_STATUSES = ['QUEUED', 'EXTRACTING', 'EMBEDDING']
+
+
+def iter_pdf_uploads(uploads, errors):
+    """
+    Yields (filename, file) for every PDF in the uploads, opening ZIP archives.
+    Rejected entries (other types, oversized files, past INGEST_MAX_FILES) are described in `errors`.
+    """
+    max_bytes = settings.INGEST_MAX_FILE_MB * 1024 * 1024
+    count = 0
+
+    def accept(name, size):
+        nonlocal count
+        if count >= settings.INGEST_MAX_FILES:
+            errors.append(f"Skipped {name}: more than {settings.INGEST_MAX_FILES} files in one upload.")
+            return False
+        if size > max_bytes:
+            errors.append(f"Skipped {name}: larger than {settings.INGEST_MAX_FILE_MB} MB.")
+            return False
+        count += 1
+        return True
+
+    for upload in uploads:
+        name = upload.name.lower()
+        if name.endswith('.pdf'):
+            if accept(upload.name, upload.size):
+                yield upload.name, upload
+        elif name.endswith('.zip'):
+            try:
+                archive = zipfile.ZipFile(upload)
+            except zipfile.BadZipFile:
+                errors.append(f"Skipped {upload.name}: not a valid ZIP archive.")
+                continue
+            with archive:
+                for info in archive.infolist():
+                    member = os.path.basename(info.filename)
+                    if info.is_dir() or info.filename.startswith('__MACOSX/') or not member.lower().endswith('.pdf'):
+                        continue
+                    if accept(member, info.file_size):
+                        yield member, ContentFile(archive.read(info), name=member)
+        else:
+            errors.append(f"Skipped {upload.name}: only PDF and ZIP files are accepted.")
+
+
+def _placeholder_candidate(filename):
+    # "jane_doe-cv.pdf" -> "Jane Doe Cv", with a unique placeholder email until the CV is parsed
+    clean_name = filename.rsplit('.', 1)[0].replace('_', ' ').replace('-', ' ').title()
+    unique_id = str(uuid.uuid4())[:8]
+    email = f"{clean_name.replace(' ', '.').lower()}.{unique_id}@pending.parsing"
+    return User(email=email, full_name=clean_name, role='Candidate', password=make_password(None))
+
+
+def create_ingestion(job, created_by, uploads):
+    """
+    Stores the uploaded CVs and creates one placeholder candidate + application per PDF with
+    bulk queries, then queues their analysis. Returns (ingestion or None if nothing was accepted, errors).
+    """
+    errors = []
+    storage = Application._meta.get_field('cv_file').storage
+    entries = []
+    for filename, f in iter_pdf_uploads(uploads, errors):
+        digest = hash_file(f)
+        entries.append((filename, storage.save(cv_storage_name(digest, filename), f), digest))
+    if not entries:
+        return None, errors
+
+    with transaction.atomic():
+        ingestion = IngestionJob.objects.create(job=job, created_by=created_by, total=len(entries), errors=errors)
+        candidates = User.objects.bulk_create([_placeholder_candidate(filename) for filename, _, _ in entries])
+        applications = Application.objects.bulk_create([
+            Application(
+                job=job, candidate=candidate, cv_file=name, cv_sha256=digest,
+                ingestion=ingestion, processing_status='QUEUED',
+            )
+            for candidate, (_, name, digest) in zip(candidates, entries)
+        ])
+        queue_ingestion(ingestion, [application.id for application in applications])
+    return ingestion, errors
+
+
+def queue_ingestion(ingestion, application_ids):
+    from tasks.queue import enqueue
+
+    size = settings.INGEST_CHUNK_SIZE
+    for start in range(0, len(application_ids), size):
+        enqueue('ingest_cvs', ingestion_id=ingestion.id, application_ids=application_ids[start:start + size])
+
+
+def ingest_cvs_task(ingestion_id, application_ids):
+    """
+    Task handler: analyses one chunk of a bulk upload (see tasks.queue).
+    Applications already scored or failed are skipped, so a retried chunk picks up where it stopped.
+    """
+    if not IngestionJob.objects.filter(pk=ingestion_id).exists():
+        return
+    jobs_config = apps.get_app_config('jobs')
+    # Raises while the model server is down, so the queue retries later
+    jobs_config.require_models()
+    IngestionJob.objects.filter(pk=ingestion_id, status='PENDING').update(status='RUNNING')
+
+    applications = list(
+        Application.objects.select_related('job')
+        .filter(id__in=application_ids, processing_status__in=UNFINISHED_STATUSES)
+    )
+    if applications:
+        Application.objects.filter(id__in=[a.id for a in applications]).update(processing_status='EXTRACTING')
+
+        def count(scored, failed):
+            # Runs in the transaction that writes the results, so the counters never drift
+            IngestionJob.objects.filter(pk=ingestion_id).update(
+                processed=F('processed') + scored, failed=F('failed') + failed, updated_at=timezone.now(),
+            )
+            print(f"✅ Ingestion #{ingestion_id}: {scored} scored, {failed} failed in this chunk")
+
+        process_applications_batch(applications, jobs_config.gliner_model, on_written=count)
+
+    _finish_if_complete(ingestion_id)
+
+
+def ingest_cvs_failed(ingestion_id, application_ids):
+    """
+    Failure handler (see tasks.queue): the chunk ran out of retries, so its unfinished
+    applications are marked FAILED and counted, letting the ingestion finish.
+    """
+    with transaction.atomic():
+        failed = Application.objects.filter(
+            id__in=application_ids, processing_status__in=UNFINISHED_STATUSES
+        ).update(processing_status='FAILED')
+        IngestionJob.objects.filter(pk=ingestion_id).update(failed=F('failed') + failed, updated_at=timezone.now())
+    print(f"❌ Ingestion #{ingestion_id}: chunk gave up, {failed} application(s) marked failed")
+    _finish_if_complete(ingestion_id)
+
+
+def _finish_if_complete(ingestion_id):
+    IngestionJob.objects.filter(
+        pk=ingestion_id, total__lte=F('processed') + F('failed')
+    ).exclude(status='DONE').update(status='DONE', finished_at=timezone.now())
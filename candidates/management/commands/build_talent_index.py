@@ -0,0 +1,30 @@
+import shutil
+import time
+
+from django.core.management.base import BaseCommand
+
+from candidates.talent_pool import TalentIndex
+
+
+class Command(BaseCommand):
+    help = "Brings the talent pool search index up to date and saves it to TALENT_INDEX_DIR."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild', action='store_true',
+            help="Discard the saved index and rebuild it from every stored CV embedding.",
+        )
+
+    def handle(self, *args, **options):
+        index = TalentIndex()
+        if options['rebuild']:
+            shutil.rmtree(index.directory, ignore_errors=True)
+        else:
+            index.load()
+
+        started = time.perf_counter()
+        added = index.sync()
+        index.save()
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Talent pool index: {len(index)} CVs ({added} added) in {time.perf_counter() - started:.1f}s"
+        ))
@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from candidates.management.commands.reprocess import iter_chunks
+from candidates.models import Application
+from candidates.storage import cv_storage_name, hash_file
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves CV files uploaded before content addressing to their cvs/<hash> path: each file is "
+        "hashed, stored once under its content-addressed name, the applications are repointed to it "
+        "and the old copies are deleted once nothing refers to them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=200, help="Applications read and written per batch.")
+        parser.add_argument('--dry-run', action='store_true', help="Only count the files that would move.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        storage = Application._meta.get_field('cv_file').storage
+        moved = deleted = unreadable = 0
+
+        rows = Application.objects.exclude(cv_file='').only('id', 'cv_file', 'cv_sha256')
+        for chunk in iter_chunks(rows, options['chunk_size']):
+            old_names = set()
+            for application in chunk:
+                name = application.cv_file.name
+                if application.cv_sha256 and name == cv_storage_name(application.cv_sha256, name):
+                    continue  # Already content-addressed
+                try:
+                    with storage.open(name, 'rb') as f:
+                        digest = hash_file(f)
+                        target = cv_storage_name(digest, name)
+                        if not options['dry_run'] and target != name:
+                            storage.save(target, f)  # Reuses the file when the same bytes are already stored
+                except OSError:
+                    unreadable += 1
+                    continue
+
+                moved += 1
+                if options['dry_run']:
+                    continue
+                Application.objects.filter(pk=application.pk).update(cv_file=target, cv_sha256=digest)
+                if target != name:
+                    old_names.add(name)
+
+            # Legacy names can be shared (copied rows); delete a file only when no application still uses it
+            still_used = set(Application.objects.filter(cv_file__in=old_names).values_list('cv_file', flat=True))
+            for name in old_names - still_used:
+                storage.delete(name)
+                deleted += 1
+
+        verb = "would move" if options['dry_run'] else "moved"
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {moved} CV file(s) {verb} to content-addressed paths, {deleted} redundant copies deleted, "
+            f"{unreadable} unreadable, in {time.perf_counter() - started:.1f}s"
+        ))
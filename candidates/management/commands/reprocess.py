@@ -0,0 +1,249 @@
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from candidates.models import Application, ApplicationSkill, ParsedCV
+from candidates.storage import hash_file
+from candidates.utils import copy_parsed_cv, current_cv_stamps, run_cv_stages
+from jobs.model_server import ModelServerUnavailable
+from jobs.models import Job, JobSkill
+from jobs.skills import replace_skill_links
+from jobs.stages import STAGES, is_current
+from jobs.utils import current_job_stamps, run_job_stages
+from tasks.queue import enqueue
+
+# Rows the worker is processing right now are left to it
+IN_FLIGHT = ['QUEUED', 'EXTRACTING', 'EMBEDDING']
+
+# Where each stage's output lives; --adopt only stamps stages that have one
+STAGE_OUTPUT_FIELDS = {
+    Job: {'extract': 'processed_text', 'entities': 'gliner_entities', 'embed': 'jina_embedding'},
+    ParsedCV: {'extract': 'text_content', 'entities': 'extracted_data', 'embed': 'embedding'},
+}
+
+
+def _is_empty(value):
+    return value is None or (isinstance(value, str) and not value)
+
+
+def iter_chunks(queryset, size):
+    """Keyset pagination by id, so each chunk is a fresh, short query."""
+    last_id = 0
+    while True:
+        chunk = list(queryset.filter(id__gt=last_id).order_by('id')[:size])
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1].id
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes only the AI pipeline stages (extract, entities, embed) whose input or "
+        "code/model version changed, for jobs and for every distinct CV, and queues the affected "
+        "jobs for re-ranking. Every chunk is committed with its stage stamps, so an interrupted "
+        "run resumes where it stopped when started again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', choices=['jobs', 'cvs'], help="Reprocess only jobs or only CVs.")
+        parser.add_argument('--chunk-size', type=int, default=100, help="Rows read and written per batch.")
+        parser.add_argument('--force', action='store_true', help="Ignore the stamps and redo every stage.")
+        parser.add_argument('--dry-run', action='store_true', help="Only count the stale stages.")
+        parser.add_argument(
+            '--adopt', action='store_true',
+            help="Stamp existing outputs as current without recomputing (first run on an already-processed database).",
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.gliner = None
+        if not options['dry_run'] and not options['adopt']:
+            jobs_config = apps.get_app_config('jobs')
+            jobs_config.load_models()
+            try:
+                jobs_config.require_models()
+            except ModelServerUnavailable as e:
+                raise CommandError(str(e))
+            self.gliner = jobs_config.gliner_model
+
+        started = time.perf_counter()
+        self.queued = set()
+        if options['only'] != 'cvs':
+            self.reprocess_jobs()
+        if options['only'] != 'jobs':
+            self.reprocess_cvs()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Reprocess finished in {time.perf_counter() - started:.1f}s; "
+            f"{len(self.queued)} job(s) queued for re-ranking."
+        ))
+
+    # --- Jobs ---
+    def reprocess_jobs(self):
+        totals = dict.fromkeys(STAGES, 0)
+        rows = Job.objects.exclude(processing_status__in=IN_FLIGHT)
+        for chunk in iter_chunks(rows, self.options['chunk_size']):
+            if self.options['dry_run'] or self.options['adopt']:
+                self.check_stamps(Job, chunk, current_job_stamps, totals)
+                continue
+
+            dirty, entities, rescore, embedded = [], {}, set(), []
+            for job in chunk:
+                changed = run_job_stages(job, self.gliner, force=self.options['force'])
+                for stage in changed:
+                    totals[stage] += 1
+                if not changed:
+                    continue
+                job.processing_status = 'SCORED' if 'embed' in job.stage_keys else 'FAILED'
+                job.updated_at = timezone.now()  # bulk_update skips auto_now; the recommendations matrix watches it
+                dirty.append(job)
+                if 'entities' in changed:
+                    entities[job.id] = job.gliner_entities
+                if changed & {'entities', 'embed'}:
+                    rescore.add(job.id)
+                if 'embed' in job.stage_keys and 'embed' in changed:
+                    embedded.append(job.id)
+
+            with transaction.atomic():
+                Job.objects.bulk_update(
+                    dirty, ['processed_text', 'gliner_entities', 'jina_embedding', 'stage_keys', 'processing_status', 'updated_at']
+                )
+                replace_skill_links(JobSkill, 'job_id', entities)
+                self.queue_rescore(rescore)
+                for job_id in embedded:
+                    enqueue('match_talent_pool', job_id=job_id)
+            self.stdout.write(f"   jobs up to #{chunk[-1].id}: {len(dirty)} of {len(chunk)} updated")
+        self.report('Jobs', totals)
+
+    # --- CVs ---
+    def reprocess_cvs(self):
+        if not self.options['dry_run']:
+            self.backfill_hashes()
+            self.seed_parsed_cvs()
+
+        totals = dict.fromkeys(STAGES, 0)
+        for chunk in iter_chunks(ParsedCV.objects.all(), self.options['chunk_size']):
+            if self.options['dry_run']:
+                self.check_stamps(ParsedCV, chunk, current_cv_stamps, totals)
+                continue
+            if self.options['adopt']:
+                self.check_stamps(ParsedCV, chunk, current_cv_stamps, totals)
+            else:
+                sources = {}
+                for application in Application.objects.filter(cv_sha256__in=[p.sha256 for p in chunk]).only('id', 'cv_sha256', 'cv_file'):
+                    sources.setdefault(application.cv_sha256, application.cv_file)
+                changed = run_cv_stages(
+                    chunk, [sources.get(p.sha256) for p in chunk], self.gliner,
+                    force=self.options['force'],
+                )
+                dirty = [parsed for parsed, stages in zip(chunk, changed) if stages]
+                for stages in changed:
+                    for stage in stages or ():
+                        totals[stage] += 1
+                ParsedCV.objects.bulk_update(dirty, ['text_content', 'extracted_data', 'embedding', 'stage_keys'])
+
+            # Applications still carrying other stamps than their ParsedCV (this chunk's changes,
+            # or ones a previous, interrupted run did not get to) take its outputs
+            updated = self.propagate(chunk)
+            self.stdout.write(f"   CVs up to #{chunk[-1].id}: {updated} application(s) updated")
+        self.report('CVs', totals)
+
+    def backfill_hashes(self):
+        """
+        Hashes the stored CV of applications saved before content addressing (empty cv_sha256).
+        The files stay where they are; `manage.py dedupe_cv_files` moves and deduplicates them.
+        """
+        rows = Application.objects.filter(cv_sha256='').exclude(cv_file='').only('id', 'cv_file', 'cv_sha256')
+        hashed = unreadable = 0
+        for chunk in iter_chunks(rows, self.options['chunk_size']):
+            for application in chunk:
+                try:
+                    with application.cv_file.open('rb') as f:
+                        application.cv_sha256 = hash_file(f)
+                except OSError:
+                    unreadable += 1
+            done = [application for application in chunk if application.cv_sha256]
+            Application.objects.bulk_update(done, ['cv_sha256'])
+            hashed += len(done)
+        if hashed or unreadable:
+            self.stdout.write(f"   Hashed {hashed} older CV file(s); {unreadable} could not be read")
+
+    def seed_parsed_cvs(self):
+        """Gives applications analysed before the cache existed (or with a degraded result) a ParsedCV row."""
+        missing = {}
+        rows = (
+            Application.objects.exclude(cv_sha256='')
+            .exclude(cv_sha256__in=ParsedCV.objects.values('sha256'))
+            .values_list('cv_sha256', 'cv_text_content', 'extracted_data', 'cv_embedding')
+        )
+        for sha256, text, entities, embedding in rows.iterator(chunk_size=self.options['chunk_size']):
+            missing.setdefault(sha256, ParsedCV(
+                sha256=sha256, text_content=text,
+                extracted_data=entities if isinstance(entities, list) else [], embedding=embedding,
+            ))
+        ParsedCV.objects.bulk_create(missing.values(), batch_size=self.options['chunk_size'], ignore_conflicts=True)
+
+    def propagate(self, chunk):
+        parsed_by_sha = {parsed.sha256: parsed for parsed in chunk}
+        applications = (
+            Application.objects.filter(cv_sha256__in=list(parsed_by_sha))
+            .exclude(processing_status__in=IN_FLIGHT)
+            .only('id', 'job_id', 'cv_sha256', 'stage_keys')
+        )
+        now = timezone.now()
+        dirty, entities, rescore = [], {}, set()
+        for application in applications:
+            parsed = parsed_by_sha[application.cv_sha256]
+            if application.stage_keys == parsed.stage_keys:
+                continue
+            old_keys = application.stage_keys or {}
+            copy_parsed_cv(parsed, application)
+            if old_keys.get('embed') != parsed.stage_keys.get('embed'):
+                application.embedded_at = now  # Talent pool index picks the new vector up
+            application.processing_status = 'SCORED' if 'embed' in parsed.stage_keys else 'FAILED'
+            dirty.append(application)
+            if old_keys.get('entities') != parsed.stage_keys.get('entities'):
+                entities[application.id] = application.extracted_data
+            rescore.add(application.job_id)
+
+        with transaction.atomic():
+            Application.objects.bulk_update(dirty, [
+                'cv_text_content', 'extracted_data', 'cv_embedding', 'stage_keys',
+                'experience_years', 'embedded_at', 'processing_status',
+            ], batch_size=self.options['chunk_size'])
+            replace_skill_links(ApplicationSkill, 'application_id', entities)
+            self.queue_rescore(rescore)
+        return len(dirty)
+
+    # --- Helpers ---
+    def check_stamps(self, model, chunk, current_stamps, totals):
+        """Counts stale stages; with --adopt also stamps the existing outputs as current."""
+        adopted = []
+        for row in chunk:
+            stamps = current_stamps(row)
+            # Without extracted text the later stages have nothing to work on yet
+            stages = STAGES if getattr(row, STAGE_OUTPUT_FIELDS[model]['extract']) else ['extract']
+            stale = [stage for stage in stages if not is_current(row.stage_keys, stage, stamps[stage])]
+            for stage in stale:
+                totals[stage] += 1
+            if stale and self.options['adopt']:
+                row.stage_keys = {
+                    stage: stamp for stage, stamp in stamps.items()
+                    if not _is_empty(getattr(row, STAGE_OUTPUT_FIELDS[model][stage]))
+                }
+                adopted.append(row)
+        model.objects.bulk_update(adopted, ['stage_keys'])
+
+    def queue_rescore(self, job_ids):
+        # Cheap and model-free (candidates.scoring); queued once per run, inside the chunk's transaction
+        for job_id in sorted(set(job_ids) - self.queued):
+            enqueue('rescore_job', job_id=job_id)
+            self.queued.add(job_id)
+
+    def report(self, label, totals):
+        verb = 'stale' if self.options['dry_run'] else 'stamped' if self.options['adopt'] else 'recomputed'
+        self.stdout.write(f"📊 {label}: " + ", ".join(f"{stage} {verb} {count}" for stage, count in totals.items()))
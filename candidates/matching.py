@@ -0,0 +1,138 @@
+"""
+Skill-match reports: which job skills a CV covers, which it misses, what else it brings,
+and how its experience compares with the job's requirement.
+
+Reports are built once when an application is scored (or when its job is re-processed)
+and stored on Application.match_report together with a fingerprint of the entities they
+were built from, so detail pages and list filters read them instead of recomputing.
+"""
+import hashlib
+import json
+
+from jobs.skills import SKILL_SYNONYMS, TECH_LABELS
+
+# Bump when the matching rules change; stored reports are then rebuilt on next use
+ENGINE_VERSION = 1
+
+
+def skill_map(entities):
+    """lower-cased skill -> display text, for the technical labels only (last one wins, as before)."""
+    return {
+        item['text'].strip().lower(): item['text'].strip()
+        for item in entities or []
+        if item.get('label') in TECH_LABELS
+    }
+
+
+def _entity_number(entities, label, cast):
+    for item in entities or []:
+        if item.get('label') == label:
+            try:
+                return cast(item['text'])
+            except ValueError:
+                return cast(0)
+    return cast(0)
+
+
+def required_years(job_entities):
+    """The job's Min_Years_Req entity as an int (0 when absent)."""
+    return _entity_number(job_entities, 'Min_Years_Req', int)
+
+
+def skill_coverage(report):
+    """Share of the job's skills a report marks as matched (0-1), None when the job lists no skills."""
+    total = report.get('matched_skills', 0) + report.get('missing_skills', 0)
+    return report['matched_skills'] / total if total else None
+
+
+def fingerprint(job_entities, cv_entities):
+    """Identifies the inputs (and engine version) a report was built from."""
+    payload = json.dumps([ENGINE_VERSION, job_entities or [], cv_entities or []], sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _match_skill(j_key, j_text, cv_skills):
+    """Returns the match label for one job skill, or None if the CV does not cover it."""
+    if j_key in cv_skills:
+        return j_text
+    std_j = SKILL_SYNONYMS.get(j_key, j_key)
+    for c_key, c_text in cv_skills.items():
+        if len(c_key) > 2 and len(j_key) > 2:
+            if c_key in j_key:
+                return f"{c_text} (matches {j_text})"
+            if j_key in c_key:
+                return c_text
+
+        std_c = SKILL_SYNONYMS.get(c_key, c_key)
+        if std_j == std_c or std_c in std_j:
+            return f"{c_text} (matches {j_text})"
+    return None
+
+
+def build_match_report(job_entities, cv_entities):
+    """
+    Compares a job's entities with a CV's entities.
+    Returns a JSON-serialisable dict: matches / misses / extras (display strings, experience
+    line first), required_years, candidate_years, meets_experience (None when the job has no
+    requirement), the counts, and the input fingerprint.
+    """
+    job_skills = skill_map(job_entities)
+    cv_skills = skill_map(cv_entities)
+    req_years = required_years(job_entities)
+    cand_years = _entity_number(cv_entities, 'Total_Years_Calc', float)
+
+    matches, misses, extras = [], [], []
+
+    meets_experience = None
+    if req_years > 0:
+        meets_experience = cand_years >= req_years
+        if meets_experience:
+            matches.append(f"✅ {cand_years} Years Experience (Matches {req_years}+ Req)")
+        else:
+            misses.append(f"❌ Requires {req_years}+ Years (Has {cand_years})")
+    elif cand_years > 0:
+        extras.append(f"{cand_years} Years Total Experience")
+
+    matched_skills = 0
+    for j_key, j_text in job_skills.items():
+        label = _match_skill(j_key, j_text, cv_skills)
+        if label is None:
+            misses.append(j_text)
+        else:
+            matches.append(label)
+            matched_skills += 1
+
+    match_strings = " ".join(matches).lower()
+    for c_key, c_text in cv_skills.items():
+        if c_key not in match_strings and c_key not in job_skills:
+            extras.append(c_text)
+
+    return {
+        'matches': matches,
+        'misses': misses,
+        'extras': extras,
+        'required_years': req_years,
+        'candidate_years': cand_years,
+        'meets_experience': meets_experience,
+        'matched_skills': matched_skills,
+        'missing_skills': len(job_skills) - matched_skills,
+        'fingerprint': fingerprint(job_entities, cv_entities),
+    }
+
+
+def get_match_report(application):
+    """
+    Stored report for an application, rebuilt (and saved) only if the job or CV
+    entities changed since it was built. Expects `application.job` to be loaded.
+    """
+    job_entities = application.job.gliner_entities
+    current = fingerprint(job_entities, application.extracted_data)
+    report = application.match_report or {}
+    if report.get('fingerprint') != current:
+        report = build_match_report(job_entities, application.extracted_data)
+        application.match_report = report
+        application.skill_coverage = skill_coverage(report)
+        type(application).objects.filter(pk=application.pk).update(
+            match_report=report, skill_coverage=application.skill_coverage
+        )
+    return report
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:31
+
+from django.db import migrations, models
+
+
+def mark_processed_applications(apps, schema_editor):
+    # Applications scored inline before the queue existed already have an embedding
+    Application = apps.get_model('candidates', 'Application')
+    Application.objects.exclude(cv_embedding=[]).update(processing_status='SCORED')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0002_alter_application_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='processing_status',
+            field=models.CharField(choices=[('QUEUED', 'Queued'), ('EXTRACTING', 'Extracting'), ('EMBEDDING', 'Embedding'), ('SCORED', 'Scored'), ('FAILED', 'Failed')], default='QUEUED', max_length=12),
+        ),
+        migrations.RunPython(mark_processed_applications, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+from django.db import migrations
+
+import jobs.vectors
+from jobs.vectors import pack_vector, unpack_vector
+
+BATCH_SIZE = 500
+
+
+def pack_embeddings(apps, schema_editor):
+    Application = apps.get_model('candidates', 'Application')
+    batch = []
+    for app in Application.objects.exclude(cv_embedding=[]).only('id', 'cv_embedding').iterator(chunk_size=BATCH_SIZE):
+        if not app.cv_embedding:
+            continue
+        app.cv_vector = pack_vector(app.cv_embedding)
+        batch.append(app)
+        if len(batch) >= BATCH_SIZE:
+            Application.objects.bulk_update(batch, ['cv_vector'])
+            batch = []
+    if batch:
+        Application.objects.bulk_update(batch, ['cv_vector'])
+
+
+def unpack_embeddings(apps, schema_editor):
+    Application = apps.get_model('candidates', 'Application')
+    for app in Application.objects.filter(cv_vector__isnull=False).iterator(chunk_size=BATCH_SIZE):
+        Application.objects.filter(pk=app.pk).update(cv_embedding=unpack_vector(app.cv_vector).tolist())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0003_application_processing_status'),
+        ('jobs', '0005_pack_jina_embedding'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='cv_vector',
+            field=jobs.vectors.VectorField(blank=True, null=True),
+        ),
+        migrations.RunPython(pack_embeddings, unpack_embeddings),
+        migrations.RemoveField(
+            model_name='application',
+            name='cv_embedding',
+        ),
+        migrations.RenameField(
+            model_name='application',
+            old_name='cv_vector',
+            new_name='cv_embedding',
+        ),
+    ]
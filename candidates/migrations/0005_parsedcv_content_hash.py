@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:36
+
+import candidates.storage
+import jobs.vectors
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0004_pack_cv_embedding'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParsedCV',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('text_content', models.TextField(blank=True)),
+                ('extracted_data', models.JSONField(blank=True, default=list)),
+                ('embedding', jobs.vectors.VectorField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='cv_sha256',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='application',
+            name='cv_file',
+            field=models.FileField(storage=candidates.storage.ContentAddressedStorage(), upload_to=candidates.storage.cv_upload_path),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:42
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_embedded_at(apps, schema_editor):
+    # Already-embedded applications enter the talent pool index on its first sync
+    Application = apps.get_model('candidates', 'Application')
+    Application.objects.filter(cv_embedding__isnull=False).update(embedded_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0005_parsedcv_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='embedded_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.RunPython(backfill_embedded_at, migrations.RunPython.noop),
+    ]
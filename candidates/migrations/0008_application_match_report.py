@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0007_talentsuggestion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='match_report',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
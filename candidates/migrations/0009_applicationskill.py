@@ -0,0 +1,91 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copy of jobs.skills.entity_skill_names as of this migration
+SKILL_INDEX_LABELS = {
+    'Skill', 'Technology', 'Framework', 'Programming Language', 'Database', 'Tool', 'Platform', 'Cloud', 'Service',
+    'Software', 'Skill (Detected)',
+}
+SKILL_SYNONYMS = {
+    "drf": "django rest framework", "reactjs": "react", "js": "javascript",
+    "aws": "amazon web services", "postgres": "postgresql", "k8s": "kubernetes",
+}
+SKILL_NAME_MAX_LENGTH = 100
+
+
+def entity_skill_names(entities):
+    names = set()
+    for item in entities or []:
+        if item.get('label') in SKILL_INDEX_LABELS:
+            key = ' '.join(item['text'].split()).lower()
+            name = SKILL_SYNONYMS.get(key, key)
+            if name and len(name) <= SKILL_NAME_MAX_LENGTH:
+                names.add(name)
+    return names
+
+
+def backfill_skill_index(apps, schema_editor):
+    # Index the entities of already-processed jobs and applications
+    Skill = apps.get_model('jobs', 'Skill')
+    JobSkill = apps.get_model('jobs', 'JobSkill')
+    Job = apps.get_model('jobs', 'Job')
+    Application = apps.get_model('candidates', 'Application')
+    ApplicationSkill = apps.get_model('candidates', 'ApplicationSkill')
+
+    job_names = {pk: entity_skill_names(e) for pk, e in Job.objects.values_list('id', 'gliner_entities').iterator()}
+    app_names = {}
+    updates = []
+    for app in Application.objects.only('id', 'extracted_data').iterator():
+        entities = app.extracted_data if isinstance(app.extracted_data, list) else []
+        app_names[app.id] = entity_skill_names(entities)
+        years = next((i['text'] for i in entities if i.get('label') == 'Total_Years_Calc'), None)
+        if years is not None:
+            try:
+                app.experience_years = float(years)
+            except ValueError:
+                continue
+            updates.append(app)
+    Application.objects.bulk_update(updates, ['experience_years'], batch_size=1000)
+
+    all_names = set().union(*job_names.values(), *app_names.values())
+    Skill.objects.bulk_create([Skill(name=n) for n in all_names], ignore_conflicts=True)
+    ids = dict(Skill.objects.values_list('name', 'id'))
+    JobSkill.objects.bulk_create(
+        [JobSkill(job_id=pk, skill_id=ids[n]) for pk, names in job_names.items() for n in names],
+        batch_size=1000, ignore_conflicts=True,
+    )
+    ApplicationSkill.objects.bulk_create(
+        [ApplicationSkill(application_id=pk, skill_id=ids[n]) for pk, names in app_names.items() for n in names],
+        batch_size=1000, ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0008_application_match_report'),
+        ('jobs', '0006_skill_jobskill'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='experience_years',
+            field=models.FloatField(blank=True, db_index=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='ApplicationSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_links', to='candidates.application')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='application_links', to='jobs.skill')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['skill', 'application'], name='appskill_skill_app_idx')],
+                'unique_together': {('application', 'skill')},
+            },
+        ),
+        migrations.RunPython(backfill_skill_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,112 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:57
+
+from django.db import migrations, models
+
+# Frozen copies of the matching / scoring rules as of this migration, so later refactors
+# of candidates.matching or candidates.scoring do not change what it does
+TECH_LABELS = {'Skill', 'Technology', 'Framework', 'Programming Language', 'Database', 'Tool', 'Platform', 'Cloud', 'Service'}
+SKILL_SYNONYMS = {
+    "drf": "django rest framework", "reactjs": "react", "js": "javascript",
+    "aws": "amazon web services", "postgres": "postgresql", "k8s": "kubernetes",
+}
+
+
+def skill_map(entities):
+    return {
+        item['text'].strip().lower(): item['text'].strip()
+        for item in entities or []
+        if item.get('label') in TECH_LABELS
+    }
+
+
+def required_years(entities):
+    for item in entities or []:
+        if item.get('label') == 'Min_Years_Req':
+            try:
+                return int(item['text'])
+            except ValueError:
+                return 0
+    return 0
+
+
+def covers(j_key, cv_skills):
+    """Same rules as candidates.matching._match_skill."""
+    if j_key in cv_skills:
+        return True
+    std_j = SKILL_SYNONYMS.get(j_key, j_key)
+    for c_key in cv_skills:
+        if len(c_key) > 2 and len(j_key) > 2 and (c_key in j_key or j_key in c_key):
+            return True
+        std_c = SKILL_SYNONYMS.get(c_key, c_key)
+        if std_j == std_c or std_c in std_j:
+            return True
+    return False
+
+
+def skill_coverage(job_skills, cv_entities):
+    """Share of the job's skills the CV covers (0-1), None when the job lists no skills."""
+    if not job_skills:
+        return None
+    cv_skills = skill_map(cv_entities if isinstance(cv_entities, list) else [])
+    return sum(covers(j_key, cv_skills) for j_key in job_skills) / len(job_skills)
+
+
+def composite_score(similarity, coverage, years, weights, req_years, has_skills):
+    """Same formula as candidates.scoring.composite_scores, for one applicant."""
+    sim_w, skills_w, exp_w = weights
+    sim = min(max(similarity or 0, 0), 100) / 100
+    parts = [(sim_w, sim)]
+    if has_skills:
+        parts.append((skills_w, min(max(coverage or 0, 0), 1)))
+    if req_years > 0:
+        parts.append((exp_w, min(max((years or 0) / req_years, 0), 1)))
+    total = sum(w for w, _ in parts)
+    if total <= 0:
+        parts, total = [(1.0, sim)], 1.0
+    return round(sum(w * v for w, v in parts) / total * 100, 2)
+
+
+def backfill_ranking_parts(apps, schema_editor):
+    # Old match_score was the plain cosine score; keep it as the similarity part and re-rank.
+    # Skill coverage comes from the entities: match_report (0008) is still empty on old rows.
+    Job = apps.get_model('jobs', 'Job')
+    Application = apps.get_model('candidates', 'Application')
+
+    for job in Job.objects.all().iterator():
+        rows = list(Application.objects.filter(job=job).only(
+            'id', 'match_score', 'extracted_data', 'cv_embedding', 'experience_years'
+        ))
+        if not rows:
+            continue
+        job_skills = skill_map(job.gliner_entities)
+        req_years = required_years(job.gliner_entities)
+        weights = (job.similarity_weight, job.skills_weight, job.experience_weight)
+        for app in rows:
+            app.similarity_score = app.match_score if app.cv_embedding is not None else None
+            app.skill_coverage = skill_coverage(job_skills, app.extracted_data)
+            app.match_score = composite_score(
+                app.similarity_score, app.skill_coverage, app.experience_years, weights, req_years, bool(job_skills)
+            )
+        Application.objects.bulk_update(rows, ['similarity_score', 'skill_coverage', 'match_score'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0009_applicationskill'),
+        ('jobs', '0007_job_ranking_weights'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='similarity_score',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='skill_coverage',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_ranking_parts, migrations.RunPython.noop),
+    ]
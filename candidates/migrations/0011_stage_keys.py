@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0010_application_ranking_parts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='stage_keys',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='parsedcv',
+            name='stage_keys',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
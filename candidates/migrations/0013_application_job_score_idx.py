@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0012_ingestionjob'),
+        ('jobs', '0008_job_stage_keys'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', '-match_score', '-id'], name='app_job_score_idx'),
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from django.conf import settings
-from jobs.models import Job
+from jobs.models import Job, Skill, PROCESSING_STATUS_CHOICES
+from jobs.vectors import VectorField
+from .storage import ContentAddressedStorage, cv_upload_path, hash_file
 
 class Application(models.Model):
     STATUS_CHOICES = [
@@ -12,11 +14,24 @@ class Application(models.Model):
     job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='applications')
     candidate = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='applications')
     
-    cv_file = models.FileField(upload_to='cvs/')
+    cv_file = models.FileField(upload_to=cv_upload_path, storage=ContentAddressedStorage())
+    # SHA-256 of the CV bytes, set by save() when a new file is attached
+    cv_sha256 = models.CharField(max_length=64, blank=True, db_index=True)
     cv_text_content = models.TextField(blank=True)
     extracted_data = models.JSONField(default=dict, blank=True)
-    cv_embedding = models.JSONField(default=list, blank=True)
-    match_score = models.FloatField(default=0.0)
+    cv_embedding = VectorField(blank=True, null=True)  # Packed, normalised float32
+    stage_keys = models.JSONField(default=dict, blank=True)  # Stamps of the ParsedCV stages copied above
+    embedded_at = models.DateTimeField(null=True, blank=True, db_index=True)  # Talent pool index sync watermark
+    match_score = models.FloatField(default=0.0)  # Weighted composite of the parts below (candidates.scoring)
+    similarity_score = models.FloatField(null=True, blank=True)  # CV vs. job embedding cosine, 0-100
+    skill_coverage = models.FloatField(null=True, blank=True)  # Share of the job's skills the CV covers, 0-1
+    match_report = models.JSONField(default=dict, blank=True)  # Skills/experience vs. the job (candidates.matching)
+    experience_years = models.FloatField(null=True, blank=True, db_index=True)  # From the CV's date ranges
+    processing_status = models.CharField(max_length=12, choices=PROCESSING_STATUS_CHOICES, default='QUEUED')
+    
+    ingestion = models.ForeignKey(
+        'IngestionJob', on_delete=models.SET_NULL, null=True, blank=True, related_name='applications'
+    )  # Set for applications created by an HR bulk upload
     
     has_reference = models.BooleanField(default=False)
     reference_name = models.CharField(max_length=255, blank=True, null=True)
@@ -28,6 +43,95 @@ class Application(models.Model):
 
     class Meta:
         unique_together = ('job', 'candidate')
+        # Ranking order of a job's applicants; keyset pages walk it (candidates.pagination)
+        indexes = [models.Index(fields=['job', '-match_score', '-id'], name='app_job_score_idx')]
 
     def __str__(self):
-        return f"{self.candidate.full_name} -> {self.job.title} ({self.status})"
\ No newline at end of file
+        return f"{self.candidate.full_name} -> {self.job.title} ({self.status})"
+
+    def save(self, *args, **kwargs):
+        # A newly attached CV is not in storage yet: hash it before cv_upload_path names it
+        if self.cv_file and not self.cv_file._committed:
+            self.cv_sha256 = hash_file(self.cv_file.file)
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'cv_file' in update_fields:
+                kwargs['update_fields'] = {*update_fields, 'cv_sha256'}
+        super().save(*args, **kwargs)
+
+
+class IngestionJob(models.Model):
+    """
+    One HR bulk upload (many PDFs and/or ZIP archives) being analysed by the task workers.
+    Polled by the upload progress page; see candidates.ingestion.
+    """
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+    ]
+
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='ingestions')
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name='ingestions')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)  # Scored
+    failed = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)  # Files rejected at upload time
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Ingestion #{self.pk} for {self.job.title} ({self.processed + self.failed}/{self.total})"
+
+    @property
+    def progress(self):
+        """Percent of the files analysed (scored or failed)."""
+        return round(100 * (self.processed + self.failed) / self.total, 1) if self.total else 100.0
+
+
+class ParsedCV(models.Model):
+    """
+    Analysis of one CV file, keyed by the SHA-256 of its bytes.
+    Shared by every application that uploads the same file.
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    text_content = models.TextField(blank=True)
+    extracted_data = models.JSONField(default=list, blank=True)
+    embedding = VectorField(blank=True, null=True)
+    stage_keys = models.JSONField(default=dict, blank=True)  # Input hash + version per AI stage (jobs.stages)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.sha256
+
+
+class TalentSuggestion(models.Model):
+    """
+    A past applicant suggested for a job by the talent pool match (see candidates.talent_pool).
+    `application` is the candidate's best-matching earlier application.
+    """
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='talent_suggestions')
+    candidate = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='talent_suggestions')
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+    rank = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('job', 'candidate')
+        ordering = ['job', 'rank']
+
+    def __str__(self):
+        return f"#{self.rank} {self.candidate.full_name} -> {self.job.title} ({self.score}%)"
+
+
+
+class ApplicationSkill(models.Model):
+    """Inverted index: which applications list a skill. Rebuilt from extracted_data by the pipeline."""
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='skill_links')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='application_links')
+
+    class Meta:
+        unique_together = ('application', 'skill')
+        indexes = [models.Index(fields=['skill', 'application'], name='appskill_skill_app_idx')]
@@ -0,0 +1,104 @@
+"""
+Keyset (cursor) pagination for candidate rankings.
+
+Rankings are ordered by (match_score DESC, id DESC), backed by the app_job_score_idx
+index on (job, -match_score, -id). Instead of an OFFSET, each page starts after the
+last (match_score, id) of the previous one, so page 1,000 of a 50k-applicant job reads
+the same handful of index entries as page 1. The cursor is an opaque token carrying
+that key plus the rank reached so far (for the "#n" column of the ranking page).
+"""
+import base64
+import binascii
+import json
+
+from django.db.models import Q
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+RANKING_ORDER = ('-match_score', '-id')
+
+
+def encode_cursor(score, pk, rank):
+    raw = json.dumps([score, pk, rank], separators=(',', ':')).encode('ascii')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """(score, id, rank) from a cursor token, or None if it is missing or malformed."""
+    if not cursor:
+        return None
+    try:
+        score, pk, rank = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return float(score), int(pk), int(rank)
+    except (ValueError, TypeError, binascii.Error):
+        return None
+
+
+def keyset_page(queryset, cursor=None, size=20):
+    """
+    One page of `queryset` in ranking order after `cursor`.
+    Returns (items, next_cursor or None, rank of the first item).
+    """
+    queryset = queryset.order_by(*RANKING_ORDER)
+    position = decode_cursor(cursor)
+    rank = 0
+    if position is not None:
+        score, pk, rank = position
+        # match_score <= score keeps the scan on the index range; the OR breaks ties on id
+        queryset = queryset.filter(match_score__lte=score).filter(Q(match_score__lt=score) | Q(id__lt=pk))
+
+    items = list(queryset[:size + 1])
+    next_cursor = None
+    if len(items) > size:
+        items = items[:size]
+        last = items[-1]
+        if isinstance(last, dict):  # values() rows (Smart_Hire_Solutions.fast_lists)
+            next_cursor = encode_cursor(last['match_score'], last['id'], rank + size)
+        else:
+            next_cursor = encode_cursor(last.match_score, last.id, rank + size)
+    return items, next_cursor, rank + 1
+
+
+class RankingCursorPagination(BasePagination):
+    """?cursor=<token>&page_size=<n>; the response carries the `next` page URL."""
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, ''))
+        except ValueError:
+            return api_settings.PAGE_SIZE
+        return max(1, min(size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        items, self.next_cursor, _ = keyset_page(
+            queryset, request.query_params.get(self.cursor_query_param), self.get_page_size(request)
+        )
+        return items
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, self.next_cursor)
+
+    def get_first_link(self):
+        return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'first': self.get_first_link(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'first': {'type': 'string', 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,168 @@
+"""
+Hybrid ranking: match_score is a weighted composite (0-100) of three stored parts,
+
+- similarity_score: CV vs. job embedding cosine (0-100)
+- skill_coverage: share of the job's skills the CV covers (0-1, from the match report)
+- experience: candidate years / the job's Min_Years_Req, capped at 1
+
+Weights live on the Job and are normalised over the parts that apply (a job with no
+listed skills or no experience requirement is ranked on the rest). Because the parts
+are stored, changing the weights re-ranks every applicant with one query, one numpy
+pass and a bulk update - no model runs.
+"""
+import time
+
+import numpy as np
+
+from jobs.metrics import stage_timer
+from jobs.models import Job
+from jobs.vectors import normalize_vector
+from .matching import build_match_report, fingerprint, required_years, skill_coverage, skill_map
+from .models import Application
+
+RESCORE_CHUNK_SIZE = 1000
+
+
+def job_weights(job):
+    return job.similarity_weight, job.skills_weight, job.experience_weight
+
+
+def composite_scores(similarity, coverage, years, weights, req_years=0, has_skills=True):
+    """
+    Vectorised composite for many applicants of one job.
+    similarity / coverage / years are equal-length sequences (None = missing, counted as 0).
+    Returns a float64 array of scores in 0-100, rounded to 2 decimals.
+    """
+    sim_w, skills_w, exp_w = weights
+    sim = np.clip(np.array(similarity, dtype=np.float64), 0, 100) / 100
+    parts = [(sim_w, sim)]
+    if has_skills:
+        parts.append((skills_w, np.clip(np.array(coverage, dtype=np.float64), 0, 1)))
+    if req_years > 0:
+        parts.append((exp_w, np.clip(np.array(years, dtype=np.float64) / req_years, 0, 1)))
+
+    total = sum(w for w, _ in parts)
+    if total <= 0:
+        parts, total = [(1.0, sim)], 1.0  # Every applicable weight is zero: fall back to similarity
+    score = sum(w * np.nan_to_num(values) for w, values in parts) / total
+    return np.round(score * 100, 2)
+
+
+def score_application(application):
+    """Composite score for a single application (expects `application.job` to be loaded)."""
+    job = application.job
+    return float(composite_scores(
+        [application.similarity_score], [application.skill_coverage], [application.experience_years],
+        job_weights(job), req_years=required_years(job.gliner_entities), has_skills=bool(skill_map(job.gliner_entities)),
+    )[0])
+
+
+def rank_job_applications(job):
+    """
+    Recomputes match_score for every applicant of a job from the stored parts.
+    This is all a weight change needs. Returns the number of applications updated.
+    """
+    started = time.perf_counter()
+    rows = list(
+        Application.objects.filter(job=job)
+        .values_list('id', 'similarity_score', 'skill_coverage', 'experience_years')
+    )
+    if not rows:
+        return 0
+
+    ids, similarity, coverage, years = zip(*rows)
+    scores = composite_scores(
+        similarity, coverage, years, job_weights(job),
+        req_years=required_years(job.gliner_entities), has_skills=bool(skill_map(job.gliner_entities)),
+    )
+    computed = time.perf_counter()
+
+    updates = [Application(id=app_id, match_score=float(score)) for app_id, score in zip(ids, scores)]
+    Application.objects.bulk_update(updates, ['match_score'], batch_size=RESCORE_CHUNK_SIZE)
+
+    finished = time.perf_counter()
+    print(
+        f"✅ Ranked {len(ids)} applications for '{job.title}' "
+        f"(score {(computed - started) * 1000:.1f} ms, write {(finished - computed) * 1000:.0f} ms)"
+    )
+    return len(ids)
+
+
+def rescore_job_applications(job):
+    """
+    Recomputes similarity_score for every processed application of a job.
+    All CV vectors are stacked into one matrix and scored with a single matrix-vector
+    product (vectors are pre-normalised, so this is cosine similarity), then written
+    back with chunked bulk_update. Returns the number of applications updated.
+    """
+    if job.jina_embedding is None:
+        return 0
+    job_vec = normalize_vector(job.jina_embedding)
+
+    started = time.perf_counter()
+    rows = Application.objects.filter(job=job, cv_embedding__isnull=False).values_list('id', 'cv_embedding')
+
+    ids, vectors, mismatched = [], [], []
+    for app_id, vec in rows.iterator(chunk_size=RESCORE_CHUNK_SIZE):
+        if vec.shape[0] == job_vec.shape[0]:
+            ids.append(app_id)
+            vectors.append(vec)
+        else:
+            mismatched.append(app_id)
+
+    if mismatched:
+        # Embedded by a model with another dimension: no similarity until the CV is re-embedded
+        # (`manage.py reprocess`), so an old score from before the model change does not rank it
+        Application.objects.filter(id__in=mismatched).update(similarity_score=None)
+        print(
+            f"⚠️ {len(mismatched)} CV embedding(s) for '{job.title}' do not match the job's dimension "
+            f"({job_vec.shape[0]}); similarity cleared until they are re-embedded."
+        )
+
+    if not ids:
+        return 0
+
+    loaded = time.perf_counter()
+    matrix = np.vstack(vectors)
+    scores = np.round((matrix @ job_vec).astype(np.float64) * 100, 2)
+    computed = time.perf_counter()
+
+    updates = [Application(id=app_id, similarity_score=float(score)) for app_id, score in zip(ids, scores)]
+    Application.objects.bulk_update(updates, ['similarity_score'], batch_size=RESCORE_CHUNK_SIZE)
+
+    finished = time.perf_counter()
+    print(
+        f"✅ Rescored {len(ids)} applications for '{job.title}' "
+        f"(load {(loaded - started) * 1000:.0f} ms, score {(computed - loaded) * 1000:.1f} ms, "
+        f"write {(finished - computed) * 1000:.0f} ms)"
+    )
+    return len(ids)
+
+
+def refresh_match_reports(job):
+    """
+    Rebuilds the stored skill-match reports (and skill coverage) of a job's applicants whose
+    job or CV entities changed since the report was built. Returns the number of reports rewritten.
+    """
+    rows = Application.objects.filter(job=job).only('id', 'extracted_data', 'match_report')
+    stale = []
+    for application in rows.iterator(chunk_size=RESCORE_CHUNK_SIZE):
+        current = fingerprint(job.gliner_entities, application.extracted_data)
+        if (application.match_report or {}).get('fingerprint') != current:
+            application.match_report = build_match_report(job.gliner_entities, application.extracted_data)
+            application.skill_coverage = skill_coverage(application.match_report)
+            stale.append(application)
+
+    Application.objects.bulk_update(stale, ['match_report', 'skill_coverage'], batch_size=RESCORE_CHUNK_SIZE)
+    return len(stale)
+
+
+def rescore_job_task(job_id):
+    """Task handler: re-ranks a job's applicants after its embedding or entities changed (see tasks.queue)."""
+    job = Job.objects.filter(pk=job_id).first()
+    if job is None:
+        return
+    with stage_timer('job', 'score'):
+        rescore_job_applications(job)
+        refresh_match_reports(job)
+        rank_job_applications(job)
@@ -1,12 +1,58 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.core.exceptions import FieldDoesNotExist
 from django.utils.crypto import get_random_string
-from .models import Application
+from .models import Application, IngestionJob, TalentSuggestion
 
 
 User = get_user_model()
 
 
+def requested_fields(request):
+    """Field names asked for with ?fields=a,b (None when the parameter is absent)."""
+    if request is None or not request.query_params.get('fields'):
+        return None
+    return {name.strip() for name in request.query_params['fields'].split(',') if name.strip()}
+
+
+class SparseFieldsMixin:
+    """Honours ?fields=a,b (sparse fieldset): drops every other field. Unknown names are ignored."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = requested_fields(self.context.get('request'))
+        if requested:
+            for name in set(self.fields) - requested:
+                self.fields.pop(name)
+
+
+def project_queryset(queryset, serializer, extra=()):
+    """
+    Narrows `queryset` to the columns `serializer` outputs: only() for the model's own
+    columns and select_related + only() for the relations its sources follow
+    (e.g. candidate.full_name). CV text, entities and embeddings stay in the database
+    unless the serializer asks for them. `extra` adds columns the view itself reads.
+    """
+    serializer = getattr(serializer, 'child', serializer)
+    model = queryset.model
+    related, columns = set(), {'id', *extra}
+    for field in serializer.fields.values():
+        if field.source == '*':
+            continue
+        parts = field.source.split('.')
+        try:
+            model_field = model._meta.get_field(parts[0])
+        except FieldDoesNotExist:
+            continue  # Method or property; nothing to load
+        if len(parts) > 1 and model_field.is_relation:
+            related.add(parts[0])
+            columns.add('__'.join(parts))
+        columns.add(parts[0])
+    if related:
+        queryset = queryset.select_related(*sorted(related))
+    return queryset.only(*sorted(columns))
+
+
 class ApplicationCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Application
@@ -20,7 +66,7 @@ class ApplicationCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("You have already applied for this job.")
         return data
 
-class ApplicationDetailSerializer(serializers.ModelSerializer):
+class ApplicationDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     candidate_name = serializers.CharField(source='candidate.full_name', read_only=True)
     candidate_email = serializers.CharField(source='candidate.email', read_only=True)
     job_title = serializers.CharField(source='job.title', read_only=True)
@@ -30,7 +76,8 @@ class ApplicationDetailSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'job_title', 'candidate_name', 'candidate_email', 
             'cv_file', 'extracted_data', 'match_score', 
-            'status', 'created_at'
+            'similarity_score', 'skill_coverage', 'experience_years',
+            'processing_status', 'status', 'created_at'
         ]
 
 
@@ -78,4 +125,36 @@ class InterviewInviteSerializer(serializers.Serializer):
     date = serializers.DateField()
     time = serializers.TimeField()
     location = serializers.CharField(max_length=255)
-    message = serializers.CharField(required=False, allow_blank=True)
\ No newline at end of file
+    message = serializers.CharField(required=False, allow_blank=True)
+
+class BulkStatusSerializer(serializers.Serializer):
+    application_ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=1000)
+    action = serializers.ChoiceField(choices=['shortlist', 'reject'])
+
+class TalentPoolMatchSerializer(serializers.Serializer):
+    """One talent pool search hit: a candidate and their best-matching application."""
+    application_id = serializers.IntegerField(source='application.id')
+    candidate_name = serializers.CharField(source='application.candidate.full_name')
+    candidate_email = serializers.CharField(source='application.candidate.email')
+    job_id = serializers.IntegerField(source='application.job_id')
+    job_title = serializers.CharField(source='application.job.title')
+    status = serializers.CharField(source='application.status')
+    score = serializers.FloatField()
+
+
+class TalentSuggestionSerializer(serializers.ModelSerializer):
+    candidate_name = serializers.CharField(source='candidate.full_name', read_only=True)
+    candidate_email = serializers.CharField(source='candidate.email', read_only=True)
+    source_job_title = serializers.CharField(source='application.job.title', read_only=True)
+
+    class Meta:
+        model = TalentSuggestion
+        fields = ['rank', 'score', 'candidate_name', 'candidate_email', 'application', 'source_job_title', 'created_at']
+
+
+class IngestionJobSerializer(serializers.ModelSerializer):
+    progress = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = IngestionJob
+        fields = ['id', 'job', 'status', 'total', 'processed', 'failed', 'progress', 'errors', 'created_at', 'finished_at']
@@ -0,0 +1,82 @@
+"""
+Set-based application status changes (shortlist, reject, interview invite).
+
+Each transition runs a constant number of queries however many applications it covers:
+one SELECT loading the applications with their job and candidate (only the columns the
+messages need), one UPDATE for the new status, and for invites one bulk INSERT into the
+email outbox (tasks.outbox), all in one transaction. Used by the HR pages and the API.
+"""
+from datetime import datetime
+
+from django.db import transaction
+from django.utils import timezone
+
+from tasks.outbox import build_email, queue_emails
+
+from .models import Application
+
+# Columns loaded for the recipients; the CV text, extracted data and embeddings stay in the DB
+RECIPIENT_FIELDS = (
+    'id', 'status', 'interview_date', 'job', 'candidate',
+    'job__title', 'candidate__full_name', 'candidate__email',
+)
+
+
+def load_recipients(application_ids):
+    """The applications with job and candidate, in one query."""
+    return list(
+        Application.objects.filter(id__in=application_ids)
+        .select_related('job', 'candidate')
+        .only(*RECIPIENT_FIELDS)
+        .order_by('id')
+    )
+
+
+def set_status(application_ids, status, compose_email=None, **fields):
+    """
+    Moves the applications to `status` (plus any extra `fields`) with one UPDATE.
+    If `compose_email(app)` is given, its (subject, body) is queued to each candidate
+    in the same transaction. Returns the updated applications, job and candidate loaded.
+    """
+    with transaction.atomic():
+        applications = load_recipients(application_ids)
+        if not applications:
+            return []
+        Application.objects.filter(id__in=[app.id for app in applications]).update(status=status, **fields)
+        for app in applications:
+            app.status = status
+            for name, value in fields.items():
+                setattr(app, name, value)
+
+        if compose_email is not None:
+            queue_emails([
+                build_email(*compose_email(app), [app.candidate.email]) for app in applications
+            ])
+    return applications
+
+
+def shortlist(application_ids):
+    return set_status(application_ids, 'SHORTLISTED')
+
+
+def reject(application_ids):
+    return set_status(application_ids, 'REJECTED')
+
+
+def invite(application_ids, date, time, location, notes=''):
+    """Shortlists the applications, records the interview slot and queues the invitations."""
+    def compose(app):
+        subject = f"Interview Invitation: {app.job.title}"
+        body = (
+            f"Dear {app.candidate.full_name},\n\n"
+            f"You have been Shortlisted for an Interview!\n\n"
+            f"📅 Date: {date}\n"
+            f"⏰ Time: {time}\n"
+            f"📍 Location: {location}\n\n"
+            f"Notes: {notes}\n\n"
+            f"Best regards,\nSmart Hire Solutions Team"
+        )
+        return subject, body
+
+    interview_date = timezone.make_aware(datetime.combine(date, time))
+    return set_status(application_ids, 'SHORTLISTED', compose_email=compose, interview_date=interview_date)
@@ -0,0 +1,49 @@
+import hashlib
+import os
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+def hash_file(f):
+    """SHA-256 of an uploaded or stored file, read in chunks. Leaves the file rewound."""
+    digest = hashlib.sha256()
+    f.seek(0)
+    for chunk in f.chunks(HASH_CHUNK_SIZE) if hasattr(f, 'chunks') else iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+        digest.update(chunk)
+    f.seek(0)
+    return digest.hexdigest()
+
+
+def cv_upload_path(instance, filename):
+    """
+    Content-addressed path: cvs/<first 2 hex chars>/<sha256>.<ext>.
+    Re-uploads of the same bytes map to the same file. Uses the hash Application.save() recorded.
+    """
+    return cv_storage_name(instance.cv_sha256 or hash_file(instance.cv_file.file), filename)
+
+
+def cv_storage_name(digest, filename=''):
+    ext = os.path.splitext(filename)[1].lower() or '.pdf'
+    return f"cvs/{digest[:2]}/{digest}{ext}"
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File storage where the name is derived from the content hash,
+    so an existing file with the same name already has the same bytes and is reused as-is.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def _save(self, name, content):
+        if self.exists(name):
+            return name
+        try:
+            return super()._save(name, content)
+        except FileExistsError:
+            return name  # Another worker stored the same content first
@@ -0,0 +1,398 @@
+"""
+Semantic search across every CV ever received (the talent pool).
+
+CV vectors of all applications live in an in-process approximate nearest-neighbour
+index (HNSW via hnswlib; an exact numpy matrix when hnswlib is not installed).
+The index is kept current incrementally: before each search it pulls the
+applications embedded since its last sync, using Application.embedded_at as the
+watermark. It is saved to TALENT_INDEX_DIR, so a restart loads the file and only
+catches up on what changed since.
+
+Every save writes a new bundle directory holding the index file and its meta.json
+(watermark included), then repoints the CURRENT file at it with one os.replace. Web
+and worker processes share the directory, so a reader always gets an index together
+with the watermark it was saved at, never a newer watermark with an older index.
+"""
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+from jobs.embeddings import get_embedding_batcher
+from jobs.model_server import ModelServerUnavailable
+from jobs.models import Job
+from jobs.vectors import VECTOR_DTYPE, normalize_vector
+from .models import Application, TalentSuggestion
+
+# Rows embedded just before the watermark are read again, in case their transaction committed late
+SYNC_OVERLAP = timedelta(seconds=60)
+SYNC_CHUNK_SIZE = 1000
+CURRENT_BUNDLE_FILE = 'CURRENT'  # Name of the bundle directory to load
+KEPT_BUNDLES = 3  # Older bundles are deleted; the previous ones stay for readers still loading them
+
+
+class HNSWBackend:
+    """hnswlib graph over unit vectors; inner product equals cosine similarity."""
+    name = 'hnsw'
+    filename = 'index.bin'
+
+    def __init__(self, dim, index=None):
+        self.dim = dim
+        if index is None:
+            index = hnswlib.Index(space='ip', dim=dim)
+            index.init_index(
+                max_elements=SYNC_CHUNK_SIZE,
+                ef_construction=settings.TALENT_INDEX_EF_CONSTRUCTION,
+                M=settings.TALENT_INDEX_M,
+            )
+        self.index = index
+
+    def __len__(self):
+        return self.index.get_current_count()
+
+    def add(self, ids, matrix):
+        # Re-adding an existing label replaces its vector
+        needed = len(self) + len(ids)
+        if needed > self.index.get_max_elements():
+            self.index.resize_index(max(needed, self.index.get_max_elements() * 2))
+        self.index.add_items(matrix, np.asarray(ids, dtype=np.int64))
+
+    def search(self, vec, k):
+        k = min(k, len(self))
+        if k == 0:
+            return []
+        self.index.set_ef(max(settings.TALENT_INDEX_EF_SEARCH, k))
+        labels, distances = self.index.knn_query(vec, k=k)
+        # 'ip' distance is 1 - dot product
+        return [(int(label), float(1 - dist)) for label, dist in zip(labels[0], distances[0])]
+
+    def save(self, path):
+        self.index.save_index(path)
+
+    @classmethod
+    def load(cls, path, dim):
+        index = hnswlib.Index(space='ip', dim=dim)
+        index.load_index(path)
+        return cls(dim, index)
+
+
+class ExactBackend:
+    """Brute-force fallback: one matrix-vector product per query."""
+    name = 'exact'
+    filename = 'index.npz'
+
+    def __init__(self, dim, ids=None, matrix=None):
+        self.dim = dim
+        self.ids = ids if ids is not None else np.empty(0, dtype=np.int64)
+        self.matrix = matrix if matrix is not None else np.empty((0, dim), dtype=VECTOR_DTYPE)
+        self._positions = {int(app_id): i for i, app_id in enumerate(self.ids)}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, ids, matrix):
+        new_ids, new_rows = [], []
+        for app_id, row in zip(ids, matrix):
+            pos = self._positions.get(app_id)
+            if pos is None:
+                self._positions[app_id] = len(self.ids) + len(new_ids)
+                new_ids.append(app_id)
+                new_rows.append(row)
+            else:
+                self.matrix[pos] = row
+        if new_ids:
+            self.ids = np.concatenate([self.ids, np.asarray(new_ids, dtype=np.int64)])
+            self.matrix = np.vstack([self.matrix, np.asarray(new_rows, dtype=VECTOR_DTYPE)])
+
+    def search(self, vec, k):
+        k = min(k, len(self))
+        if k == 0:
+            return []
+        scores = self.matrix @ vec
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(self.ids[i]), float(scores[i])) for i in top]
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            np.savez(f, ids=self.ids, matrix=self.matrix)
+
+    @classmethod
+    def load(cls, path, dim):
+        with np.load(path) as data:
+            return cls(dim, data['ids'], np.array(data['matrix']))
+
+
+def _backend_class():
+    return HNSWBackend if hnswlib is not None else ExactBackend
+
+
+class TalentIndex:
+    """
+    Thread-safe, incrementally synced index of application CV vectors, keyed by application id.
+    backend_class defaults to HNSW when available; persist=False keeps it memory-only.
+    """
+
+    def __init__(self, directory=None, backend_class=None, persist=True):
+        self.directory = directory or settings.TALENT_INDEX_DIR
+        self.backend_class = backend_class or _backend_class()
+        self.persist = persist
+        self.backend = None
+        self.watermark = None
+        self._recent = {}  # application id -> embedded_at, for rows inside the overlap window
+        self._unsaved = 0
+        self._saved_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.backend) if self.backend is not None else 0
+
+    # --- Sync ---
+    def sync(self):
+        """Adds applications embedded since the last sync. Returns how many vectors were added or replaced."""
+        with self._lock:
+            return self._sync()
+
+    def _sync(self):
+        rows = Application.objects.filter(cv_embedding__isnull=False, embedded_at__isnull=False)
+        if self.watermark is not None:
+            rows = rows.filter(embedded_at__gte=self.watermark - SYNC_OVERLAP)
+        rows = rows.order_by('embedded_at', 'id').values_list('id', 'embedded_at', 'cv_embedding')
+
+        added = 0
+        ids, vectors = [], []
+        for app_id, embedded_at, vec in rows.iterator(chunk_size=SYNC_CHUNK_SIZE):
+            if self._recent.get(app_id) == embedded_at:
+                continue
+            self._recent[app_id] = embedded_at
+            self.watermark = max(self.watermark, embedded_at) if self.watermark else embedded_at
+
+            if self.backend is None:
+                self.backend = self.backend_class(vec.shape[0])
+            # Vectors from a model with a different dimension need re-embedding first
+            if vec.shape[0] != self.backend.dim:
+                continue
+            ids.append(app_id)
+            vectors.append(vec)
+            if len(ids) >= SYNC_CHUNK_SIZE:
+                self.backend.add(ids, np.vstack(vectors))
+                added += len(ids)
+                ids, vectors = [], []
+
+        if ids:
+            self.backend.add(ids, np.vstack(vectors))
+            added += len(ids)
+
+        if self.watermark is not None:
+            cutoff = self.watermark - SYNC_OVERLAP
+            self._recent = {k: v for k, v in self._recent.items() if v >= cutoff}
+
+        self._unsaved += added
+        if self.persist and self._unsaved and time.monotonic() - self._saved_at >= settings.TALENT_INDEX_SAVE_INTERVAL:
+            self._save()
+        return added
+
+    # --- Search ---
+    def search(self, vec, k):
+        """Syncs, then returns up to k (application_id, cosine similarity) pairs, best first."""
+        vec = normalize_vector(vec)
+        with self._lock:
+            self._sync()
+            if self.backend is None or vec.shape[0] != self.backend.dim:
+                return []
+            return self.backend.search(vec, k)
+
+    # --- Persistence ---
+    def save(self):
+        with self._lock:
+            self._save()
+
+    def _save(self):
+        if self.backend is None:
+            return
+        # A fresh bundle per save (sortable by name), published by swapping CURRENT to it
+        bundle_name = f"bundle-{time.time_ns()}-{os.getpid()}-{threading.get_ident()}"
+        bundle = os.path.join(self.directory, bundle_name)
+        os.makedirs(bundle)
+        self.backend.save(os.path.join(bundle, self.backend.filename))
+
+        meta = {
+            'backend': self.backend.name,
+            'dim': self.backend.dim,
+            'count': len(self.backend),
+            'watermark': self.watermark.isoformat() if self.watermark else None,
+        }
+        with open(os.path.join(bundle, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+
+        pointer = os.path.join(self.directory, CURRENT_BUNDLE_FILE)
+        with open(f"{pointer}.{bundle_name}.tmp", 'w') as f:
+            f.write(bundle_name)
+        os.replace(f"{pointer}.{bundle_name}.tmp", pointer)
+        self._prune_bundles()
+
+        self._unsaved = 0
+        self._saved_at = time.monotonic()
+        print(f"💾 Saved talent pool index ({meta['count']} CVs) to {bundle}")
+
+    def _prune_bundles(self):
+        current = self._current_bundle()
+        bundles = sorted(name for name in os.listdir(self.directory) if name.startswith('bundle-'))
+        for name in bundles[:-KEPT_BUNDLES]:
+            if name != current:
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def _current_bundle(self):
+        try:
+            with open(os.path.join(self.directory, CURRENT_BUNDLE_FILE)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def load(self):
+        """Loads the current saved bundle if it is for the active backend. Returns True on success."""
+        try:
+            bundle_name = self._current_bundle()
+            if bundle_name is None:
+                return False
+            bundle = os.path.join(self.directory, bundle_name)
+            with open(os.path.join(bundle, 'meta.json')) as f:
+                meta = json.load(f)
+            if meta['backend'] != self.backend_class.name:
+                return False
+            backend = self.backend_class.load(os.path.join(bundle, self.backend_class.filename), meta['dim'])
+        except (OSError, ValueError, KeyError, RuntimeError) as e:
+            # e.g. the bundle was pruned while loading: the next sync starts from scratch
+            print(f"⚠️ Could not load talent pool index from {self.directory}: {e}")
+            return False
+
+        with self._lock:
+            self.backend = backend
+            self.watermark = parse_datetime(meta['watermark']) if meta['watermark'] else None
+            self._recent = {}
+            self._unsaved = 0
+        print(f"✅ Loaded talent pool index ({len(backend)} CVs) from {bundle}")
+        return True
+
+
+_index = None
+_matrix = None
+_index_lock = threading.Lock()
+
+
+def get_talent_index():
+    """Process-wide index, loaded from disk on first use when a saved copy exists."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = TalentIndex()
+            _index.load()
+    return _index
+
+
+def get_candidate_matrix():
+    """
+    Process-wide, memory-only float32 matrix of every CV vector, for exact scoring
+    of a whole job in one matrix-vector product (see match_job_to_talent_pool).
+    """
+    global _matrix
+    with _index_lock:
+        if _matrix is None:
+            _matrix = TalentIndex(backend_class=ExactBackend, persist=False)
+    return _matrix
+
+
+def embed_query(text):
+    """Embeds a free-text search with the Jina model (through the batcher / model server)."""
+    batcher = get_embedding_batcher()
+    if batcher is None:
+        raise ModelServerUnavailable("AI models are not loaded.")
+    return batcher.encode(text)
+
+
+def search_talent_pool(query_vec, k=20, index=None, exclude_candidates=()):
+    """
+    Top-k candidates across all jobs for a query vector, best match first.
+    A candidate who applied several times appears once, with their best-matching application.
+    Returns dicts with 'application' (job and candidate preloaded) and 'score' (0-100).
+    """
+    if index is None:
+        index = get_talent_index()
+    exclude_candidates = set(exclude_candidates)
+    fetch = k * 3 + len(exclude_candidates)
+
+    while True:
+        hits = index.search(query_vec, fetch)
+        applications = Application.objects.select_related('candidate', 'job').in_bulk([app_id for app_id, _ in hits])
+
+        results, seen_candidates = [], set()
+        for app_id, score in hits:
+            application = applications.get(app_id)
+            # Deleted applications stay in the index until the next rebuild
+            if application is None or application.candidate_id in seen_candidates:
+                continue
+            if application.candidate_id in exclude_candidates:
+                continue
+            seen_candidates.add(application.candidate_id)
+            results.append({'application': application, 'score': round(score * 100, 2)})
+            if len(results) == k:
+                return results
+
+        if len(hits) < fetch:
+            return results  # Index exhausted
+        fetch *= 2
+
+
+def match_job_to_talent_pool(job):
+    """
+    Talent pool match stage for a freshly embedded job: scores it against every stored CV
+    in one pass over the cached candidate matrix and stores the top TALENT_POOL_SUGGESTIONS
+    candidates who have not applied yet. Returns the number of suggestions stored.
+    """
+    if job.jina_embedding is None:
+        return 0
+
+    started = time.perf_counter()
+    applied = set(job.applications.values_list('candidate_id', flat=True))
+    matches = search_talent_pool(
+        job.jina_embedding,
+        k=settings.TALENT_POOL_SUGGESTIONS,
+        index=get_candidate_matrix(),
+        exclude_candidates=applied,
+    )
+
+    with transaction.atomic():
+        TalentSuggestion.objects.filter(job=job).delete()
+        TalentSuggestion.objects.bulk_create([
+            TalentSuggestion(
+                job=job,
+                candidate_id=match['application'].candidate_id,
+                application=match['application'],
+                score=match['score'],
+                rank=rank,
+            )
+            for rank, match in enumerate(matches, start=1)
+        ])
+
+    print(f"✅ Talent pool: {len(matches)} suggestions for '{job.title}' in {(time.perf_counter() - started) * 1000:.0f} ms")
+    return len(matches)
+
+
+def match_talent_pool_task(job_id):
+    """Task handler: suggests past applicants for a newly embedded job (see tasks.queue)."""
+    job = Job.objects.filter(pk=job_id).first()
+    if job is None:
+        return
+    match_job_to_talent_pool(job)
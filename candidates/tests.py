@@ -1,3 +1,447 @@
-from django.test import TestCase
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+from datetime import date, time
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from jobs.models import Job
+from tasks.models import OutboxEmail, Task
+from tasks.queue import claim_next_task, enqueue, run_task
+from users.models import User
+from . import status
+from .models import Application, IngestionJob, ParsedCV
+from .pagination import decode_cursor, keyset_page
+from .scoring import composite_scores, rank_job_applications, rescore_job_task
+
+HEAVY_COLUMNS = ('cv_text_content', 'cv_embedding', 'match_report', 'stage_keys')
+
+
+class RankingProjectionTests(TestCase):
+    """Ranking lists run a constant number of queries and never load the CV text or embeddings."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.hr = User.objects.create_user(email='hr@example.com', password='pass', role='HR', full_name='HR')
+        cls.job = Job.objects.create(posted_by=cls.hr, title='Backend Developer')
+
+    def setUp(self):
+        self.api = APIClient()
+        self.api.force_authenticate(self.hr)
+
+    def add_applications(self, count):
+        start = Application.objects.count()
+        for i in range(start, start + count):
+            candidate = User.objects.create_user(
+                email=f'c{i}@example.com', password='pass', role='Candidate', full_name=f'Candidate {i}'
+            )
+            Application.objects.create(
+                job=self.job, candidate=candidate, cv_file=f'cvs/{i}.pdf', match_score=i % 7,
+                cv_text_content='Python developer ' * 2000, cv_embedding=[0.1] * 768,
+                extracted_data={'Skill': ['Python', 'Django'] * 20},
+            )
+
+    def ranking(self, query=''):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.api.get(f'/api/candidates/job/{self.job.id}/ranking/{query}')
+        self.assertEqual(response.status_code, 200)
+        return response, queries
+
+    def test_api_query_count_does_not_grow_with_rows(self):
+        self.add_applications(3)
+        _, few = self.ranking()
+        self.add_applications(17)
+        response, many = self.ranking()
+        self.assertEqual(len(response.data['results']), 20)
+        self.assertEqual(len(few), 1)
+        self.assertEqual(len(many), 1)
+
+    def test_api_skips_heavy_columns(self):
+        self.add_applications(5)
+        response, queries = self.ranking()
+        sql = queries[0]['sql']
+        for column in HEAVY_COLUMNS:
+            self.assertNotIn(column, sql)
+        row = response.data['results'][0]
+        self.assertEqual(row['job_title'], 'Backend Developer')
+        self.assertTrue(row['candidate_name'].startswith('Candidate'))
+
+    def test_sparse_fieldset(self):
+        self.add_applications(10)
+        full, _ = self.ranking()
+        response, queries = self.ranking('?fields=id,candidate_name,match_score')
+        rows = json.loads(response.content)['results']
+        self.assertEqual(set(rows[0]), {'id', 'candidate_name', 'match_score'})
+        self.assertNotIn('extracted_data', queries[0]['sql'])
+        self.assertLess(len(response.content), 100 * len(rows))
+        self.assertLess(len(response.content), len(full.content) / 5)
+
+    def test_fast_list_matches_serializer_output(self):
+        self.add_applications(8)
+        for query in ('', '?fields=candidate_name,cv_file'):
+            fast, _ = self.ranking(query)
+            with override_settings(API_FAST_LISTS=False):
+                slow, _ = self.ranking(query)
+            self.assertEqual(json.loads(fast.content), json.loads(slow.content))
+
+        Job.objects.filter(id=self.job.id).update(jina_embedding=[0.1, 1 / 3, -0.7])
+        fast = self.api.get('/api/jobs/')
+        with override_settings(API_FAST_LISTS=False):
+            slow = self.api.get('/api/jobs/')
+        self.assertEqual(json.loads(fast.content), json.loads(slow.content))
+
+    def test_ranking_page_query_count_does_not_grow_with_rows(self):
+        self.client.force_login(self.hr)
+        url = f'/jobs/{self.job.id}/ranking/'
+        self.add_applications(3)
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(url)
+        self.add_applications(17)
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(url)
+        self.assertEqual(len(response.context['applications']), 20)
+        self.assertEqual(len(few), len(many))
+        for query in many:
+            for column in HEAVY_COLUMNS:
+                self.assertNotIn(f'"candidates_application"."{column}"', query['sql'])
+
+
+class StatusServiceQueryTests(TestCase):
+    """Shortlist, reject and invite run the same number of queries for one application as for many."""
+
+    @classmethod
+    def setUpTestData(cls):
+        hr = User.objects.create_user(email='hr@example.com', password='pass', role='HR', full_name='HR')
+        job = Job.objects.create(posted_by=hr, title='Backend Developer')
+        cls.ids = []
+        for i in range(11):
+            candidate = User.objects.create_user(
+                email=f'c{i}@example.com', password='pass', role='Candidate', full_name=f'Candidate {i}'
+            )
+            cls.ids.append(Application.objects.create(job=job, candidate=candidate, cv_file=f'cvs/{i}.pdf').id)
+
+    def assert_constant_queries(self, change):
+        # Each run starts with no queued emails and no dispatch task waiting
+        OutboxEmail.objects.all().delete()
+        Task.objects.all().delete()
+        with CaptureQueriesContext(connection) as one:
+            change(self.ids[:1])
+        OutboxEmail.objects.all().delete()
+        Task.objects.all().delete()
+        with self.assertNumQueries(len(one)):
+            change(self.ids[1:])
+
+    def test_shortlist(self):
+        self.assert_constant_queries(status.shortlist)
+        self.assertEqual(Application.objects.filter(status='SHORTLISTED').count(), 11)
+
+    def test_reject(self):
+        self.assert_constant_queries(status.reject)
+        self.assertEqual(Application.objects.filter(status='REJECTED').count(), 11)
+
+    def test_invite(self):
+        self.assert_constant_queries(lambda ids: status.invite(ids, date(2026, 11, 2), time(10, 30), 'Office'))
+        self.assertEqual(OutboxEmail.objects.count(), 10)
+        self.assertEqual(Application.objects.filter(interview_date__isnull=False).count(), 11)
+
+
+class DedupeCVFilesTests(TestCase):
+    """dedupe_cv_files moves legacy uploads to their content-addressed path and drops the copies."""
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        media_override = override_settings(MEDIA_ROOT=self.media)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+
+        hr = User.objects.create_user(email='hr@example.com', password='pass', role='HR', full_name='HR')
+        self.job = Job.objects.create(posted_by=hr, title='Backend Developer')
+        os.makedirs(os.path.join(self.media, 'cvs'))
+
+    def legacy_application(self, i, filename, content):
+        with open(os.path.join(self.media, 'cvs', filename), 'wb') as f:
+            f.write(content)
+        candidate = User.objects.create_user(
+            email=f'c{i}@example.com', password='pass', role='Candidate', full_name=f'Candidate {i}'
+        )
+        return Application.objects.create(job=self.job, candidate=candidate, cv_file=f'cvs/{filename}')
+
+    def test_duplicates_share_one_file(self):
+        same = [self.legacy_application(i, f'cv_{i}.PDF', b'%PDF same') for i in range(3)]
+        other = self.legacy_application(3, 'other.pdf', b'%PDF other')
+
+        call_command('dedupe_cv_files', stdout=io.StringIO())
+
+        digest = hashlib.sha256(b'%PDF same').hexdigest()
+        for application in same:
+            application.refresh_from_db()
+            self.assertEqual(application.cv_file.name, f'cvs/{digest[:2]}/{digest}.pdf')
+            self.assertEqual(application.cv_sha256, digest)
+        other.refresh_from_db()
+        self.assertEqual(other.cv_sha256, hashlib.sha256(b'%PDF other').hexdigest())
+        with other.cv_file.open('rb') as f:
+            self.assertEqual(f.read(), b'%PDF other')
+
+        stored = [os.path.join(root, name) for root, _, names in os.walk(self.media) for name in names]
+        self.assertEqual(len(stored), 2)
+
+
+class IngestionFailureTests(TestCase):
+
+    def test_chunk_out_of_retries_finishes_the_ingestion(self):
+        hr = User.objects.create_user(email='hr@example.com', password='pass', role='HR', full_name='HR')
+        job = Job.objects.create(posted_by=hr, title='Backend Developer')
+        ingestion = IngestionJob.objects.create(job=job, created_by=hr, total=2)
+        ids = []
+        for i in range(2):
+            candidate = User.objects.create_user(
+                email=f'c{i}@example.com', password='pass', role='Candidate', full_name=f'Candidate {i}'
+            )
+            ids.append(Application.objects.create(
+                job=job, candidate=candidate, cv_file=f'cvs/{i}.pdf', ingestion=ingestion,
+            ).id)
+        enqueue('ingest_cvs', max_attempts=1, ingestion_id=ingestion.id, application_ids=ids)
+
+        with mock.patch('jobs.apps.JobsConfig.require_models', side_effect=RuntimeError('model server down')):
+            self.assertFalse(run_task(claim_next_task()))
+
+        ingestion.refresh_from_db()
+        self.assertEqual((ingestion.status, ingestion.failed, ingestion.processed), ('DONE', 2, 0))
+        self.assertEqual(set(Application.objects.values_list('processing_status', flat=True)), {'FAILED'})
+
+
+class RescoreTests(TestCase):
+    """rescore_job recomputes similarity from the embeddings and match_score from the job's weights."""
+
+    def setUp(self):
+        hr = User.objects.create_user(email='hr@example.com', password='pass', role='HR', full_name='HR')
+        self.job = Job.objects.create(
+            posted_by=hr, title='Backend Developer', jina_embedding=[1.0, 0.0, 0.0, 0.0],
+            gliner_entities=[
+                {'text': 'Python', 'label': 'Skill'}, {'text': 'Django', 'label': 'Skill'},
+                {'text': '4', 'label': 'Min_Years_Req'},
+            ],
+        )
+        cvs = [
+            ([0.6, 0.8, 0.0, 0.0], [{'text': 'Python', 'label': 'Skill'}], 2.0),
+            ([0.0, 1.0, 0.0, 0.0], [{'text': 'Python', 'label': 'Skill'}, {'text': 'Django', 'label': 'Skill'}], 6.0),
+            ([1.0, 0.0, 0.0], [], 1.0),  # Older model with another dimension
+        ]
+        for i, (embedding, entities, years) in enumerate(cvs):
+            candidate = User.objects.create_user(
+                email=f'c{i}@example.com', password='pass', role='Candidate', full_name=f'Candidate {i}'
+            )
+            Application.objects.create(
+                job=self.job, candidate=candidate, cv_file=f'cvs/{i}.pdf', cv_embedding=embedding,
+                extracted_data=entities, experience_years=years, similarity_score=90.0, match_score=90.0,
+            )
+
+    def assert_scores_match_weights(self):
+        rows = Application.objects.order_by('id').values_list(
+            'similarity_score', 'skill_coverage', 'experience_years', 'match_score'
+        )
+        similarity, coverage, years, stored = zip(*rows)
+        expected = composite_scores(
+            similarity, coverage, years,
+            (self.job.similarity_weight, self.job.skills_weight, self.job.experience_weight), req_years=4,
+        )
+        self.assertEqual(list(stored), list(expected))
+
+    def test_rescore_and_weight_change(self):
+        rescore_job_task(self.job.id)
+        similarity = list(Application.objects.order_by('id').values_list('similarity_score', flat=True))
+        self.assertAlmostEqual(similarity[0], 60.0, places=2)
+        self.assertAlmostEqual(similarity[1], 0.0, places=2)
+        self.assertIsNone(similarity[2])
+        coverage = list(Application.objects.order_by('id').values_list('skill_coverage', flat=True))
+        self.assertEqual(coverage[:2], [0.5, 1.0])
+        self.assert_scores_match_weights()
+
+        Job.objects.filter(pk=self.job.pk).update(similarity_weight=0.1, skills_weight=0.2, experience_weight=0.7)
+        self.job.refresh_from_db()
+        rank_job_applications(self.job)
+        self.assert_scores_match_weights()
+
+
+class FakeGliner:
+    def __init__(self):
+        self.texts = 0
+
+    def predict_entities(self, text, labels, threshold=0.5):
+        self.texts += 1
+        return [{'text': 'Python', 'label': 'Skill', 'start': 0, 'end': 6, 'score': 0.9}]
+
+
+class FakeJina:
+    def __init__(self):
+        self.texts = 0
+
+    def encode(self, texts, **kwargs):
+        self.texts += len(texts)
+        return [[1.0, float(len(text)), 0.0, 0.0] for text in texts]
+
+
+class ReprocessCommandTests(TestCase):
+    """`manage.py reprocess` recomputes only stale stages and resumes after an interruption."""
+
+    def setUp(self):
+        jobs_config = apps.get_app_config('jobs')
+        self.gliner, self.jina = FakeGliner(), FakeJina()
+        jobs_config.gliner_model, jobs_config.jina_model = self.gliner, self.jina
+        self.addCleanup(setattr, jobs_config, 'gliner_model', None)
+        self.addCleanup(setattr, jobs_config, 'jina_model', None)
+        for name in ('load_models', 'require_models'):
+            patcher = mock.patch(f'jobs.apps.JobsConfig.{name}')
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        # Every "PDF" reads as text naming its file
+        self.extracted = []
+
+        def extract(sources):
+            self.extracted.extend(source.name for source in sources)
+            return [f'Python developer, CV {source.name}' for source in sources]
+        patcher = mock.patch('candidates.utils.extract_texts_from_pdfs', side_effect=extract)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        hr = User.objects.create_user(email='hr@example.com', password='pass', role='HR', full_name='HR')
+        self.job = Job.objects.create(
+            posted_by=hr, title='Backend Developer', description_text='Python developer', processing_status='SCORED',
+        )
+        # Two applications share the first CV file
+        for i, sha in enumerate(['a' * 64, 'a' * 64, 'b' * 64]):
+            candidate = User.objects.create_user(
+                email=f'c{i}@example.com', password='pass', role='Candidate', full_name=f'Candidate {i}'
+            )
+            Application.objects.create(
+                job=self.job, candidate=candidate, cv_file=f'cvs/{sha[0]}.pdf', cv_sha256=sha,
+                processing_status='SCORED',
+            )
+
+    def reprocess(self, *args):
+        out = io.StringIO()
+        self.extracted, self.gliner.texts, self.jina.texts = [], 0, 0
+        call_command('reprocess', '--chunk-size=1', *args, stdout=out)
+        return out.getvalue()
+
+    def test_second_run_recomputes_nothing(self):
+        output = self.reprocess()
+        self.assertIn('CVs: extract recomputed 2, entities recomputed 2, embed recomputed 2', output)
+        self.assertEqual(sorted(self.extracted), ['cvs/a.pdf', 'cvs/b.pdf'])
+
+        shared = Application.objects.filter(cv_sha256='a' * 64)
+        parsed = ParsedCV.objects.get(sha256='a' * 64)
+        for application in shared:
+            self.assertEqual(application.stage_keys, parsed.stage_keys)
+            self.assertEqual(application.cv_text_content, 'Python developer, CV cvs/a.pdf')
+            self.assertEqual(application.processing_status, 'SCORED')
+
+        output = self.reprocess()
+        self.assertIn('Jobs: extract recomputed 0, entities recomputed 0, embed recomputed 0', output)
+        self.assertIn('CVs: extract recomputed 0, entities recomputed 0, embed recomputed 0', output)
+        self.assertEqual((self.extracted, self.gliner.texts, self.jina.texts), ([], 0, 0))
+
+    def test_version_bump_recomputes_only_that_stage(self):
+        self.reprocess()
+        with mock.patch.dict('candidates.utils.CV_STAGE_VERSIONS', {'embed': 2}):
+            output = self.reprocess()
+        self.assertIn('CVs: extract recomputed 0, entities recomputed 0, embed recomputed 2', output)
+        self.assertIn('Jobs: extract recomputed 0, entities recomputed 0, embed recomputed 0', output)
+        self.assertEqual((self.extracted, self.gliner.texts, self.jina.texts), ([], 0, 2))
+
+    def test_adopt_stamps_existing_outputs(self):
+        Application.objects.update(
+            cv_text_content='Python developer', extracted_data=[{'text': 'Python', 'label': 'Skill'}],
+            cv_embedding=[1.0, 0.0, 0.0, 0.0],
+        )
+        Job.objects.update(
+            processed_text='Python developer', gliner_entities=[{'text': 'Python', 'label': 'Skill'}],
+            jina_embedding=[1.0, 0.0, 0.0, 0.0],
+        )
+        output = self.reprocess('--adopt')
+        self.assertIn('CVs: extract stamped 2, entities stamped 2, embed stamped 2', output)
+
+        output = self.reprocess()
+        self.assertIn('Jobs: extract recomputed 0, entities recomputed 0, embed recomputed 0', output)
+        self.assertIn('CVs: extract recomputed 0, entities recomputed 0, embed recomputed 0', output)
+        self.assertEqual((self.extracted, self.gliner.texts, self.jina.texts), ([], 0, 0))
+        self.assertEqual(Application.objects.get(candidate__email='c2@example.com').cv_text_content, 'Python developer')
+
+    def test_interrupted_run_resumes(self):
+        with mock.patch('candidates.management.commands.reprocess.Command.propagate', side_effect=[1, KeyboardInterrupt]):
+            with self.assertRaises(KeyboardInterrupt):
+                self.reprocess('--only=cvs')
+        self.assertEqual(ParsedCV.objects.filter(stage_keys__has_key='embed').count(), 2)
+
+        output = self.reprocess('--only=cvs')
+        self.assertIn('CVs: extract recomputed 0, entities recomputed 0, embed recomputed 0', output)
+        self.assertEqual(self.extracted, [])
+        # Neither chunk's applications were updated by the interrupted run; this one catches them up
+        first, second = ParsedCV.objects.order_by('id').values_list('id', flat=True)
+        self.assertIn(f'CVs up to #{first}: 2 application(s) updated', output)
+        self.assertIn(f'CVs up to #{second}: 1 application(s) updated', output)
+        for application in Application.objects.all():
+            self.assertEqual(application.stage_keys, ParsedCV.objects.get(sha256=application.cv_sha256).stage_keys)
+
+
+class KeysetPaginationTests(TestCase):
+    """Walking the ranking page by page visits every application exactly once, ties included."""
+
+    @classmethod
+    def setUpTestData(cls):
+        hr = User.objects.create_user(email='hr@example.com', password='pass', role='HR', full_name='HR')
+        cls.job = Job.objects.create(posted_by=hr, title='Backend Developer')
+        for i in range(23):
+            candidate = User.objects.create_user(
+                email=f'c{i}@example.com', password='pass', role='Candidate', full_name=f'Candidate {i}'
+            )
+            # Only three distinct scores, so most pages start and end inside a run of ties
+            Application.objects.create(job=cls.job, candidate=candidate, cv_file=f'cvs/{i}.pdf', match_score=i % 3)
+        cls.expected = list(
+            Application.objects.filter(job=cls.job).order_by('-match_score', '-id').values_list('id', flat=True)
+        )
+
+    def walk(self, size):
+        seen, ranks, cursor = [], [], None
+        for _ in range(len(self.expected) + 1):  # A cursor that does not advance fails instead of looping
+            items, cursor, first_rank = keyset_page(Application.objects.filter(job=self.job), cursor, size)
+            seen.extend(app.id for app in items)
+            ranks.append(first_rank)
+            if cursor is None:
+                break
+        return seen, ranks
+
+    def test_pages_have_no_duplicates_or_gaps(self):
+        for size in (1, 2, 4, 5, 7, 23, 50):
+            seen, ranks = self.walk(size)
+            self.assertEqual(seen, self.expected, f"page size {size}")
+            self.assertEqual(ranks, list(range(1, len(self.expected) + 1, size)), f"page size {size}")
+
+    def test_api_pages(self):
+        api = APIClient()
+        api.force_authenticate(User.objects.get(email='hr@example.com'))
+        seen, url = [], f'/api/candidates/job/{self.job.id}/ranking/?page_size=4'
+        for _ in range(len(self.expected)):
+            page = api.get(url).data
+            seen.extend(row['id'] for row in page['results'])
+            url = page['next']
+            if url is None:
+                break
+        self.assertEqual(seen, self.expected)
+
+    def test_bad_cursor_starts_over(self):
+        self.assertIsNone(decode_cursor('not-a-cursor'))
+        items, _, first_rank = keyset_page(Application.objects.filter(job=self.job), 'not-a-cursor', 5)
+        self.assertEqual([app.id for app in items], self.expected[:5])
+        self.assertEqual(first_rank, 1)
@@ -4,7 +4,12 @@ from .views import (
     CandidateMyApplicationsView, 
     JobApplicationsListView,
     HRAddReferenceView,       # New
-    SendInterviewInviteView   # New
+    SendInterviewInviteView,  # New
+    BulkApplicationStatusView,
+    TalentPoolSearchView,
+    JobTalentSuggestionsView,
+    BulkIngestView,
+    IngestionJobDetailView,
 )
 app_name = 'candidates'
 
@@ -15,10 +20,18 @@ urlpatterns = [
 
     # HR / Reviewer
     path('job/<int:job_id>/ranking/', JobApplicationsListView.as_view(), name='job-ranking'),
+    path('job/<int:job_id>/suggestions/', JobTalentSuggestionsView.as_view(), name='job-suggestions'),
+    path('talent-pool/search/', TalentPoolSearchView.as_view(), name='talent-pool-search'),
     
     # New: HR Uploads Reference
     path('hr/upload-reference/', HRAddReferenceView.as_view(), name='hr-upload-reference'),
     
+    # HR bulk CV upload and its progress
+    path('hr/bulk-upload/', BulkIngestView.as_view(), name='hr-bulk-upload'),
+    path('ingestions/<int:pk>/', IngestionJobDetailView.as_view(), name='ingestion-detail'),
+
     # New: Send Interview Invite (PK is the Application ID)
     path('application/<int:pk>/invite/', SendInterviewInviteView.as_view(), name='send-invite'),
+    # Shortlist / reject many applications at once
+    path('hr/applications/status/', BulkApplicationStatusView.as_view(), name='bulk-status'),
 ]
\ No newline at end of file
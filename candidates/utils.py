@@ -1,39 +1,22 @@
-import fitz
 import numpy as np
 import re
 from datetime import datetime
 from django.apps import apps
-from numpy.linalg import norm
-
-# --- 1. DEFINE A SAFETY NET OF KEYWORDS ---
-# GLiNER matches context, this matches exact raw text to catch dense lists.
-HARD_SKILLS_DB = {
-    # Languages
-    "python", "java", "c++", "c#", "javascript", "typescript", "php", "ruby", "swift", "kotlin", "go", "rust",
-    # Web / Frameworks
-    "django", "flask", "fastapi", "react", "angular", "vue", "next.js", "node.js", "spring", "laravel", 
-    "asp.net", "rubyonrails", "flutter", "react native",
-    # Data / AI
-    "numpy", "pandas", "pytorch", "tensorflow", "keras", "scikit-learn", "opencv", "matplotlib", "seaborn", 
-    "nltk", "spacy", "huggingface", "llm", "rag", "transformer", "yolo", "chromadb", "langchain", "ollama",
-    # DevOps / Tools
-    "docker", "kubernetes", "aws", "azure", "gcp", "git", "github", "gitlab", "jenkins", "terraform", "linux", "redis",
-    # Databases
-    "sql", "mysql", "postgresql", "mongodb", "sqlite", "oracle", "firebase", "elasticsearch"
-}
-
-def extract_text_from_pdf(cv_file):
-    text = ""
-    try:
-        with fitz.open(stream=cv_file.read(), filetype="pdf") as doc:
-            for page in doc:
-                blocks = page.get_text("blocks")
-                blocks.sort(key=lambda b: (b[1], b[0]))
-                for b in blocks:
-                    text += b[4] + "\n"
-    except Exception as e:
-        print(f"❌ Error reading CV PDF: {e}")
-    return text
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from jobs.embeddings import get_embedding_batcher
+from jobs.entities import predict_entities_windowed, predict_entities_windowed_many
+from jobs.extraction import extract_texts_from_pdfs
+from jobs.metrics import observe_document, record_error, stage_timer
+from jobs.skills import canonical_skill_name, get_skill_matcher, replace_skill_links
+from jobs.stages import content_hash, is_current, stage_stamp
+from jobs.utils import set_processing_status
+from jobs.vectors import normalize_vector
+from .matching import build_match_report, skill_coverage
+from .models import Application, ApplicationSkill, ParsedCV
+from .scoring import score_application
+from jobs.models import Skill
+from .storage import hash_file
 
 def calculate_experience_years(text):
     """
@@ -87,13 +70,75 @@ def calculate_experience_years(text):
     return round(total_days / 365.25, 1)
 
 def calculate_cosine_similarity(vec_a, vec_b):
+    """
+    Embeddings are stored pre-normalised (see jobs.vectors), so cosine is a plain dot product.
+    """
     if vec_a is None or vec_b is None: return 0.0
     try:
-        a, b = np.array(vec_a), np.array(vec_b)
-        if a.size == 0 or b.size == 0 or np.all(a == 0) or np.all(b == 0): return 0.0
-        return float(np.dot(a, b) / (norm(a) * norm(b)))
+        if len(vec_a) == 0 or len(vec_a) != len(vec_b): return 0.0
+        return float(np.dot(vec_a, vec_b))
     except: return 0.0
 
+def set_application_skills(application_instance):
+    """Rebuilds the application's rows in the skill index from its extracted entities."""
+    replace_skill_links(ApplicationSkill, 'application_id', {application_instance.id: application_instance.extracted_data})
+
+def filter_applications(queryset, skills=None, min_years=None):
+    """
+    Database-side ranking filters: applications listing every skill in `skills`
+    (comma-separated or a list; synonyms folded) with at least `min_years` of experience.
+    Each skill is one indexed subquery on the skill index.
+    """
+    if isinstance(skills, str):
+        skills = skills.split(',')
+    names = {canonical_skill_name(s) for s in skills or [] if s.strip()}
+    if names:
+        skill_ids = dict(Skill.objects.filter(name__in=names).values_list('name', 'id'))
+        if len(skill_ids) < len(names):
+            return queryset.none()  # Nobody has a skill we have never seen
+        for skill_id in skill_ids.values():
+            queryset = queryset.filter(
+                id__in=ApplicationSkill.objects.filter(skill_id=skill_id).values('application_id')
+            )
+    if min_years not in (None, ''):
+        try:
+            queryset = queryset.filter(experience_years__gte=float(min_years))
+        except ValueError:
+            pass  # Ignore a malformed number rather than failing the whole list
+    return queryset
+
+def queue_application_processing(application_instance):
+    """Marks the application as queued and hands it to the background worker."""
+    from tasks.queue import enqueue
+
+    set_processing_status(application_instance, 'QUEUED')
+    enqueue('process_application', application_id=application_instance.id)
+
+def process_application_task(application_id):
+    """Task handler: extracts, embeds and scores one application (see tasks.queue)."""
+    application = Application.objects.select_related('job').filter(pk=application_id).first()
+    if application is None:
+        return  # Withdrawn / deleted while queued
+    try:
+        # Raises while the model server is down, so the queue retries later
+        apps.get_app_config('jobs').require_models()
+        process_application(application)
+    except Exception:
+        set_processing_status(application, 'FAILED')
+        raise
+
+def save_parsed_cv(parsed):
+    """Save `parsed`; if another worker inserted the same CV meanwhile, write into its row."""
+    if parsed.pk is not None:
+        parsed.save()
+        return
+    try:
+        with transaction.atomic():
+            parsed.save()
+    except IntegrityError:
+        parsed.pk = ParsedCV.objects.values_list('pk', flat=True).get(sha256=parsed.sha256)
+        parsed.save(force_update=True)
+
 def process_application(application_instance):
     print(f"--- Processing Application ID: {application_instance.id} ---")
     
@@ -101,106 +146,330 @@ def process_application(application_instance):
         JobsConfig = apps.get_app_config('jobs')
         gliner = JobsConfig.gliner_model
         jina = JobsConfig.jina_model
-    except LookupError: return
+    except LookupError:
+        set_processing_status(application_instance, 'FAILED')
+        return
+
+    if not gliner or not jina:
+        set_processing_status(application_instance, 'FAILED')
+        return
 
-    if not gliner or not jina: return
+    if not application_instance.cv_file:
+        set_processing_status(application_instance, 'FAILED')
+        return
 
-    if application_instance.cv_file:
-        raw_text = extract_text_from_pdf(application_instance.cv_file)
-        application_instance.cv_file.seek(0)
-    else: return
+    # --- CONTENT-HASH + STAGE CACHE ---
+    # The same CV (same bytes) sent to several jobs is parsed and embedded only once,
+    # and a cached analysis only redoes the stages whose code or model changed since
+    if not application_instance.cv_sha256:
+        application_instance.cv_sha256 = hash_file(application_instance.cv_file)
 
-    # Cleaning
+    parsed = ParsedCV.objects.filter(sha256=application_instance.cv_sha256).first()
+    if parsed is None:
+        parsed = ParsedCV(sha256=application_instance.cv_sha256)
+    changed = run_cv_stages(
+        [parsed], [application_instance.cv_file], gliner,
+        on_stage=lambda status: set_processing_status(application_instance, status),
+    )[0]
+    if changed:
+        # A failed GLiNER stage is saved unstamped, so the next use of this CV retries it
+        with stage_timer('cv', 'save'):
+            save_parsed_cv(parsed)
+    else:
+        print(f"♻️ Reusing cached analysis for CV {parsed.sha256[:12]}")
+    if 'embed' not in parsed.stage_keys:
+        set_processing_status(application_instance, 'FAILED')
+        return
+    copy_parsed_cv(parsed, application_instance)
+
+    # Scoring: store the parts, then combine them with the job's weights
+    with stage_timer('cv', 'score'):
+        score_application_parts(application_instance)
+        application_instance.match_score = score_application(application_instance)
+    application_instance.embedded_at = timezone.now()  # Picked up by the talent pool index
+    application_instance.processing_status = 'SCORED'
+    with stage_timer('cv', 'save'):
+        application_instance.save()
+        set_application_skills(application_instance)
+
+def process_applications_batch(applications, gliner, on_written=None):
+    """
+    process_application for many applications (expects `job` loaded): their distinct CVs go
+    through run_cv_stages together and everything is written back with bulk queries in one
+    transaction, at the end of which on_written(scored, failed) is called.
+    Returns (scored, failed).
+    """
+    sources = {}
+    for application in applications:
+        sources.setdefault(application.cv_sha256, application.cv_file)
+    parsed_by_sha = {p.sha256: p for p in ParsedCV.objects.filter(sha256__in=list(sources))}
+    new_rows = [ParsedCV(sha256=sha256) for sha256 in sources if sha256 not in parsed_by_sha]
+    parsed_by_sha.update((p.sha256, p) for p in new_rows)
+
+    rows = list(parsed_by_sha.values())
+    changed = run_cv_stages(rows, [sources[p.sha256] for p in rows], gliner)
+
+    now = timezone.now()
+    scored, failed = [], []
+    with stage_timer('cv', 'score', items=len(applications)):
+        for application in applications:
+            parsed = parsed_by_sha[application.cv_sha256]
+            if 'embed' not in parsed.stage_keys:
+                application.processing_status = 'FAILED'
+                failed.append(application)
+                continue
+            copy_parsed_cv(parsed, application)
+            score_application_parts(application)
+            application.match_score = score_application(application)
+            application.embedded_at = now  # Picked up by the talent pool index
+            application.processing_status = 'SCORED'
+            scored.append(application)
+
+    with stage_timer('cv', 'save', items=len(applications)), transaction.atomic():
+        ParsedCV.objects.bulk_create(new_rows, ignore_conflicts=True)  # Another worker may have cached the same CV
+        ParsedCV.objects.bulk_update(
+            [p for p, stages in zip(rows, changed) if stages and p.pk],
+            ['text_content', 'extracted_data', 'embedding', 'stage_keys'],
+        )
+        Application.objects.bulk_update(scored, [
+            'cv_text_content', 'extracted_data', 'cv_embedding', 'stage_keys', 'experience_years',
+            'similarity_score', 'match_report', 'skill_coverage', 'match_score', 'embedded_at', 'processing_status',
+        ])
+        Application.objects.bulk_update(failed, ['processing_status'])
+        replace_skill_links(ApplicationSkill, 'application_id', {a.id: a.extracted_data for a in scored})
+        if on_written:
+            on_written(len(scored), len(failed))
+    return len(scored), len(failed)
+
+def copy_parsed_cv(parsed, application_instance):
+    """Copies a ParsedCV's stage outputs (and their stamps) onto an application."""
+    application_instance.cv_text_content = parsed.text_content
+    application_instance.extracted_data = parsed.extracted_data
+    application_instance.cv_embedding = parsed.embedding
+    application_instance.stage_keys = parsed.stage_keys
+    application_instance.experience_years = next(
+        (float(item['text']) for item in parsed.extracted_data or [] if item.get('label') == 'Total_Years_Calc'),
+        None,
+    )
+
+def score_application_parts(application_instance):
+    """Similarity, match report and skill coverage against the application's job (no save)."""
+    job = application_instance.job
+    if job.jina_embedding is not None and application_instance.cv_embedding is not None:
+        sim = calculate_cosine_similarity(application_instance.cv_embedding, job.jina_embedding)
+        application_instance.similarity_score = round(sim * 100, 2)
+    application_instance.match_report = build_match_report(job.gliner_entities, application_instance.extracted_data)
+    application_instance.skill_coverage = skill_coverage(application_instance.match_report)
+
+# Bump a stage's number when its code changes; `manage.py reprocess` then redoes that stage
+CV_STAGE_VERSIONS = {'extract': 1, 'entities': 1, 'embed': 1}
+
+CV_ENTITY_LABELS = [
+    "Skill", "Technology", "Framework", "Programming Language", 
+    "Job Title", "Project", "Degree", "University", 
+    "Database", "Tool", "Platform", "Cloud", "Service"
+]
+# Labels whose text goes into the "Skills:" part of the embedding context
+CV_FOCUS_SKILL_LABELS = ["Skill", "Technology", "Framework", "Database", "Tool", "Platform", "Programming Language"]
+
+def current_cv_stamps(parsed):
+    """Stamps each stage would get from a ParsedCV's current inputs and stored outputs (dry runs, --adopt)."""
+    return {
+        'extract': stage_stamp('cv', 'extract', CV_STAGE_VERSIONS['extract'], parsed.sha256),
+        'entities': stage_stamp('cv', 'entities', CV_STAGE_VERSIONS['entities'], content_hash(parsed.text_content)),
+        'embed': stage_stamp('cv', 'embed', CV_STAGE_VERSIONS['embed'], content_hash(
+            cv_embedding_text(parsed.text_content, parsed.extracted_data)
+        )),
+    }
+
+def run_cv_stages(parsed_cvs, sources, gliner, force=False, on_stage=None):
+    """
+    Extract -> Clean -> GLiNER (+ taxonomy safety net) -> Jina for a batch of ParsedCV rows,
+    redoing only the stages whose stamp (jobs.stages) no longer matches. sources[i] is the PDF
+    of parsed_cvs[i], opened only if its text must be re-extracted. Each stage runs over the
+    whole batch at once: PDFs in the process pool, GLiNER windows in shared batches and the
+    embeddings through the micro-batcher.
+    Updates the rows in memory and returns one set of stages run per row (None for a row
+    whose text had to be extracted but has no source file).
+    """
+    changed = [set() for _ in parsed_cvs]
+    for parsed in parsed_cvs:
+        parsed.stage_keys = {} if force else dict(parsed.stage_keys or {})
+
+    # Extraction
+    to_extract = []
+    for i, parsed in enumerate(parsed_cvs):
+        stamp = stage_stamp('cv', 'extract', CV_STAGE_VERSIONS['extract'], parsed.sha256)
+        if is_current(parsed.stage_keys, 'extract', stamp):
+            continue
+        if sources[i] is None:
+            print(f"❌ No file to extract CV {parsed.sha256[:12]} from.")
+            changed[i] = None
+        else:
+            to_extract.append((i, stamp))
+    if to_extract:
+        if on_stage:
+            on_stage('EXTRACTING')
+        with stage_timer('cv', 'extract', items=len(to_extract)):
+            texts = extract_texts_from_pdfs([sources[i] for i, _ in to_extract])
+        for (i, stamp), raw_text in zip(to_extract, texts):
+            observe_document('cv', raw_text)
+            if not raw_text:
+                record_error('cv', 'extract')  # Read errors are logged and come back as empty text
+            with stage_timer('cv', 'clean'):
+                parsed_cvs[i].text_content = clean_cv_text(raw_text)
+            parsed_cvs[i].stage_keys['extract'] = stamp
+            changed[i].add('extract')
+
+    # GLiNER (one batched pass over the windows of every CV that needs it)
+    to_tag = []
+    for i, parsed in enumerate(parsed_cvs):
+        if changed[i] is None:
+            continue
+        stamp = stage_stamp('cv', 'entities', CV_STAGE_VERSIONS['entities'], content_hash(parsed.text_content))
+        if not is_current(parsed.stage_keys, 'entities', stamp):
+            to_tag.append((i, stamp))
+    predicted = None
+    if len(to_tag) > 1:
+        try:
+            with stage_timer('cv', 'predict_entities', items=len(to_tag)):
+                predicted = predict_entities_windowed_many(
+                    gliner, [parsed_cvs[i].text_content for i, _ in to_tag], CV_ENTITY_LABELS, threshold=0.3
+                )
+        except Exception as e:
+            print(f"⚠️ Batched GLiNER failed ({e}); tagging CVs one by one.")
+    for n, (i, stamp) in enumerate(to_tag):
+        parsed = parsed_cvs[i]
+        try:
+            parsed.extracted_data = extract_cv_entities(
+                parsed.text_content, gliner, entities=predicted[n] if predicted is not None else None
+            )
+            parsed.stage_keys['entities'] = stamp
+        except Exception as e:
+            print(f"Extraction Error: {e}")
+            parsed.extracted_data = []
+            parsed.stage_keys.pop('entities', None)
+        changed[i].add('entities')
+
+    # Jina Embedding (includes both AI-found and taxonomy-recovered skills)
+    pending = []
+    for i, parsed in enumerate(parsed_cvs):
+        if changed[i] is None:
+            continue
+        text = cv_embedding_text(parsed.text_content, parsed.extracted_data)
+        stamp = stage_stamp('cv', 'embed', CV_STAGE_VERSIONS['embed'], content_hash(text))
+        if not is_current(parsed.stage_keys, 'embed', stamp) or parsed.embedding is None:
+            pending.append((i, stamp, text))
+
+    if not pending:
+        return changed
+    if on_stage:
+        on_stage('EMBEDDING')
+    def embed_failed(i, error):
+        # Left unstamped, like the job path, so the next run retries the embedding
+        print(f"❌ Jina Embedding Error: {error}")
+        record_error('cv', 'encode')
+        parsed_cvs[i].stage_keys.pop('embed', None)
+        changed[i].add('embed')
+
+    batcher = get_embedding_batcher()
+    with stage_timer('cv', 'encode', items=len(pending)):
+        futures = []
+        for i, stamp, text in pending:
+            try:
+                if batcher is None:
+                    raise RuntimeError("the Jina model is not loaded")
+                futures.append((i, stamp, batcher.submit(text)))
+            except Exception as e:
+                embed_failed(i, e)
+        for i, stamp, future in futures:
+            try:
+                parsed_cvs[i].embedding = normalize_vector(future.result())
+            except Exception as e:
+                embed_failed(i, e)
+                continue
+            parsed_cvs[i].stage_keys['embed'] = stamp
+            changed[i].add('embed')
+    return changed
+
+def clean_cv_text(raw_text):
+    """PDF text with bullets and runs of whitespace removed."""
     clean_text = raw_text.replace("•", "").replace("●", "").replace("|", "")
-    clean_text = re.sub(r'\s+', ' ', clean_text).strip()
-    application_instance.cv_text_content = clean_text
+    return re.sub(r'\s+', ' ', clean_text).strip()
 
+def extract_cv_entities(clean_text, gliner, entities=None):
+    """
+    GLiNER entities (with context fixes), the Total_Years_Calc logic entity and the
+    keyword safety net's 'Skill (Detected)' entries. Pass `entities` when the raw GLiNER
+    output was already predicted in a batch. GLiNER errors propagate.
+    """
     # --- LOGIC 1: CALCULATE EXPERIENCE YEARS ---
     total_years = calculate_experience_years(clean_text)
     print(f"⏱️ Calculated Experience: {total_years} Years")
 
-    # GLiNER Extraction Config
-    labels = [
-        "Skill", "Technology", "Framework", "Programming Language", 
-        "Job Title", "Project", "Degree", "University", 
-        "Database", "Tool", "Platform", "Cloud", "Service"
-    ]
-    
     unique_data = []
     focused_skills = []
-    focused_titles = []
 
-    try:
-        # 1. AI Extraction (Context Aware)
-        entities = gliner.predict_entities(clean_text, labels, threshold=0.3)
-        seen = set()
+    # 1. AI Extraction (Context Aware), windowed so skills late in long CVs are kept
+    if entities is None:
+        with stage_timer('cv', 'predict_entities'):
+            entities = predict_entities_windowed(gliner, clean_text, CV_ENTITY_LABELS, threshold=0.3)
+    seen = set()
+    
+    # Add the Calculated Years as a Logic Entity
+    unique_data.append({"label": "Total_Years_Calc", "text": str(total_years)})
+
+    # Header detection for context fixes
+    idx_projects = clean_text.upper().find("PROJECTS")
+    other_headers = ["EXPERIENCE", "EDUCATION", "SKILLS", "SUMMARY"]
+    idx_next = len(clean_text)
+    if idx_projects != -1:
+        for h in other_headers:
+            idx = clean_text.upper().find(h)
+            if idx > idx_projects: idx_next = min(idx_next, idx)
+
+    for e in entities:
+        text, label = e['text'].strip(), e['label']
+        start = e.get('start', -1)
+
+        # Context Logic fixes
+        if idx_projects != -1 and label == "Job Title" and idx_projects < start < idx_next:
+            label = "Project"
         
-        # Add the Calculated Years as a Logic Entity
-        unique_data.append({"label": "Total_Years_Calc", "text": str(total_years)})
-
-        # Header detection for context fixes
-        idx_projects = clean_text.upper().find("PROJECTS")
-        other_headers = ["EXPERIENCE", "EDUCATION", "SKILLS", "SUMMARY"]
-        idx_next = len(clean_text)
-        if idx_projects != -1:
-            for h in other_headers:
-                idx = clean_text.upper().find(h)
-                if idx > idx_projects: idx_next = min(idx_next, idx)
-
-        for e in entities:
-            text, label = e['text'].strip(), e['label']
-            start = e.get('start', -1)
-
-            # Context Logic fixes
-            if idx_projects != -1 and label == "Job Title" and idx_projects < start < idx_next:
-                label = "Project"
+        if text.upper() in ["AWS", "DOCKER", "KUBERNETES", "GIT", "GITHUB"]:
+            if label not in ["Job Title", "Project"]: label = "Technology"
+
+        key = (label, text.lower())
+        if key not in seen:
+            seen.add(key)
+            unique_data.append({"label": label, "text": text})
             
-            if text.upper() in ["AWS", "DOCKER", "KUBERNETES", "GIT", "GITHUB"]:
-                if label not in ["Job Title", "Project"]: label = "Technology"
-
-            key = (label, text.lower())
-            if key not in seen:
-                seen.add(key)
-                unique_data.append({"label": label, "text": text})
-                
-                if label in ["Skill", "Technology", "Framework", "Database", "Tool", "Platform", "Programming Language"]:
-                    focused_skills.append(text)
-                elif label in ["Job Title"]:
-                    focused_titles.append(text)
-
-        # --- 2. KEYWORD SAFETY NET (REGEX FALLBACK) ---
-        # Catches skills that exist in text but GLiNER missed due to formatting
-        existing_skills_lower = {s.lower() for s in focused_skills}
-        text_lower = clean_text.lower()
-        
-        for skill in HARD_SKILLS_DB:
-            # Use regex boundaries \b to ensure we match "Go" but not "Good"
-            if skill not in existing_skills_lower:
-                if re.search(r'\b' + re.escape(skill) + r'\b', text_lower):
-                    print(f"⚠️ Recovered missing skill via Regex: {skill}")
-                    # Add to extracted data so it shows in UI with a special label
-                    unique_data.append({"label": "Skill (Detected)", "text": skill.title()})
-                    # Add to list used for Jina Embedding
-                    focused_skills.append(skill.title())
-                    existing_skills_lower.add(skill)
-
-        application_instance.extracted_data = unique_data
-
-    except Exception as e:
-        print(f"Extraction Error: {e}")
-        application_instance.extracted_data = []
-
-    # Jina Embedding
-    # Now includes both AI-found and Regex-recovered skills
-    rich_context = f"Role: {', '.join(focused_titles)}. Skills: {', '.join(focused_skills)}. Exp: {total_years} years. Full: {clean_text}"
-    
-    try:
-        application_instance.cv_embedding = jina.encode(rich_context).tolist()
-    except: return
+            if label in CV_FOCUS_SKILL_LABELS:
+                focused_skills.append(text)
 
-    # Scoring
-    if application_instance.job.jina_embedding:
-        sim = calculate_cosine_similarity(application_instance.cv_embedding, application_instance.job.jina_embedding)
-        application_instance.match_score = round(sim * 100, 2)
-    
-    application_instance.save()
\ No newline at end of file
+    # --- 2. KEYWORD SAFETY NET (TAXONOMY MATCH) ---
+    # Catches skills that exist in text but GLiNER missed due to formatting.
+    # One Aho-Corasick pass over the text finds every taxonomy skill (jobs/data/skills_taxonomy.txt).
+    existing_skills_lower = {s.lower() for s in focused_skills}
+
+    with stage_timer('cv', 'skills_fallback'):
+        found = get_skill_matcher().find_skills(clean_text)
+    for skill in found:
+        # Matches sit on word boundaries, so "Go" is found but not inside "Good"
+        if skill not in existing_skills_lower:
+            print(f"⚠️ Recovered missing skill via keyword match: {skill}")
+            # Add to extracted data so it shows in UI with a special label
+            unique_data.append({"label": "Skill (Detected)", "text": skill.title()})
+            existing_skills_lower.add(skill)
+
+    return unique_data
+
+def cv_embedding_text(clean_text, entities):
+    """The context string Jina embeds: roles, skills (AI-found + recovered), years, full text."""
+    entities = entities if isinstance(entities, list) else []
+    focused_titles = [e['text'] for e in entities if e.get('label') == "Job Title"]
+    focused_skills = [e['text'] for e in entities if e.get('label') in CV_FOCUS_SKILL_LABELS + ["Skill (Detected)"]]
+    total_years = next((e['text'] for e in entities if e.get('label') == "Total_Years_Calc"), None)
+    if total_years is None:
+        total_years = calculate_experience_years(clean_text)
+    return f"Role: {', '.join(focused_titles)}. Skills: {', '.join(focused_skills)}. Exp: {total_years} years. Full: {clean_text}"
@@ -1,20 +1,43 @@
-from django.core.mail import send_mail
-from django.conf import settings
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import Application
+from Smart_Hire_Solutions.fast_lists import FastListMixin
+from jobs.model_server import ModelServerUnavailable
+from jobs.models import Job
+from . import status as application_status
+from .ingestion import create_ingestion
+from .models import Application, IngestionJob, TalentSuggestion
+from .pagination import RANKING_ORDER, RankingCursorPagination
 from .serializers import ApplicationCreateSerializer, ApplicationDetailSerializer
-from .utils import process_application
+from .talent_pool import embed_query, search_talent_pool
+from .utils import filter_applications, queue_application_processing
 from .permissions import IsCandidate, IsHR, IsReviewer
 from .serializers import (
     ApplicationCreateSerializer, 
     ApplicationDetailSerializer, 
+    BulkStatusSerializer,
     HRApplicationCreateSerializer, # New
-    InterviewInviteSerializer      # New
+    InterviewInviteSerializer,     # New
+    IngestionJobSerializer,
+    project_queryset,
+    TalentPoolMatchSerializer,
+    TalentSuggestionSerializer,
 )
 
+TALENT_POOL_MAX_RESULTS = 100
+
+class ProjectedListMixin:
+    """
+    List views load only the columns their serializer outputs (plus `projection_extra`),
+    with the relations it follows joined in the same query. See project_queryset.
+    """
+    projection_extra = ()
+
+    def filter_queryset(self, queryset):
+        return project_queryset(super().filter_queryset(queryset), self.get_serializer(), self.projection_extra)
+
+
 class ApplyJobView(generics.CreateAPIView):
     """
     Candidate uploads CV here.
@@ -25,10 +48,10 @@ class ApplyJobView(generics.CreateAPIView):
     def perform_create(self, serializer):
         # Save application
         application = serializer.save(candidate=self.request.user)
-        # Trigger AI (Extract -> Embed -> Score)
-        process_application(application)
+        # Queue AI (Extract -> Embed -> Score) for the background worker
+        queue_application_processing(application)
 
-class CandidateMyApplicationsView(generics.ListAPIView):
+class CandidateMyApplicationsView(ProjectedListMixin, generics.ListAPIView):
     """
     Candidate sees their own history.
     """
@@ -38,18 +61,6 @@ class CandidateMyApplicationsView(generics.ListAPIView):
     def get_queryset(self):
         return Application.objects.filter(candidate=self.request.user).order_by('-created_at')
 
-class JobApplicationsListView(generics.ListAPIView):
-    """
-    HR/Reviewer sees ALL candidates for a specific Job, RANKED BY SCORE.
-    """
-    serializer_class = ApplicationDetailSerializer
-    permission_classes = [permissions.IsAuthenticated] # Or IsHR | IsReviewer
-
-    def get_queryset(self):
-        job_id = self.kwargs.get('job_id')
-        # Order by Match Score (Highest first)
-        return Application.objects.filter(job_id=job_id).order_by('-match_score')
-    
 class HRAddReferenceView(generics.CreateAPIView):
     """
     HR uploads a CV directly. The candidate is tagged as having a reference.
@@ -59,16 +70,20 @@ class HRAddReferenceView(generics.CreateAPIView):
 
     def perform_create(self, serializer):
         application = serializer.save()
-        # Trigger the same AI scoring pipeline
-        process_application(application)
+        # Queue the same AI scoring pipeline
+        queue_application_processing(application)
 
-class JobApplicationsListView(generics.ListAPIView):
+class JobApplicationsListView(FastListMixin, ProjectedListMixin, generics.ListAPIView):
     """
-    HR/Reviewer sees ALL candidates.
-    Supports filtering by reference: ?has_reference=true
+    HR/Reviewer sees ALL candidates for a specific Job, RANKED BY SCORE.
+    Supports filtering by reference and status: ?has_reference=true&status=SHORTLISTED
+    Keyset-paginated: follow `next` (?cursor=...) instead of page numbers.
+    Pick the output columns with ?fields=id,candidate_name,match_score
     """
     serializer_class = ApplicationDetailSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = RankingCursorPagination
+    projection_extra = ('id', 'match_score')  # The keyset cursor reads them
 
     def get_queryset(self):
         job_id = self.kwargs.get('job_id')
@@ -81,8 +96,19 @@ class JobApplicationsListView(generics.ListAPIView):
             is_ref = has_reference.lower() == 'true'
             queryset = queryset.filter(has_reference=is_ref)
 
-        # Order by Score
-        return queryset.order_by('-match_score')
+        status_filter = self.request.query_params.get('status', '').upper()
+        if status_filter in dict(Application.STATUS_CHOICES):
+            queryset = queryset.filter(status=status_filter)
+
+        # Skill / experience filters run in the database: ?skills=django,aws&min_years=3
+        queryset = filter_applications(
+            queryset,
+            skills=self.request.query_params.get('skills'),
+            min_years=self.request.query_params.get('min_years'),
+        )
+
+        # Order by Score (ties by newest id), on the (job, -match_score, -id) index
+        return queryset.order_by(*RANKING_ORDER)
     
 class SendInterviewInviteView(APIView):
     """
@@ -91,38 +117,102 @@ class SendInterviewInviteView(APIView):
     permission_classes = [IsHR]
 
     def post(self, request, pk):
-        application = generics.get_object_or_404(Application, pk=pk)
         serializer = InterviewInviteSerializer(data=request.data)
         
         if serializer.is_valid():
             data = serializer.validated_data
-            
-            # 1. Update Status
-            application.status = 'INTERVIEW'
-            application.interview_date = f"{data['date']} {data['time']}" # Store loosely or parse to datetime
-            application.save()
-
-            # 2. Construct Email
-            subject = f"Interview Invitation: {application.job.title}"
-            message = (
-                f"Dear {application.candidate.full_name},\n\n"
-                f"We are pleased to invite you for an interview.\n\n"
-                f"Date: {data['date']}\n"
-                f"Time: {data['time']}\n"
-                f"Location: {data['location']}\n\n"
-                f"Additional Notes: {data.get('message', '')}\n\n"
-                f"Best regards,\nSmart Hire Solutions Team"
-            )
-
-            # 3. Send Email
-            send_mail(
-                subject,
-                message,
-                settings.EMAIL_HOST_USER or 'noreply@smarthire.com',
-                [application.candidate.email],
-                fail_silently=False,
-            )
-
-            return Response({"detail": "Interview invite sent successfully!"})
+            # Shortlist + queue the email in one transaction (sent by the workers, see tasks.outbox)
+            invited = application_status.invite([pk], data['date'], data['time'], data['location'], data.get('message', ''))
+            if not invited:
+                return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+            return Response({"detail": "Interview invite queued for sending!"})
         
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class BulkApplicationStatusView(APIView):
+    """
+    HR shortlists or rejects many applications at once (constant query count, see candidates.status).
+    """
+    permission_classes = [IsHR]
+    actions = {'shortlist': application_status.shortlist, 'reject': application_status.reject}
+
+    def post(self, request):
+        serializer = BulkStatusSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+        updated = self.actions[data['action']](data['application_ids'])
+        return Response({"updated": [app.id for app in updated], "status": updated[0].status if updated else None})
+
+
+class TalentPoolSearchView(APIView):
+    """
+    HR/Reviewer searches every CV ever received, across all jobs.
+    ?q=<free text> or ?job_id=<id> (uses the job's embedding), optional &k=<results, default 20>
+    """
+    permission_classes = [IsHR | IsReviewer]
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        job_id = request.query_params.get('job_id')
+        try:
+            k = min(max(int(request.query_params.get('k', 20)), 1), TALENT_POOL_MAX_RESULTS)
+        except ValueError:
+            return Response({"detail": "k must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        if job_id:
+            job = generics.get_object_or_404(Job, pk=job_id)
+            if job.jina_embedding is None:
+                return Response({"detail": "This job has not been processed yet."}, status=status.HTTP_409_CONFLICT)
+            query_vec = job.jina_embedding
+        elif query:
+            try:
+                query_vec = embed_query(query)
+            except ModelServerUnavailable as e:
+                return Response({"detail": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        else:
+            return Response({"detail": "Pass either q or job_id."}, status=status.HTTP_400_BAD_REQUEST)
+
+        matches = search_talent_pool(query_vec, k=k)
+        return Response(TalentPoolMatchSerializer(matches, many=True).data)
+
+
+class JobTalentSuggestionsView(generics.ListAPIView):
+    """
+    HR/Reviewer sees past applicants suggested for a job by the talent pool match,
+    best first. Candidates who have since applied to the job are left out.
+    """
+    serializer_class = TalentSuggestionSerializer
+    permission_classes = [IsHR | IsReviewer]
+
+    def get_queryset(self):
+        job_id = self.kwargs.get('job_id')
+        return (
+            TalentSuggestion.objects.filter(job_id=job_id)
+            .exclude(candidate__applications__job_id=job_id)
+            .select_related('candidate', 'application__job')
+            .order_by('rank')
+        )
+
+
+class BulkIngestView(APIView):
+    """
+    HR uploads many CVs at once: multipart `job` + one or more `files` (PDFs or ZIPs of PDFs).
+    Returns 202 with the ingestion to poll; the analysis runs in the task workers.
+    """
+    permission_classes = [IsHR]
+
+    def post(self, request):
+        job = generics.get_object_or_404(Job, pk=request.data.get('job'))
+        ingestion, errors = create_ingestion(job, request.user, request.FILES.getlist('files'))
+        if ingestion is None:
+            return Response({"detail": "No PDF files to ingest.", "errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(IngestionJobSerializer(ingestion).data, status=status.HTTP_202_ACCEPTED)
+
+
+class IngestionJobDetailView(generics.RetrieveAPIView):
+    """Progress of a bulk upload."""
+    queryset = IngestionJob.objects.all()
+    serializer_class = IngestionJobSerializer
+    permission_classes = [IsHR | IsReviewer]
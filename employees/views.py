@@ -1,3 +1,4 @@
+from django.db.models import DecimalField, ExpressionWrapper, F
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
@@ -9,6 +10,12 @@ from .serializers import (
 )
 from .permissions import IsHROrAdmin, IsEmployeeOwnerOrHRAdmin
 from users.models import User
+from Smart_Hire_Solutions.fast_lists import FastListMixin
+
+# Payroll.total_salary computed by the database, for the fast list path
+TOTAL_SALARY = ExpressionWrapper(
+    F('basic_salary') + F('bonuses') - F('deductions'), output_field=DecimalField(max_digits=12, decimal_places=2)
+)
 
 class EmployeeViewSet(viewsets.ModelViewSet):
     queryset = Employee.objects.all()
@@ -25,9 +32,10 @@ class EmployeeViewSet(viewsets.ModelViewSet):
             return Employee.objects.all()
         return Employee.objects.filter(user=user)
 
-class PayrollViewSet(viewsets.ModelViewSet):
+class PayrollViewSet(FastListMixin, viewsets.ModelViewSet):
     queryset = Payroll.objects.all()
     serializer_class = PayrollSerializer
+    fast_sources = {'total_salary': TOTAL_SALARY}
 
     def get_permissions(self):
         if self.action in ['create', 'destroy', 'update', 'partial_update']:
@@ -43,7 +51,7 @@ class PayrollViewSet(viewsets.ModelViewSet):
             return Payroll.objects.filter(employee=user.employee_profile)
         return Payroll.objects.none()
 
-class LeaveRequestViewSet(viewsets.ModelViewSet):
+class LeaveRequestViewSet(FastListMixin, viewsets.ModelViewSet):
     queryset = LeaveRequest.objects.all()
     serializer_class = LeaveRequestSerializer
     permission_classes = [IsAuthenticated]
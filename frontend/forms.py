@@ -1,5 +1,5 @@
 from django import forms
-from jobs.models import Job
+from jobs.models import Job, RANKING_WEIGHT_FIELDS
 from candidates.models import Application
 from django.contrib.auth.forms import AuthenticationForm, UserCreationForm
 from django.contrib.auth import get_user_model
@@ -64,6 +64,28 @@ class JobForm(forms.ModelForm):
         return cleaned_data
 
 
+class RankingWeightsForm(forms.ModelForm):
+    """How much similarity, skill coverage and experience count in a job's ranking."""
+    class Meta:
+        model = Job
+        fields = RANKING_WEIGHT_FIELDS
+        widgets = {
+            field: forms.NumberInput(attrs={'class': INPUT_STYLE, 'step': '0.05', 'min': '0'})
+            for field in RANKING_WEIGHT_FIELDS
+        }
+        labels = {
+            'similarity_weight': 'Semantic Similarity',
+            'skills_weight': 'Skill Coverage',
+            'experience_weight': 'Experience',
+        }
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if sum(cleaned_data.get(field) or 0 for field in RANKING_WEIGHT_FIELDS) <= 0:
+            raise forms.ValidationError("At least one weight must be above zero.")
+        return cleaned_data
+
+
 class ApplicationForm(forms.ModelForm):
     class Meta:
         model = Application
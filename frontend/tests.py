@@ -1,3 +1,12 @@
 from django.test import TestCase
 
-# Create your tests here.
+from users.models import User
+
+
+class TalentPoolPageTests(TestCase):
+
+    def test_non_numeric_job_is_not_found(self):
+        hr = User.objects.create_user(email='hr@example.com', password='pass', role='HR', full_name='HR')
+        self.client.force_login(hr)
+        for job in ('abc', '1x', '²', '999'):
+            self.assertEqual(self.client.get('/talent-pool/', {'job': job}).status_code, 404)
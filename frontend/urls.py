@@ -17,6 +17,8 @@ urlpatterns = [
     path('jobs/create/', views.create_job, name='create_job'),
     path('jobs/<int:job_id>/apply/', views.apply_for_job, name='apply_job'),
     path('jobs/<int:job_id>/ranking/', views.job_ranking, name='job_ranking'),
+    path('jobs/<int:job_id>/ranking/weights/', views.update_ranking_weights, name='update_ranking_weights'),
+    path('talent-pool/', views.talent_pool, name='talent_pool'),
     path('jobs/<int:pk>/', views.job_detail, name='job_detail'),
     path('jobs/<int:pk>/edit/', views.job_edit, name='job_edit'),
     path('jobs/<int:pk>/delete/', views.delete_job, name='delete_job'),
@@ -27,6 +29,7 @@ urlpatterns = [
     path('application/<int:pk>/delete/', views.delete_application, name='delete_application'), # NEW
     
     path('jobs/<int:job_id>/upload-cv/', views.hr_upload_cv, name='hr_upload_cv'),
+    path('ingestions/<int:pk>/', views.ingestion_status, name='ingestion_status'),
     path('application/<int:application_id>/invite/', views.send_interview_invite, name='send_interview_invite'),
     path('bulk-invite/', views.bulk_send_invite, name='bulk_send_invite'),
     path('jobs/<int:job_id>/status/', views.candidate_job_status, name='candidate_job_status'),
@@ -3,20 +3,35 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.contrib.auth import login, logout, get_user_model
 from jobs.models import Job
-from jobs.utils import run_ai_pipeline
-from candidates.models import Application
-from candidates.utils import process_application
-from .forms import JobForm, ApplicationForm, UserLoginForm, UserRegistrationForm, HRUploadCVForm, InterviewInviteForm, CVBuilderForm,EmployeeCreationForm, PayrollForm, LeaveRequestForm
+from jobs.recommendations import recommend_jobs
+from jobs.utils import queue_job_processing
+from candidates.ingestion import create_ingestion
+from candidates.models import Application, IngestionJob
+from candidates.matching import get_match_report
+from candidates.pagination import keyset_page
+from candidates.scoring import rank_job_applications
+from candidates.talent_pool import embed_query, search_talent_pool
+from candidates.utils import filter_applications, queue_application_processing
+from jobs.model_server import ModelServerUnavailable
+from .forms import JobForm, RankingWeightsForm, ApplicationForm, UserLoginForm, UserRegistrationForm, HRUploadCVForm, InterviewInviteForm, CVBuilderForm,EmployeeCreationForm, PayrollForm, LeaveRequestForm
 from .utils import generate_ats_cv
-from django.http import HttpResponseForbidden, FileResponse
+from django.http import Http404, HttpResponseForbidden, FileResponse, JsonResponse
 from django.core.mail import send_mail
+from candidates import status as application_status
 from django.conf import settings
-import uuid 
 from employees.models import Employee, Payroll, LeaveRequest
 
 
 User = get_user_model()
 
+TALENT_POOL_PAGE_SIZE = 25
+RANKING_PAGE_SIZE = 50
+RANKING_COLUMNS = (
+    'id', 'job', 'candidate', 'candidate__full_name', 'candidate__email', 'match_score', 'similarity_score',
+    'skill_coverage', 'experience_years', 'processing_status', 'status', 'has_reference', 'reference_name',
+)
+RECOMMENDED_JOBS_COUNT = 3
+
 
 def home(request):
     """Public Landing Page"""
@@ -26,14 +41,17 @@ def home(request):
 def job_list(request):
     """Show all jobs. Publicly accessible."""
     jobs = Job.objects.all().order_by('-created_at')
+    recommended = []
     
     if request.user.is_authenticated and getattr(request.user, 'role', '') == 'Candidate':
         my_apps = Application.objects.filter(candidate=request.user)
         status_map = {app.job_id: app.status for app in my_apps}
         for job in jobs:
             job.current_user_status = status_map.get(job.id)
+        # Ranked by fit with the candidate's latest processed CV
+        recommended = recommend_jobs(request.user, k=RECOMMENDED_JOBS_COUNT)
             
-    return render(request, 'job_list.html', {'jobs': jobs})
+    return render(request, 'job_list.html', {'jobs': jobs, 'recommended': recommended})
 
 @login_required
 def create_job(request):
@@ -48,8 +66,8 @@ def create_job(request):
             job = form.save(commit=False)
             job.posted_by = request.user
             job.save()
-            run_ai_pipeline(job)
-            messages.success(request, "Job posted and AI processed!")
+            queue_job_processing(job)
+            messages.success(request, "Job posted! AI processing has been queued.")
             return redirect('web_test:job_list')
     else:
         form = JobForm()
@@ -74,8 +92,8 @@ def apply_for_job(request, job_id):
             app.candidate = request.user
             app.job = job
             app.save()
-            process_application(app)
-            messages.success(request, f"Applied to {job.title}. AI Score Calculated!")
+            queue_application_processing(app)
+            messages.success(request, f"Applied to {job.title}. Your CV is queued for AI scoring.")
             return redirect('web_test:job_list')
     else:
         form = ApplicationForm()
@@ -87,13 +105,93 @@ def job_ranking(request, job_id):
     """HR Only: See ranked candidates."""
     job = get_object_or_404(Job, pk=job_id)
     
-    apps = Application.objects.filter(job=job)
+    # Only what the table shows; the CV text, entities and embeddings stay in the database
+    apps = Application.objects.filter(job=job).select_related('candidate').only(*RANKING_COLUMNS)
     if request.GET.get('ref'):
         apps = apps.filter(has_reference=True)
-        
-    apps = apps.order_by('-match_score')
+    skills = request.GET.get('skills', '').strip()
+    min_years = request.GET.get('min_years', '').strip()
+    status = request.GET.get('status', '').upper()
+    if status in dict(Application.STATUS_CHOICES):
+        apps = apps.filter(status=status)
+    else:
+        status = ''
+    apps = filter_applications(apps, skills=skills, min_years=min_years)
+
+    # Keyset pages on (match_score, id): deep pages cost the same as the first
+    apps, next_cursor, first_rank = keyset_page(apps, request.GET.get('cursor'), RANKING_PAGE_SIZE)
+    next_query = None
+    if next_cursor:
+        params = request.GET.copy()
+        params['cursor'] = next_cursor
+        next_query = params.urlencode()
+
+    # Past applicants from other jobs, shortlisted by the talent pool match
+    suggestions = (
+        job.talent_suggestions.exclude(candidate__applications__job=job)
+        .select_related('candidate', 'application__job')
+        .only(
+            'rank', 'score', 'candidate__full_name', 'candidate__email',
+            'application__job__title',
+        )
+        .order_by('rank')
+    )
     
-    return render(request, 'ranking.html', {'job': job, 'applications': apps})
+    return render(request, 'ranking.html', {
+        'job': job, 'applications': apps, 'suggestions': suggestions,
+        'skills': skills, 'min_years': min_years, 'status': status,
+        'status_choices': Application.STATUS_CHOICES, 'weights_form': RankingWeightsForm(instance=job),
+        'first_rank': first_rank, 'next_query': next_query, 'is_first_page': 'cursor' not in request.GET,
+    })
+
+@login_required
+def update_ranking_weights(request, job_id):
+    """HR Only: change a job's ranking weights and re-rank its applicants (no AI re-run)."""
+    job = get_object_or_404(Job, pk=job_id)
+    if request.user.role != 'HR':
+        messages.error(request, "Access Denied.")
+        return redirect('web_test:job_list')
+
+    if request.method == 'POST':
+        form = RankingWeightsForm(request.POST, instance=job)
+        if form.is_valid():
+            form.save()
+            count = rank_job_applications(job)
+            messages.success(request, f"Weights saved. {count} candidate(s) re-ranked.")
+        else:
+            for error in form.errors.values():
+                messages.error(request, error[0])
+    return redirect('web_test:job_ranking', job_id=job.id)
+
+@login_required
+def talent_pool(request):
+    """HR/Reviewer: semantic search across every CV ever received (free text or an existing job)."""
+    if request.user.role not in ['HR', 'Reviewer']:
+        messages.error(request, "Access Denied.")
+        return redirect('web_test:job_list')
+
+    query = request.GET.get('q', '').strip()
+    job_id = request.GET.get('job')
+    jobs = Job.objects.filter(jina_embedding__isnull=False).only('id', 'title').order_by('-created_at')
+
+    matches = None
+    if job_id:
+        if not job_id.isdecimal():
+            raise Http404("No such job.")
+        job = get_object_or_404(Job, pk=job_id)
+        if job.jina_embedding is None:
+            messages.warning(request, "This job has not been processed yet.")
+        else:
+            matches = search_talent_pool(job.jina_embedding, k=TALENT_POOL_PAGE_SIZE)
+    elif query:
+        try:
+            matches = search_talent_pool(embed_query(query), k=TALENT_POOL_PAGE_SIZE)
+        except ModelServerUnavailable:
+            messages.error(request, "The AI model is unavailable right now. Try again shortly.")
+
+    return render(request, 'talent_pool.html', {
+        'jobs': jobs, 'matches': matches, 'query': query, 'selected_job': job_id,
+    })
 
 
 def register_view(request):
@@ -164,6 +262,9 @@ def job_edit(request, pk):
         if form.is_valid():
             job = form.save(commit=False)
             job.save()
+            # Re-run AI (and re-rank applicants) only when the description changed
+            if 'description_text' in form.changed_data or 'description_file' in form.changed_data:
+                queue_job_processing(job)
             messages.success(request, "Job updated successfully!")
             return redirect('web_test:job_detail', pk=job.pk)
     else:
@@ -230,92 +331,16 @@ def delete_application(request, pk):
 
 @login_required
 def application_detail(request, pk):
-    application = get_object_or_404(Application, pk=pk)
+    application = get_object_or_404(Application.objects.select_related('job', 'candidate'), pk=pk)
     
     if request.user.role != 'HR' and request.user != application.candidate:
         messages.error(request, "Access Denied.")
         return redirect('web_test:job_list')
 
-    tech_labels = ['Skill', 'Technology', 'Framework', 'Programming Language', 'Database', 'Tool', 'Platform', 'Cloud', 'Service']
-
-    job_skills_map = {}
-    if application.job.gliner_entities:
-        for item in application.job.gliner_entities:
-            if item['label'] in tech_labels:
-                job_skills_map[item['text'].strip().lower()] = item['text'].strip()
+    # Built at scoring time; only recomputed if the job or CV entities changed since
+    report = get_match_report(application)
 
-    cv_skills_map = {}
-    if application.extracted_data:
-        for item in application.extracted_data:
-            if item['label'] in tech_labels:
-                cv_skills_map[item['text'].strip().lower()] = item['text'].strip()
-
-    matches = []
-    misses = []
-    extras = []
-    
-    req_years = 0
-    cand_years = 0.0
-
-    if application.job.gliner_entities:
-        for item in application.job.gliner_entities:
-            if item.get('label') == 'Min_Years_Req':
-                try: req_years = int(item['text'])
-                except ValueError: req_years = 0
-                break
-
-    if application.extracted_data:
-        for item in application.extracted_data:
-            if item.get('label') == 'Total_Years_Calc':
-                try: cand_years = float(item['text'])
-                except ValueError: cand_years = 0.0
-                break
-
-    if req_years > 0:
-        if cand_years >= req_years:
-            matches.insert(0, f"✅ {cand_years} Years Experience (Matches {req_years}+ Req)")
-        else:
-            misses.insert(0, f"❌ Requires {req_years}+ Years (Has {cand_years})")
-    elif cand_years > 0:
-        extras.insert(0, f"{cand_years} Years Total Experience")
-
-    synonyms = {
-        "drf": "django rest framework", "reactjs": "react", "js": "javascript",
-        "aws": "amazon web services", "postgres": "postgresql", "k8s": "kubernetes",
-    }
-
-    for j_key, j_text in job_skills_map.items():
-        matched = False
-        if j_key in cv_skills_map:
-            matches.append(j_text) 
-            matched = True
-        else:
-            for c_key, c_text in cv_skills_map.items():
-                if len(c_key) > 2 and len(j_key) > 2:
-                    if c_key in j_key: 
-                        matches.append(f"{c_text} (matches {j_text})")
-                        matched = True
-                        break
-                    if j_key in c_key:
-                        matches.append(c_text)
-                        matched = True
-                        break
-                
-                std_j = synonyms.get(j_key, j_key)
-                std_c = synonyms.get(c_key, c_key)
-                if std_j == std_c or std_c in std_j:
-                    matches.append(f"{c_text} (matches {j_text})")
-                    matched = True
-                    break
-        if not matched:
-            misses.append(j_text)
-
-    match_strings = " ".join(matches).lower()
-    for c_key, c_text in cv_skills_map.items():
-        if c_key not in match_strings and c_key not in job_skills_map:
-            extras.append(c_text)
-
-    context = {'app': application, 'matches': matches, 'misses': misses, 'extras': extras}
+    context = {'app': application, 'matches': report['matches'], 'misses': report['misses'], 'extras': report['extras']}
     return render(request, 'application_detail.html', context)
 
 
@@ -331,23 +356,11 @@ def hr_upload_cv(request, job_id):
         success_count = 0
         errors = []
 
-        bulk_files = request.FILES.getlist('bulk_cvs')
-        for f in bulk_files:
-            try:
-                clean_name = f.name.rsplit('.', 1)[0].replace('_', ' ').replace('-', ' ').title()
-                unique_id = str(uuid.uuid4())[:8]
-                placeholder_email = f"{clean_name.replace(' ', '.').lower()}.{unique_id}@pending.parsing"
-                candidate, created = User.objects.get_or_create(
-                    email=placeholder_email, defaults={'full_name': clean_name, 'role': 'Candidate'}
-                )
-                if created:
-                    candidate.set_unusable_password()
-                    candidate.save()
-                app = Application.objects.create(job=job, candidate=candidate, cv_file=f, has_reference=False)
-                process_application(app)
-                success_count += 1
-            except Exception as e:
-                errors.append(f"Bulk File Error ({f.name}): {str(e)}")
+        # Bulk PDFs / ZIPs: stored and created in a few queries, analysed in chunks by the workers
+        ingestion, bulk_errors = create_ingestion(job, request.user, request.FILES.getlist('bulk_cvs'))
+        errors.extend(bulk_errors)
+        if ingestion:
+            success_count += ingestion.total
 
         names = request.POST.getlist('full_name')
         emails = request.POST.getlist('email')
@@ -373,24 +386,41 @@ def hr_upload_cv(request, job_id):
                         job=job, candidate=candidate, cv_file=cv_file,
                         has_reference=bool(ref_name), reference_name=ref_name
                     )
-                    process_application(app)
+                    queue_application_processing(app)
                     success_count += 1
                 except Exception as e:
                     errors.append(f"Row {i+1} Error: {str(e)}")
 
-        if success_count > 0: messages.success(request, f"Successfully processed {success_count} applications!")
+        if success_count > 0: messages.success(request, f"Successfully queued {success_count} applications for AI scoring!")
         if errors:
             for err in errors: messages.error(request, err)
+        if ingestion:
+            return redirect('web_test:ingestion_status', pk=ingestion.id)
         return redirect('web_test:job_ranking', job_id=job.id)
     else:
         form = HRUploadCVForm()
     return render(request, 'hr_upload_cv.html', {'form': form, 'job': job})
 
 
+@login_required
+def ingestion_status(request, pk):
+    """Progress of a bulk CV upload; the page polls ?format=json until it is done."""
+    ingestion = get_object_or_404(IngestionJob.objects.select_related('job'), pk=pk)
+
+    if request.user.role != 'HR':
+        messages.error(request, "Access Denied.")
+        return redirect('web_test:job_list')
+
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'status': ingestion.status, 'total': ingestion.total, 'processed': ingestion.processed,
+            'failed': ingestion.failed, 'progress': ingestion.progress,
+        })
+    return render(request, 'ingestion_status.html', {'ingestion': ingestion, 'job': ingestion.job})
+
+
 @login_required
 def send_interview_invite(request, application_id):
-    application = get_object_or_404(Application, pk=application_id)
-    
     if request.user.role != 'HR':
         return redirect('web_test:job_list')
 
@@ -398,35 +428,17 @@ def send_interview_invite(request, application_id):
         form = InterviewInviteForm(request.POST)
         if form.is_valid():
             data = form.cleaned_data
-            
-            # UPDATE STATUS TO SHORTLISTED
-            application.status = 'SHORTLISTED'
-            application.save()
-
-            subject = f"Interview Invitation: {application.job.title}"
-            message_body = (
-                f"Dear {application.candidate.full_name},\n\n"
-                f"You have been Shortlisted for an Interview!\n\n"
-                f"📅 Date: {data['date']}\n"
-                f"⏰ Time: {data['time']}\n"
-                f"📍 Location: {data['location']}\n\n"
-                f"Notes: {data['message']}\n\n"
-                f"Best regards,\nSmart Hire Solutions Team"
+            # UPDATE STATUS TO SHORTLISTED; the invite leaves through the outbox only if this commits
+            invited = application_status.invite(
+                [application_id], data['date'], data['time'], data['location'], data['message']
             )
+            if not invited:
+                raise Http404("No Application matches the given query.")
+            messages.success(request, f"Invite queued & Candidate Shortlisted!")
+            return redirect('web_test:job_ranking', job_id=invited[0].job_id)
 
-            try:
-                send_mail(
-                    subject, message_body,
-                    settings.EMAIL_HOST_USER or 'noreply@smarthire.com',
-                    [application.candidate.email], fail_silently=False,
-                )
-                messages.success(request, f"Invite sent & Candidate Shortlisted!")
-            except Exception as e:
-                messages.error(request, f"Error sending email: {e}")
-
-            return redirect('web_test:job_ranking', job_id=application.job.id)
-    
-    return redirect('web_test:job_ranking', job_id=application.job.id)
+    application = get_object_or_404(Application.objects.only('job_id'), pk=application_id)
+    return redirect('web_test:job_ranking', job_id=application.job_id)
 
 @login_required
 def bulk_send_invite(request):
@@ -437,51 +449,16 @@ def bulk_send_invite(request):
     if request.method == 'POST':
         form = InterviewInviteForm(request.POST)
         if form.is_valid():
-            ids_str = form.cleaned_data['application_ids']
-            date = form.cleaned_data['date']
-            time = form.cleaned_data['time']
-            location = form.cleaned_data['location']
-            notes = form.cleaned_data['message']
-
-            app_ids = [int(id) for id in ids_str.split(',') if id.isdigit()]
-            applications = Application.objects.filter(id__in=app_ids)
-            success_count = 0
-            errors = []
-            
-            for app in applications:
-                # UPDATED: Set status to SHORTLISTED (Shortlisted for Interview)
-                app.status = 'SHORTLISTED'
-                app.save()
-                
-                subject = f"Interview Invitation: {app.job.title}"
-                message_body = (
-                    f"Dear {app.candidate.full_name},\n\n"
-                    f"You have been Shortlisted for an Interview!\n\n"
-                    f"📅 Date: {date}\n"
-                    f"⏰ Time: {time}\n"
-                    f"📍 Location: {location}\n\n"
-                    f"Notes: {notes}\n\n"
-                    f"Best regards,\nSmart Hire Solutions Team"
-                )
-                try:
-                    send_mail(
-                        subject, message_body, 
-                        settings.EMAIL_HOST_USER or 'noreply@smarthire.com', 
-                        [app.candidate.email], fail_silently=False
-                    )
-                    success_count += 1
-                except Exception as e:
-                    errors.append(f"{app.candidate.email}: {str(e)}")
+            data = form.cleaned_data
+            app_ids = [int(id) for id in data['application_ids'].split(',') if id.isdigit()]
 
-            if success_count > 0:
-                messages.success(request, f"✅ Sent invites to {success_count} candidates!")
-            
-            if errors:
-                messages.error(request, f"❌ Failed to send {len(errors)} emails. Check console for details.")
-                for err in errors: print(f"EMAIL ERROR: {err}")
+            # One UPDATE for the status changes and one INSERT for the invites, committed together;
+            # the workers send the emails afterwards over one SMTP connection (tasks.outbox)
+            invited = application_status.invite(app_ids, data['date'], data['time'], data['location'], data['message'])
 
-            if applications.exists():
-                return redirect('web_test:job_ranking', job_id=applications.first().job.id)
+            if invited:
+                messages.success(request, f"✅ Queued invites to {len(invited)} candidates!")
+                return redirect('web_test:job_ranking', job_id=invited[0].job_id)
             
     return redirect('web_test:job_list')
 
@@ -611,17 +588,17 @@ def reject_application(request, pk):
     """
     Mark a candidate as Rejected.
     """
-    app = get_object_or_404(Application, pk=pk)
-    
     if request.user.role != 'HR':
         messages.error(request, "Access Denied.")
         return redirect('web_test:job_list')
 
-    app.status = 'REJECTED'
-    app.save()
+    rejected = application_status.reject([pk])
+    if not rejected:
+        raise Http404("No Application matches the given query.")
+    app = rejected[0]
     messages.info(request, f"Candidate {app.candidate.full_name} has been rejected.")
     
-    return redirect('web_test:job_ranking', job_id=app.job.id)
+    return redirect('web_test:job_ranking', job_id=app.job_id)
 
 
 
@@ -1,19 +1,19 @@
 from django.contrib import admin
-from .models import Job
+from .models import Job, Skill
 
 @admin.register(Job)
 class JobAdmin(admin.ModelAdmin):
     # Columns shown in the list view
-    list_display = ('title', 'posted_by', 'status', 'created_at', 'has_file')
+    list_display = ('title', 'posted_by', 'status', 'processing_status', 'created_at', 'has_file')
     
     # Sidebar filters
-    list_filter = ('status', 'created_at', 'posted_by')
+    list_filter = ('status', 'processing_status', 'created_at', 'posted_by')
     
     # Search box functionality
     search_fields = ('title', 'description_text', 'posted_by__email')
     
     # Prevent accidental editing of AI-generated data
-    readonly_fields = ('processed_text', 'gliner_entities', 'jina_embedding', 'created_at', 'updated_at')
+    readonly_fields = ('processing_status', 'processed_text', 'gliner_entities', 'jina_embedding', 'stage_keys', 'created_at', 'updated_at')
 
     # Organize the detail view nicely
     fieldsets = (
@@ -22,7 +22,7 @@ class JobAdmin(admin.ModelAdmin):
         }),
         ('AI Processing', {
             'classes': ('collapse',),  # Collapsible section
-            'fields': ('processed_text', 'gliner_entities', 'jina_embedding')
+            'fields': ('processing_status', 'processed_text', 'gliner_entities', 'jina_embedding', 'stage_keys')
         }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at')
@@ -37,6 +37,13 @@ class JobAdmin(admin.ModelAdmin):
 
     # Helper to check if AI processed the job
     def has_ai_data(self, obj):
-        return bool(obj.jina_embedding)
+        return obj.jina_embedding is not None
     has_ai_data.boolean = True
-    has_ai_data.short_description = "AI Processed"
\ No newline at end of file
+    has_ai_data.short_description = "AI Processed"
+
+
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    # Canonical skill vocabulary, grown automatically from processed jobs and CVs
+    list_display = ('name',)
+    search_fields = ('name',)
@@ -1,6 +1,4 @@
 from django.apps import AppConfig
-from gliner import GLiNER
-from sentence_transformers import SentenceTransformer
 import os
 from django.conf import settings
 
@@ -8,22 +6,100 @@ class JobsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'jobs'
 
-    gliner_model = None
-    jina_model = None
+    # Models are imported and loaded on first access (jobs.model_registry), so processes
+    # that never touch ML (migrate, shell, the HR pages) do not pay for torch.
+    # Assigning either attribute (e.g. a stub in a test) overrides the registry.
+    _model_overrides = None
+    _local_models = False
+
+    @property
+    def gliner_model(self):
+        return self._get_model('gliner')
+
+    @gliner_model.setter
+    def gliner_model(self, model):
+        self._set_model('gliner', model)
+
+    @property
+    def jina_model(self):
+        return self._get_model('jina')
+
+    @jina_model.setter
+    def jina_model(self, model):
+        self._set_model('jina', model)
 
     def ready(self):
-        if os.environ.get('RUN_MAIN') == 'true':
-            print("🧠 Loading AI Models...")
-            
-            # 1. Load GLiNER (Downloads automatically if not present)
-            self.gliner_model = GLiNER.from_pretrained("urchade/gliner_small-v2.1")
-            
-            # 2. Load Your Local Fine-Tuned Jina Model
-            # We construct the absolute path to your model folder
-            model_path = os.path.join(settings.BASE_DIR, 'ml_models', 'my_finetuned_jina')
-            
-            if os.path.exists(model_path):
-                self.jina_model = SentenceTransformer(model_path, trust_remote_code=True)
-                print(f"✅ Loaded Jina Model from: {model_path}")
+        from . import signals  # noqa: F401  (open-jobs matrix for recommendations)
+
+        if os.environ.get('RUN_MAIN') == 'true' and settings.MODEL_EAGER_WARMUP:
+            self.load_models()
+
+    def load_models(self, local=False):
+        """
+        Eager warm-up of GLiNER + Jina, once per process.
+        Called by the dev server on startup and by the task worker (manage.py run_worker);
+        other processes load them on first use.
+        When MODEL_SERVER_SOCKET is set, both attributes become a thin client to the shared
+        model server instead (pass local=True to force in-process loading, as the server does).
+        """
+        if local:
+            self._local_models = True
+
+        # The skills automaton is cheap but built once per process, like the models
+        from .skills import get_skill_matcher
+        get_skill_matcher()
+
+        if self._use_model_server():
+            client = self._get_model('gliner')
+            if client.is_available():
+                print(f"✅ Connected to model server at {settings.MODEL_SERVER_SOCKET}")
             else:
-                print(f"❌ Model not found at {model_path}. Did you unzip it there?")
+                print(f"⚠️ Model server at {settings.MODEL_SERVER_SOCKET} is down. Tasks will retry until it is up.")
+            return
+
+        from .model_registry import get_model_registry
+
+        print("🧠 Loading AI Models...")
+        get_model_registry().warm_up([name for name in ('gliner', 'jina') if name not in (self._model_overrides or {})])
+
+    def require_models(self):
+        """Raises ModelServerUnavailable unless both models (local or remote) can serve requests."""
+        from .model_server import ModelServerUnavailable
+
+        if self.gliner_model is None or self.jina_model is None:
+            raise ModelServerUnavailable("AI models are not loaded.")
+        if hasattr(self.jina_model, 'is_available') and not self.jina_model.is_available():
+            raise ModelServerUnavailable(f"Model server at {settings.MODEL_SERVER_SOCKET} is down.")
+
+    # --- Lazy access ---
+    def _use_model_server(self):
+        return bool(settings.MODEL_SERVER_SOCKET) and not self._local_models
+
+    def _set_model(self, name, model):
+        if self._model_overrides is None:
+            self._model_overrides = {}
+        if model is None:
+            self._model_overrides.pop(name, None)
+        else:
+            self._model_overrides[name] = model
+
+    def _get_model(self, name):
+        """The model, the model server client, or None when it cannot be loaded."""
+        if name in (self._model_overrides or {}):
+            return self._model_overrides[name]
+
+        if self._use_model_server():
+            from .model_server import ModelServerClient
+
+            # One client serves both models
+            client = ModelServerClient(settings.MODEL_SERVER_SOCKET, timeout=settings.MODEL_SERVER_TIMEOUT)
+            self._set_model('gliner', client)
+            self._set_model('jina', client)
+            return client
+
+        from .model_registry import ModelLoadError, get_model_registry
+
+        try:
+            return get_model_registry().get(name)
+        except ModelLoadError:
+            return None  # Reported once by the registry, which retries after MODEL_LOAD_RETRY_SECONDS
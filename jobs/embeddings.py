@@ -0,0 +1,121 @@
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+
+from django.apps import apps
+from django.conf import settings
+
+
+class EmbeddingBatcher:
+    """
+    Micro-batching front for the Jina model.
+    Concurrent callers submit single texts and get a Future back; a dispatcher thread
+    collects requests for up to `max_wait_ms` (or until `max_batch_size` is reached)
+    and runs them through the model as one forward pass.
+    """
+
+    def __init__(self, model, max_batch_size=16, max_wait_ms=10):
+        self.model = model
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue = queue.Queue()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+        # Tuning stats
+        self._stats_lock = threading.Lock()
+        self._batch_sizes = Counter()
+
+    def submit(self, text):
+        """Queues one text for embedding. Returns a Future resolving to a 1-D numpy vector."""
+        self._ensure_started()
+        future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def encode(self, text):
+        """Blocking helper with the same call shape as `SentenceTransformer.encode(text)`."""
+        return self.submit(text).result()
+
+    def stats(self):
+        """
+        How full the batches were. Use it to tune max_batch_size / max_wait_ms:
+        a low mean fill means the wait window is longer than the traffic needs.
+        """
+        with self._stats_lock:
+            sizes = dict(sorted(self._batch_sizes.items()))
+        batches = sum(sizes.values())
+        requests = sum(size * count for size, count in sizes.items())
+        return {
+            'batches': batches,
+            'requests': requests,
+            'mean_batch_size': round(requests / batches, 2) if batches else 0.0,
+            'mean_fill_ratio': round(requests / (batches * self.max_batch_size), 3) if batches else 0.0,
+            'batch_size_histogram': sizes,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+        }
+
+    # --- Dispatcher ---
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                self._thread.start()
+
+    def _collect_batch(self):
+        batch = [self._queue.get()]  # Block until there is work
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            texts = [text for text, _ in batch]
+            try:
+                vectors = self.model.encode(texts, batch_size=len(texts))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            with self._stats_lock:
+                self._batch_sizes[len(batch)] += 1
+            for (_, future), vector in zip(batch, vectors):
+                future.set_result(vector)
+
+
+_batcher = None
+_batcher_lock = threading.Lock()
+
+
+def get_embedding_batcher():
+    """
+    Process-wide batcher bound to the loaded Jina model.
+    Returns None when the model is not loaded.
+    """
+    global _batcher
+    model = apps.get_app_config('jobs').jina_model
+    if model is None:
+        return None
+    with _batcher_lock:
+        if _batcher is None or _batcher.model is not model:
+            _batcher = EmbeddingBatcher(
+                model,
+                max_batch_size=settings.EMBEDDING_MAX_BATCH_SIZE,
+                max_wait_ms=settings.EMBEDDING_MAX_WAIT_MS,
+            )
+    return _batcher
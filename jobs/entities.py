@@ -0,0 +1,107 @@
+"""
+Sliding-window GLiNER inference for long documents.
+
+GLiNER only sees its first ~384 words, so skills near the end of a multi-page CV
+were silently dropped. The text is split into overlapping windows on GLiNER's own
+word boundaries, all windows go through the model as one batch, and entities are
+merged back with document-level offsets. Bulk ingestion pools the windows of
+many documents into shared batches.
+"""
+import re
+
+from django.conf import settings
+
+# Same word splitting GLiNER uses internally, so window sizes match its token budget
+WORD_PATTERN = re.compile(r'\w+(?:[-_]\w+)*|\S')
+
+
+def chunk_text(text, max_words=None, overlap_words=None):
+    """
+    Splits text into windows of at most max_words words, each overlapping the previous one.
+    Returns a list of (char_offset, chunk_text). Short texts come back as a single window.
+    """
+    max_words = max_words or settings.GLINER_WINDOW_WORDS
+    overlap_words = overlap_words if overlap_words is not None else settings.GLINER_WINDOW_OVERLAP
+    overlap_words = min(overlap_words, max_words - 1)
+
+    spans = [m.span() for m in WORD_PATTERN.finditer(text)]
+    if len(spans) <= max_words:
+        return [(0, text)] if text else []
+
+    chunks = []
+    step = max_words - overlap_words
+    for first in range(0, len(spans), step):
+        last = min(first + max_words, len(spans)) - 1
+        start, end = spans[first][0], spans[last][1]
+        chunks.append((start, text[start:end]))
+        if last == len(spans) - 1:
+            break
+    return chunks
+
+
+def _batch_predict(model, texts, labels, threshold):
+    if hasattr(model, 'batch_predict_entities'):
+        return model.batch_predict_entities(texts, labels, threshold=threshold)
+    return [model.predict_entities(t, labels, threshold=threshold) for t in texts]
+
+
+def merge_entities(entities):
+    """
+    Drops duplicates produced by window overlap: among overlapping spans with the
+    same label, the highest-scoring one wins.
+    """
+    merged = []
+    for e in sorted(entities, key=lambda e: (e['start'], -e.get('score', 0))):
+        duplicate = next(
+            (m for m in merged if m['label'] == e['label'] and e['start'] < m['end'] and m['start'] < e['end']),
+            None,
+        )
+        if duplicate is None:
+            merged.append(e)
+        elif e.get('score', 0) > duplicate.get('score', 0):
+            merged[merged.index(duplicate)] = e
+    return merged
+
+
+def predict_entities_windowed(model, text, labels, threshold=0.5, max_words=None, overlap_words=None):
+    """
+    Drop-in replacement for `model.predict_entities(text, labels, threshold)` that covers the whole text.
+    Entity 'start'/'end' offsets refer to the full text.
+    """
+    chunks = chunk_text(text, max_words, overlap_words)
+    if not chunks:
+        return []
+    if len(chunks) == 1:
+        return model.predict_entities(text, labels, threshold=threshold)
+
+    results = _batch_predict(model, [chunk for _, chunk in chunks], labels, threshold)
+
+    entities = []
+    for (offset, _), chunk_entities in zip(chunks, results):
+        for e in chunk_entities:
+            entities.append(dict(e, start=e['start'] + offset, end=e['end'] + offset))
+    return merge_entities(entities)
+
+
+def predict_entities_windowed_many(model, texts, labels, threshold=0.5, batch_size=None):
+    """
+    predict_entities_windowed for many documents: the windows of all texts go through
+    the model in shared batches of batch_size (settings.GLINER_BATCH_SIZE).
+    Returns one entity list per text, with offsets into that text.
+    """
+    batch_size = batch_size or settings.GLINER_BATCH_SIZE
+    windows = []  # (text index, char offset, window text)
+    for i, text in enumerate(texts):
+        windows.extend((i, offset, chunk) for offset, chunk in chunk_text(text))
+
+    results = []
+    for start in range(0, len(windows), batch_size):
+        batch = windows[start:start + batch_size]
+        results.extend(_batch_predict(model, [chunk for _, _, chunk in batch], labels, threshold))
+
+    per_text = [[] for _ in texts]
+    window_counts = [0] * len(texts)
+    for (i, offset, _), window_entities in zip(windows, results):
+        window_counts[i] += 1
+        per_text[i].extend(dict(e, start=e['start'] + offset, end=e['end'] + offset) for e in window_entities)
+    return [merge_entities(entities) if count > 1 else entities for entities, count in zip(per_text, window_counts)]
@@ -0,0 +1,158 @@
+"""
+Shared PDF text extraction for job descriptions and CVs.
+
+Files are opened by their storage path whenever one exists, so MuPDF reads pages
+on demand instead of the whole upload being copied into Python memory. Text is
+produced page by page and joined once; a page cap and a text budget (in characters)
+bound the work a single upload can cause, and long documents can be split across
+a process pool.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import fitz  # PyMuPDF
+from django.conf import settings
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _page_text(page):
+    # Layout Analysis (Blocks): sort top->bottom, then left->right. Essential for multi-column layouts.
+    blocks = page.get_text("blocks")
+    blocks.sort(key=lambda b: (b[1], b[0]))
+    return "".join(b[4] + "\n" for b in blocks)
+
+
+def _local_path(source):
+    """Filesystem path for a str/Path, a temp upload or a locally stored FieldFile (else None)."""
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    if hasattr(source, 'temporary_file_path'):
+        return source.temporary_file_path()
+    if getattr(source, '_committed', False):
+        try:
+            path = source.path
+        except (NotImplementedError, ValueError):
+            return None
+        return path if os.path.exists(path) else None
+    return None
+
+
+def _open(source):
+    path = _local_path(source)
+    if path:
+        return fitz.open(path)
+    # In-memory upload or remote storage: fall back to reading the stream
+    source.seek(0)
+    data = source.read()
+    source.seek(0)
+    return fitz.open(stream=data, filetype="pdf")
+
+
+def iter_pdf_pages(source, max_pages=None):
+    """Yields the text of each page, in order, up to max_pages."""
+    max_pages = max_pages or settings.PDF_MAX_PAGES
+    with _open(source) as doc:
+        for i, page in enumerate(doc):
+            if i >= max_pages:
+                print(f"⚠️ PDF has {doc.page_count} pages; only the first {max_pages} were read.")
+                break
+            yield _page_text(page)
+
+
+def _extract_page_range(path, start, stop):
+    # Runs in a pool process
+    with fitz.open(path) as doc:
+        return [_page_text(doc[i]) for i in range(start, stop)]
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:  # Worker threads may ask for it at the same time; start only one pool
+        if _pool is None:
+            # 'spawn' keeps children clean of the parent's threads and loaded models
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.PDF_PARALLEL_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+    return _pool
+
+
+def _iter_pages_parallel(path, page_count):
+    workers = settings.PDF_PARALLEL_WORKERS
+    step = -(-page_count // workers)  # ceil division
+    ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+    futures = [_get_pool().submit(_extract_page_range, path, start, stop) for start, stop in ranges]
+    for future in futures:
+        yield from future.result()
+
+
+def extract_text_from_pdf(source, max_pages=None, max_chars=None, parallel=None):
+    """
+    Extracts layout-ordered text from a PDF (path, upload or FieldFile).
+
+    max_pages / max_chars default to settings.PDF_MAX_PAGES / PDF_MAX_TEXT_CHARS.
+    parallel=None picks the process pool automatically for documents with at least
+    PDF_PARALLEL_MIN_PAGES pages (only possible when the file has a local path).
+    """
+    max_pages = max_pages or settings.PDF_MAX_PAGES
+    max_chars = max_chars or settings.PDF_MAX_TEXT_CHARS
+
+    pages = []
+    size = 0
+    try:
+        path = _local_path(source)
+        page_iter = None
+        if path and parallel is not False:
+            with fitz.open(path) as doc:
+                page_count = min(doc.page_count, max_pages)
+                total_pages = doc.page_count
+            if parallel or page_count >= settings.PDF_PARALLEL_MIN_PAGES:
+                if total_pages > max_pages:
+                    print(f"⚠️ PDF has {total_pages} pages; only the first {max_pages} were read.")
+                page_iter = _iter_pages_parallel(path, page_count)
+        if page_iter is None:
+            page_iter = iter_pdf_pages(source, max_pages=max_pages)
+
+        for text in page_iter:
+            pages.append(text)
+            size += len(text)
+            if size >= max_chars:
+                print(f"⚠️ PDF text exceeded {max_chars} characters; truncating.")
+                break
+    except Exception as e:
+        print(f"❌ Error reading PDF: {e}")
+
+    return "".join(pages)[:max_chars]
+
+
+def _extract_document(path, max_pages, max_chars):
+    # Runs in a pool process; limits are passed in because settings are not configured there
+    return extract_text_from_pdf(path, max_pages=max_pages, max_chars=max_chars, parallel=False)
+
+
+def extract_texts_from_pdfs(sources, max_pages=None, max_chars=None):
+    """
+    Text of many PDFs, in order. With more than one document, those with a local path are
+    read in the process pool (one document per task); the rest are read here.
+    """
+    max_pages = max_pages or settings.PDF_MAX_PAGES
+    max_chars = max_chars or settings.PDF_MAX_TEXT_CHARS
+
+    futures = {}
+    if len(sources) > 1 and settings.PDF_PARALLEL_WORKERS > 1:
+        for i, source in enumerate(sources):
+            path = _local_path(source) if source is not None else None
+            if path:
+                futures[i] = _get_pool().submit(_extract_document, path, max_pages, max_chars)
+
+    texts = []
+    for i, source in enumerate(sources):
+        if i in futures:
+            texts.append(futures[i].result())
+        else:
+            texts.append(extract_text_from_pdf(source, max_pages=max_pages, max_chars=max_chars) if source is not None else "")
+    return texts
@@ -0,0 +1,60 @@
+import sys
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.embeddings import EmbeddingBatcher
+from jobs.model_server import ModelServer, ModelServerClient
+
+
+class Command(BaseCommand):
+    help = "Runs the shared GLiNER/Jina inference daemon on a Unix socket (or health-checks it with --check)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--socket', default=settings.MODEL_SERVER_SOCKET,
+            help="Unix socket path (defaults to settings.MODEL_SERVER_SOCKET).",
+        )
+        parser.add_argument(
+            '--check', action='store_true',
+            help="Ping a running server and exit non-zero if it is unhealthy.",
+        )
+
+    def handle(self, *args, **options):
+        socket_path = options['socket']
+        if not socket_path:
+            raise CommandError("No socket path. Set MODEL_SERVER_SOCKET or pass --socket.")
+
+        if options['check']:
+            health = ModelServerClient(socket_path, timeout=5).health()
+            if not health or not all(health['models'].values()):
+                self.stderr.write(f"❌ Model server unhealthy: {health}")
+                sys.exit(1)
+            self.stdout.write(self.style.SUCCESS(f"✅ Model server healthy: {health}"))
+            return
+
+        jobs_config = apps.get_app_config('jobs')
+        jobs_config.load_models(local=True)
+        if jobs_config.gliner_model is None or jobs_config.jina_model is None:
+            raise CommandError("Models failed to load; refusing to start the model server.")
+
+        # Requests from all workers share the micro-batcher, so they batch across processes too
+        embedder = EmbeddingBatcher(
+            jobs_config.jina_model,
+            max_batch_size=settings.EMBEDDING_MAX_BATCH_SIZE,
+            max_wait_ms=settings.EMBEDDING_MAX_WAIT_MS,
+        )
+        try:
+            server = ModelServer(socket_path, jobs_config.gliner_model, embedder)
+        except OSError as e:
+            raise CommandError(f"Cannot listen on {socket_path}: {e}")
+        self.stdout.write(self.style.SUCCESS(f"🧠 Model server listening on {socket_path}"))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(f"📊 Embedding batches: {embedder.stats()}")
+            self.stdout.write("Model server stopped.")
@@ -0,0 +1,177 @@
+"""
+Lightweight timing metrics for the AI pipeline, exposed in the Prometheus text format.
+
+    with stage_timer('cv', 'extract', items=len(files)):
+        ...
+
+records the latency of one stage run (a batch of `items` documents) in a histogram and
+counts it as an error if the block raises. Document sizes are recorded with
+observe_document(). Metrics live in memory per process: the web process serves them on
+/metrics and `manage.py run_worker --metrics-port` serves the workers' own.
+
+With METRICS_ENABLED off (the default) stage_timer returns a shared no-op context manager
+and nothing is recorded.
+"""
+import bisect
+import contextlib
+import hmac
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.conf import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SIZE_BUCKETS = (1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000, 500000)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_NOOP = contextlib.nullcontext()
+
+
+def _format_labels(names, values, extra=''):
+    parts = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name, self.help_text, self.labels = name, help_text, labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for values, total in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, values)} {total}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name, self.help_text, self.labels, self.buckets = name, help_text, labels, tuple(buckets)
+        self._series = {}  # label values -> [per-bucket counts (+Inf last), sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for values, (counts, total) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + ('+Inf',), counts):
+                    cumulative += count
+                    le = f'le="{bound}"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labels, values, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labels, values)} {total}")
+                lines.append(f"{self.name}_count{_format_labels(self.labels, values)} {cumulative}")
+        return lines
+
+
+# --- Pipeline metrics ---
+STAGE_SECONDS = Histogram(
+    'smarthire_pipeline_stage_seconds', "Latency of one run of an AI pipeline stage (a batch for batched stages).",
+    labels=('pipeline', 'stage'),
+)
+STAGE_ITEMS = Counter(
+    'smarthire_pipeline_stage_items_total', "Documents processed by each stage (divide the latency sum by it for a per-document time).",
+    labels=('pipeline', 'stage'),
+)
+STAGE_ERRORS = Counter(
+    'smarthire_pipeline_stage_errors_total', "Stage runs that raised.",
+    labels=('pipeline', 'stage'),
+)
+DOCUMENT_CHARS = Histogram(
+    'smarthire_document_chars', "Characters of text extracted per document.",
+    labels=('pipeline',), buckets=SIZE_BUCKETS,
+)
+
+METRICS = [STAGE_SECONDS, STAGE_ITEMS, STAGE_ERRORS, DOCUMENT_CHARS]
+
+
+class _StageTimer:
+    __slots__ = ('labels', 'items', 'started')
+
+    def __init__(self, pipeline, stage, items):
+        self.labels = (pipeline, stage)
+        self.items = items
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        STAGE_SECONDS.observe(time.perf_counter() - self.started, *self.labels)
+        STAGE_ITEMS.inc(*self.labels, amount=self.items)
+        if exc_type is not None:
+            STAGE_ERRORS.inc(*self.labels)
+        return False
+
+
+def stage_timer(pipeline, stage, items=1):
+    """Context manager timing one stage run; a no-op unless METRICS_ENABLED."""
+    if not settings.METRICS_ENABLED:
+        return _NOOP
+    return _StageTimer(pipeline, stage, items)
+
+
+def record_error(pipeline, stage):
+    """For stages that catch their own errors (e.g. a failed embedding future)."""
+    if settings.METRICS_ENABLED:
+        STAGE_ERRORS.inc(pipeline, stage)
+
+
+def observe_document(pipeline, text):
+    if settings.METRICS_ENABLED:
+        DOCUMENT_CHARS.observe(len(text or ''), pipeline)
+
+
+def render_metrics():
+    """Every metric of this process in the Prometheus text exposition format."""
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        if settings.METRICS_TOKEN and not hmac.compare_digest(
+            self.headers.get('Authorization', ''), f"Bearer {settings.METRICS_TOKEN}"
+        ):
+            self.send_error(401)
+            return
+        body = render_metrics().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Scrapes every few seconds would flood the worker log
+
+
+def start_metrics_server(port, host='0.0.0.0'):
+    """Serves /metrics from a daemon thread (for processes without a web server, like run_worker)."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    return server
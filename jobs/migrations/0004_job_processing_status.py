@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:31
+
+from django.db import migrations, models
+
+
+def mark_processed_jobs(apps, schema_editor):
+    # Jobs processed inline before the queue existed already have an embedding
+    Job = apps.get_model('jobs', 'Job')
+    Job.objects.filter(jina_embedding__isnull=False).update(processing_status='SCORED')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_alter_job_description_text'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='processing_status',
+            field=models.CharField(choices=[('QUEUED', 'Queued'), ('EXTRACTING', 'Extracting'), ('EMBEDDING', 'Embedding'), ('SCORED', 'Scored'), ('FAILED', 'Failed')], default='QUEUED', max_length=12),
+        ),
+        migrations.RunPython(mark_processed_jobs, migrations.RunPython.noop),
+    ]
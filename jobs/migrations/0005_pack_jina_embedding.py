@@ -0,0 +1,52 @@
+from django.db import migrations
+
+import jobs.vectors
+from jobs.vectors import pack_vector, unpack_vector
+
+BATCH_SIZE = 500
+
+
+def pack_embeddings(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    batch = []
+    for job in Job.objects.filter(jina_embedding__isnull=False).only('id', 'jina_embedding').iterator(chunk_size=BATCH_SIZE):
+        if not job.jina_embedding:
+            continue
+        job.jina_vector = pack_vector(job.jina_embedding)
+        batch.append(job)
+        if len(batch) >= BATCH_SIZE:
+            Job.objects.bulk_update(batch, ['jina_vector'])
+            batch = []
+    if batch:
+        Job.objects.bulk_update(batch, ['jina_vector'])
+
+
+def unpack_embeddings(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    for job in Job.objects.filter(jina_vector__isnull=False).iterator(chunk_size=BATCH_SIZE):
+        Job.objects.filter(pk=job.pk).update(jina_embedding=unpack_vector(job.jina_vector).tolist())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_job_processing_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='jina_vector',
+            field=jobs.vectors.VectorField(blank=True, null=True),
+        ),
+        migrations.RunPython(pack_embeddings, unpack_embeddings),
+        migrations.RemoveField(
+            model_name='job',
+            name='jina_embedding',
+        ),
+        migrations.RenameField(
+            model_name='job',
+            old_name='jina_vector',
+            new_name='jina_embedding',
+        ),
+    ]
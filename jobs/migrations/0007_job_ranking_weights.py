@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:57
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_skill_jobskill'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='experience_weight',
+            field=models.FloatField(default=0.1, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='similarity_weight',
+            field=models.FloatField(default=0.6, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='skills_weight',
+            field=models.FloatField(default=0.3, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_job_ranking_weights'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='stage_keys',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
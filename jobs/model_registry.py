@@ -0,0 +1,155 @@
+"""
+Lazy registry for the AI models.
+
+Nothing here imports gliner / sentence_transformers (and torch) until a model is first
+used, so `migrate`, `shell` and the web pages that never touch ML start without them.
+Inference workers warm the models up eagerly instead (see JobsConfig.load_models).
+
+Each registered model has a loader (imports + loads it) and a size estimate. Loaded models
+are kept in least-recently-used order; once they take more than MODEL_MEMORY_BUDGET_MB, the
+least recently used ones are dropped (e.g. when several GLiNER variants are registered).
+A model that fails to load is not retried (nor its error reprinted) for retry_seconds.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class ModelLoadError(Exception):
+    """Raised when a registered model cannot be loaded."""
+
+
+def model_size_mb(model, default=0.0):
+    """Parameter + buffer memory of a torch-based model, or `default` when it is not one."""
+    try:
+        tensors = list(model.parameters()) + list(model.buffers())
+    except (AttributeError, TypeError):
+        return default
+    return sum(t.numel() * t.element_size() for t in tensors) / (1024 * 1024) or default
+
+
+class ModelRegistry:
+    def __init__(self, budget_mb=0, retry_seconds=60):
+        self.budget_mb = budget_mb  # 0 = no limit
+        self.retry_seconds = retry_seconds
+        self._specs = {}
+        self._loaded = OrderedDict()  # name -> (model, size_mb), least recently used first
+        self._timings = {}
+        self._failures = {}  # name -> (ModelLoadError, monotonic time of the next attempt)
+        self._lock = threading.RLock()
+
+    def register(self, name, loader, size_mb=0):
+        """`loader` is a zero-argument callable returning the model; size_mb is used until it is measured."""
+        with self._lock:
+            self._specs[name] = (loader, size_mb)
+            self._loaded.pop(name, None)
+            self._failures.pop(name, None)
+
+    def is_loaded(self, name):
+        return name in self._loaded
+
+    def get(self, name):
+        """Returns the model, loading it on first use. Raises ModelLoadError if it cannot be loaded."""
+        with self._lock:
+            if name in self._loaded:
+                self._loaded.move_to_end(name)
+                return self._loaded[name][0]
+            if name not in self._specs:
+                raise ModelLoadError(f"Unknown model: {name}")
+
+            failure = self._failures.get(name)
+            if failure is not None and time.monotonic() < failure[1]:
+                raise failure[0]
+
+            loader, estimate = self._specs[name]
+            started = time.perf_counter()
+            try:
+                model = loader()
+            except Exception as e:
+                error = ModelLoadError(f"Could not load {name}: {e}")
+                self._failures[name] = (error, time.monotonic() + self.retry_seconds)
+                print(f"❌ {error} (next attempt in {self.retry_seconds}s)")
+                raise error from e
+            self._failures.pop(name, None)
+            elapsed = time.perf_counter() - started
+
+            size = model_size_mb(model, default=estimate)
+            self._loaded[name] = (model, size)
+            self._timings[name] = elapsed
+            print(f"🧠 Loaded {name} in {elapsed:.1f}s (~{size:.0f} MB)")
+            self._evict(keep=name)
+            return model
+
+    def warm_up(self, names=None):
+        """Loads the given (default: all) models now. Returns {name: error} for the ones that failed."""
+        started = time.perf_counter()
+        failures = {}
+        for name in names or list(self._specs):
+            try:
+                self.get(name)
+            except ModelLoadError as e:
+                failures[name] = e
+        print(f"⏱️ Model warm-up took {time.perf_counter() - started:.1f}s")
+        return failures
+
+    def unload(self, name):
+        with self._lock:
+            self._loaded.pop(name, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                name: {
+                    'loaded': name in self._loaded,
+                    'size_mb': round(self._loaded[name][1] if name in self._loaded else estimate, 1),
+                    'load_seconds': round(self._timings[name], 2) if name in self._timings else None,
+                }
+                for name, (_, estimate) in self._specs.items()
+            }
+
+    def _evict(self, keep):
+        if not self.budget_mb:
+            return
+        total = sum(size for _, size in self._loaded.values())
+        for name in list(self._loaded):
+            if total <= self.budget_mb:
+                return
+            if name == keep:
+                continue
+            total -= self._loaded.pop(name)[1]
+            print(f"♻️ Unloaded {name} to stay within MODEL_MEMORY_BUDGET_MB={self.budget_mb}")
+
+
+# --- Default models ---
+def load_gliner(model_name):
+    from gliner import GLiNER
+
+    return GLiNER.from_pretrained(model_name)
+
+
+def load_jina(model_path):
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"Model not found at {model_path}. Did you unzip it there?")
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model_path, trust_remote_code=True)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry():
+    """Process-wide registry with 'gliner' and 'jina' (from the AI MODELS settings) registered."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry(
+                budget_mb=settings.MODEL_MEMORY_BUDGET_MB, retry_seconds=settings.MODEL_LOAD_RETRY_SECONDS
+            )
+            _registry.register('gliner', lambda: load_gliner(settings.GLINER_MODEL_NAME), size_mb=600)
+            _registry.register('jina', lambda: load_jina(settings.JINA_MODEL_PATH), size_mb=600)
+    return _registry
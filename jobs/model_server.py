@@ -0,0 +1,247 @@
+"""
+Local inference daemon that owns GLiNER + Jina once per machine.
+
+Django workers reach it over a Unix socket through `ModelServerClient`, which mirrors
+the `predict_entities` / `encode` surface of the real models.
+
+Wire format (both directions):
+    4-byte big-endian header length | JSON header | optional raw body (header['nbytes'])
+Embeddings travel as raw float32 bytes instead of JSON numbers.
+"""
+import errno
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+
+import numpy as np
+
+_HEADER = struct.Struct('>I')
+
+
+class ModelServerUnavailable(Exception):
+    """Raised by the client when the daemon cannot be reached or does not answer in time."""
+
+
+class ModelServerError(Exception):
+    """Raised by the client when the daemon answered but the model call failed (e.g. bad input); not worth retrying."""
+
+
+# --- Framing helpers ---
+def _recv_exact(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            raise ConnectionError("Socket closed mid-message")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def send_message(sock, header, body=b''):
+    header = dict(header, nbytes=len(body))
+    raw = json.dumps(header).encode('utf-8')
+    sock.sendall(_HEADER.pack(len(raw)) + raw + body)
+
+
+def recv_message(sock):
+    (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    header = json.loads(_recv_exact(sock, size))
+    nbytes = header.pop('nbytes', 0)
+    body = _recv_exact(sock, nbytes) if nbytes else b''
+    return header, body
+
+
+# --- Server ---
+class _RequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        # One persistent connection per client thread; serve until it closes.
+        while True:
+            try:
+                header, _ = recv_message(self.request)
+            except (ConnectionError, OSError):
+                return
+            try:
+                reply, body = self.server.dispatch(header)
+            except Exception as e:
+                reply, body = {'ok': False, 'error': f"{type(e).__name__}: {e}"}, b''
+            try:
+                send_message(self.request, reply, body)
+            except OSError:
+                return
+
+
+class ModelServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, gliner_model, embedder):
+        self.gliner_model = gliner_model
+        self.embedder = embedder  # Jina model or an EmbeddingBatcher in front of it
+        self.started_at = time.time()
+        self.requests_served = 0
+        self._stats_lock = threading.Lock()  # One handler thread per connection
+        # GLiNER is not guaranteed thread-safe; the batcher serialises Jina on its own
+        self._gliner_lock = threading.Lock()
+
+        if os.path.exists(socket_path):
+            if _socket_answers(socket_path):
+                raise OSError(errno.EADDRINUSE, f"A model server is already listening on {socket_path}")
+            os.unlink(socket_path)  # Stale socket from a previous run
+        super().__init__(socket_path, _RequestHandler)
+        os.chmod(socket_path, 0o660)
+
+    def dispatch(self, header):
+        with self._stats_lock:
+            self.requests_served += 1
+            requests_served = self.requests_served
+        op = header.get('op')
+
+        if op == 'health':
+            return {
+                'ok': True,
+                'pid': os.getpid(),
+                'uptime': round(time.time() - self.started_at, 1),
+                'requests_served': requests_served,
+                'models': {'gliner': self.gliner_model is not None, 'jina': self.embedder is not None},
+            }, b''
+
+        if op == 'predict_entities':
+            with self._gliner_lock:
+                entities = self.gliner_model.predict_entities(
+                    header['text'], header['labels'], threshold=header.get('threshold', 0.5)
+                )
+            return {'ok': True, 'entities': [_jsonable(e) for e in entities]}, b''
+
+        if op == 'batch_predict_entities':
+            texts, labels, threshold = header['texts'], header['labels'], header.get('threshold', 0.5)
+            with self._gliner_lock:
+                if hasattr(self.gliner_model, 'batch_predict_entities'):
+                    results = self.gliner_model.batch_predict_entities(texts, labels, threshold=threshold)
+                else:
+                    results = [self.gliner_model.predict_entities(t, labels, threshold=threshold) for t in texts]
+            return {'ok': True, 'results': [[_jsonable(e) for e in r] for r in results]}, b''
+
+        if op == 'encode':
+            texts = header['texts']
+            if hasattr(self.embedder, 'submit'):
+                futures = [self.embedder.submit(t) for t in texts]
+                vectors = np.stack([f.result() for f in futures]) if futures else np.empty((0, 0))
+            else:
+                vectors = np.asarray(self.embedder.encode(texts))
+            vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+            return {'ok': True, 'shape': list(vectors.shape)}, vectors.tobytes()
+
+        return {'ok': False, 'error': f"Unknown op: {op}"}, b''
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+def _socket_answers(socket_path):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(1.0)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        return False
+    finally:
+        sock.close()
+    return True
+
+
+def _jsonable(entity):
+    return {k: (float(v) if isinstance(v, np.floating) else v) for k, v in entity.items()}
+
+
+# --- Client ---
+class ModelServerClient:
+    """
+    Thin client with the same call shape as the local models:
+        client.predict_entities(text, labels, threshold=0.3) -> list of dicts
+        client.encode("text") -> 1-D array, client.encode([...]) -> 2-D array
+    Each thread keeps its own connection; a dropped connection is retried once (a timeout or
+    a model-side error is not: ModelServerUnavailable / ModelServerError are raised right away).
+    A successful health check is trusted for health_ttl seconds (see is_available).
+    """
+
+    def __init__(self, socket_path, timeout=30.0, health_ttl=5.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.health_ttl = health_ttl
+        self._healthy_until = 0.0  # time.monotonic() until which is_available() skips the round trip
+        self._local = threading.local()
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        return sock
+
+    def _close(self):
+        sock = getattr(self._local, 'sock', None)
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+        self._local.sock = None
+
+    def _call(self, header):
+        for attempt in range(2):
+            try:
+                if getattr(self._local, 'sock', None) is None:
+                    self._local.sock = self._connect()
+                send_message(self._local.sock, header)
+                reply, body = recv_message(self._local.sock)
+                break
+            except TimeoutError as e:
+                # Busy or hung: retrying would block for another full timeout
+                self._close()
+                self._healthy_until = 0.0
+                raise ModelServerUnavailable(f"Model server at {self.socket_path} did not answer within {self.timeout}s") from e
+            except (OSError, ConnectionError) as e:
+                self._close()
+                if attempt:
+                    self._healthy_until = 0.0
+                    raise ModelServerUnavailable(f"Model server at {self.socket_path} is unreachable: {e}") from e
+        if not reply.get('ok'):
+            raise ModelServerError(reply.get('error', 'Unknown model server error'))
+        return reply, body
+
+    def health(self):
+        """Returns the daemon's health dict, or None when it is down."""
+        try:
+            reply, _ = self._call({'op': 'health'})
+        except ModelServerUnavailable:
+            return None
+        return reply
+
+    def is_available(self):
+        if time.monotonic() < self._healthy_until:
+            return True
+        reply = self.health()
+        available = bool(reply and all(reply['models'].values()))
+        if available:
+            self._healthy_until = time.monotonic() + self.health_ttl
+        return available
+
+    def predict_entities(self, text, labels, threshold=0.5, **kwargs):
+        reply, _ = self._call({'op': 'predict_entities', 'text': text, 'labels': list(labels), 'threshold': threshold})
+        return reply['entities']
+
+    def batch_predict_entities(self, texts, labels, threshold=0.5, **kwargs):
+        reply, _ = self._call({'op': 'batch_predict_entities', 'texts': list(texts), 'labels': list(labels), 'threshold': threshold})
+        return reply['results']
+
+    def encode(self, sentences, **kwargs):
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        reply, body = self._call({'op': 'encode', 'texts': texts})
+        vectors = np.frombuffer(body, dtype=np.float32).reshape(reply['shape'])
+        return vectors[0] if single else vectors
@@ -1,5 +1,19 @@
+from django.core.validators import MinValueValidator
 from django.db import models
 from django.conf import settings
+from .vectors import VectorField
+
+# Progress of the background AI pipeline (shared with candidates.Application)
+PROCESSING_STATUS_CHOICES = [
+    ('QUEUED', 'Queued'),
+    ('EXTRACTING', 'Extracting'),
+    ('EMBEDDING', 'Embedding'),
+    ('SCORED', 'Scored'),
+    ('FAILED', 'Failed'),
+]
+
+# Job fields holding the applicant ranking weights (candidates.scoring)
+RANKING_WEIGHT_FIELDS = ['similarity_weight', 'skills_weight', 'experience_weight']
 
 class Job(models.Model):
     posted_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -10,7 +24,8 @@ class Job(models.Model):
     # AI Fields
     processed_text = models.TextField(blank=True)
     gliner_entities = models.JSONField(blank=True, null=True)
-    jina_embedding = models.JSONField(blank=True, null=True)
+    jina_embedding = VectorField(blank=True, null=True)  # Packed, normalised float32
+    stage_keys = models.JSONField(default=dict, blank=True)  # Input hash + version per AI stage (jobs.stages)
     
     # NEW FIELD: Status
     STATUS_CHOICES = [
@@ -18,9 +33,33 @@ class Job(models.Model):
         ('CLOSED', 'Closed'),
     ]
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='OPEN')
+    processing_status = models.CharField(max_length=12, choices=PROCESSING_STATUS_CHOICES, default='QUEUED')
+
+    # Ranking weights (see candidates.scoring): relative, normalised over the parts that apply
+    similarity_weight = models.FloatField(default=0.6, validators=[MinValueValidator(0)])
+    skills_weight = models.FloatField(default=0.3, validators=[MinValueValidator(0)])
+    experience_weight = models.FloatField(default=0.1, validators=[MinValueValidator(0)])
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
+
+
+class Skill(models.Model):
+    """Canonical skill name (lower-cased, synonyms folded: 'k8s' -> 'kubernetes'). See jobs.skills."""
+    name = models.CharField(max_length=100, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
+class JobSkill(models.Model):
+    """Inverted index: which jobs ask for a skill. Rebuilt from gliner_entities by the pipeline."""
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='skill_links')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='job_links')
+
+    class Meta:
+        unique_together = ('job', 'skill')
+        indexes = [models.Index(fields=['skill', 'job'], name='jobskill_skill_job_idx')]
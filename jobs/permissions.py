@@ -1,5 +1,9 @@
 from rest_framework import permissions
 
+class IsCandidate(permissions.BasePermission):
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and request.user.role == 'Candidate'
+
 class IsHR(permissions.BasePermission):
     def has_permission(self, request, view):
         return request.user.is_authenticated and request.user.role == 'HR'
@@ -0,0 +1,175 @@
+"""
+"Recommended for you": ranks open jobs for a candidate by CV similarity.
+
+The embeddings of all OPEN jobs are kept in one in-process float32 matrix, so a
+feed is a single matrix-vector product. Job post_save/post_delete signals
+(jobs/signals.py) update single rows in this process; before each query a cheap
+count / max(updated_at) check picks up edits made by other processes, such as the
+task worker storing a new embedding.
+"""
+import threading
+from datetime import timedelta
+
+import numpy as np
+from django.db.models import Count, Max
+
+from .models import Job
+from .vectors import VECTOR_DTYPE
+
+# Jobs saved just before the last seen updated_at are read again, in case they committed late
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+def _open_jobs():
+    return Job.objects.filter(status='OPEN', jina_embedding__isnull=False)
+
+
+class OpenJobsMatrix:
+    """Thread-safe matrix of open job vectors (one row per job), updated row by row."""
+
+    def __init__(self):
+        self.dim = None
+        self._ids = np.empty(0, dtype=np.int64)
+        self._matrix = None
+        self._size = 0
+        self._positions = {}
+        self._stamp = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._size
+
+    # --- Row updates ---
+    def apply(self, job):
+        """Adds, replaces or drops the row for a job depending on its status and embedding."""
+        with self._lock:
+            self._apply(job.id, job.status, job.jina_embedding)
+
+    def remove(self, job_id):
+        with self._lock:
+            self._remove(job_id)
+
+    def _apply(self, job_id, status, vec):
+        if status != 'OPEN' or vec is None:
+            self._remove(job_id)
+            return
+        if self.dim is None:
+            self.dim = vec.shape[0]
+            self._matrix = np.empty((0, self.dim), dtype=VECTOR_DTYPE)
+        if vec.shape[0] != self.dim:
+            self._remove(job_id)  # Stale model dimension; re-embed the job
+            return
+
+        pos = self._positions.get(job_id)
+        if pos is None:
+            if self._size == len(self._ids):
+                self._grow()
+            pos = self._size
+            self._size += 1
+            self._positions[job_id] = pos
+            self._ids[pos] = job_id
+        self._matrix[pos] = vec
+
+    def _remove(self, job_id):
+        pos = self._positions.pop(job_id, None)
+        if pos is None:
+            return
+        last = self._size - 1
+        if pos != last:
+            # Move the last row into the hole
+            moved = int(self._ids[last])
+            self._ids[pos] = moved
+            self._matrix[pos] = self._matrix[last]
+            self._positions[moved] = pos
+        self._size -= 1
+
+    def _grow(self):
+        capacity = max(64, len(self._ids) * 2)
+        ids = np.empty(capacity, dtype=np.int64)
+        ids[:self._size] = self._ids[:self._size]
+        matrix = np.empty((capacity, self.dim), dtype=VECTOR_DTYPE)
+        matrix[:self._size] = self._matrix[:self._size]
+        self._ids, self._matrix = ids, matrix
+
+    # --- Sync with the database ---
+    def sync(self):
+        with self._lock:
+            self._sync()
+
+    def _sync(self):
+        stamp = _open_jobs().aggregate(count=Count('id'), latest=Max('updated_at'))
+        if stamp == self._stamp:
+            return
+
+        if self._stamp is None or self._stamp['latest'] is None:
+            self._rebuild()
+        else:
+            changed = Job.objects.filter(updated_at__gte=self._stamp['latest'] - SYNC_OVERLAP)
+            for job_id, status, vec in changed.values_list('id', 'status', 'jina_embedding'):
+                self._apply(job_id, status, vec)
+            # Deleted elsewhere (no row left to report it): start over
+            if self._size != stamp['count']:
+                self._rebuild()
+        self._stamp = stamp
+
+    def _rebuild(self):
+        self._positions.clear()
+        self._size = 0
+        for job_id, vec in _open_jobs().values_list('id', 'jina_embedding').iterator(chunk_size=1000):
+            self._apply(job_id, 'OPEN', vec)
+
+    # --- Query ---
+    def top(self, vec, k, exclude=()):
+        """Syncs, then returns up to k (job_id, cosine similarity) pairs, best first, skipping excluded job ids."""
+        with self._lock:
+            self._sync()
+            if self._size == 0 or vec.shape[0] != self.dim:
+                return []
+            scores = self._matrix[:self._size] @ vec
+            ids = self._ids[:self._size].copy()
+            excluded = [self._positions[job_id] for job_id in exclude if job_id in self._positions]
+            scores[excluded] = -np.inf
+
+        k = min(k, len(scores) - len(excluded))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(ids[i]), float(scores[i])) for i in top]
+
+
+_matrix = None
+_matrix_lock = threading.Lock()
+
+
+def get_open_jobs_matrix(create=True):
+    """Process-wide matrix, built from the database on first query (create=False: only if it exists)."""
+    global _matrix
+    with _matrix_lock:
+        if _matrix is None and create:
+            _matrix = OpenJobsMatrix()
+    return _matrix
+
+
+def recommend_jobs(candidate, k=6):
+    """
+    Open jobs ranked for a candidate by their most recent CV embedding, excluding
+    jobs they already applied to. Returns a list of (job, score 0-100); empty until
+    one of their CVs has been processed.
+    """
+    from candidates.models import Application
+
+    applications = Application.objects.filter(candidate=candidate)
+    cv_vec = (
+        applications.filter(cv_embedding__isnull=False)
+        .order_by('-embedded_at', '-created_at')
+        .values_list('cv_embedding', flat=True)
+        .first()
+    )
+    if cv_vec is None:
+        return []
+
+    applied = set(applications.values_list('job_id', flat=True))
+    hits = get_open_jobs_matrix().top(cv_vec, k, exclude=applied)
+    jobs = Job.objects.select_related('posted_by').in_bulk([job_id for job_id, _ in hits])
+    return [(jobs[job_id], round(score * 100, 2)) for job_id, score in hits if job_id in jobs]
@@ -1,24 +1,48 @@
 from rest_framework import serializers
-from .models import Job
+from .models import Job, RANKING_WEIGHT_FIELDS
 
 class JobSerializer(serializers.ModelSerializer):
     # This helps the frontend show "John Doe" instead of just user ID 5
     posted_by_name = serializers.ReadOnlyField(source='posted_by.full_name') 
+    # Stored as packed float32; exposed as a plain list of floats
+    jina_embedding = serializers.SerializerMethodField()
 
     class Meta:
         model = Job
         fields = [
             'id', 'title', 'description_text', 'description_file', 
             'processed_text', 'gliner_entities', 'jina_embedding', 
-            'posted_by', 'posted_by_name', 'status', 'created_at', 'updated_at'
+            'posted_by', 'posted_by_name', 'status', 'processing_status',
+            'similarity_weight', 'skills_weight', 'experience_weight', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['posted_by', 'processed_text', 'gliner_entities', 'jina_embedding', 'created_at', 'updated_at']
+        read_only_fields = ['posted_by', 'processed_text', 'gliner_entities', 'jina_embedding', 'processing_status', 'created_at', 'updated_at']
+
+    def get_jina_embedding(self, obj):
+        return obj.jina_embedding.tolist() if obj.jina_embedding is not None else None
 
     def validate(self, data):
         """
         Check that the user supplied either text OR a file. 
         We don't want empty jobs.
         """
-        if not data.get('description_text') and not data.get('description_file'):
+        instance = self.instance
+        if not data.get('description_text', getattr(instance, 'description_text', None)) and \
+                not data.get('description_file', getattr(instance, 'description_file', None)):
             raise serializers.ValidationError("You must provide either a description text or upload a PDF file.")
-        return data
\ No newline at end of file
+        weights = [
+            data.get(f, getattr(instance, f) if instance else Job._meta.get_field(f).default)
+            for f in RANKING_WEIGHT_FIELDS
+        ]
+        if any(f in data for f in RANKING_WEIGHT_FIELDS) and sum(weights) <= 0:
+            raise serializers.ValidationError("At least one ranking weight must be above zero.")
+        return data
+
+
+class RecommendedJobSerializer(serializers.ModelSerializer):
+    """Light job card for the candidate's "recommended for you" feed (no embedding / entities)."""
+    posted_by_name = serializers.ReadOnlyField(source='posted_by.full_name')
+    score = serializers.FloatField(source='recommendation_score', read_only=True)
+
+    class Meta:
+        model = Job
+        fields = ['id', 'title', 'description_text', 'posted_by_name', 'status', 'created_at', 'score']
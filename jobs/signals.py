@@ -0,0 +1,21 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Job
+from .recommendations import get_open_jobs_matrix
+
+
+@receiver(post_save, sender=Job)
+def update_open_jobs_matrix(sender, instance, **kwargs):
+    """Keeps this process's open-jobs matrix current once the save is committed."""
+    matrix = get_open_jobs_matrix(create=False)
+    if matrix is not None:
+        transaction.on_commit(lambda: matrix.apply(instance))
+
+
+@receiver(post_delete, sender=Job)
+def drop_from_open_jobs_matrix(sender, instance, **kwargs):
+    matrix = get_open_jobs_matrix(create=False)
+    if matrix is not None:
+        transaction.on_commit(lambda: matrix.remove(instance.id))
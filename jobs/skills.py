@@ -0,0 +1,174 @@
+"""
+Skill vocabulary shared by jobs and CVs.
+
+- SkillMatcher: multi-pattern matcher for the keyword safety net. An Aho-Corasick
+  automaton is built once from the skills taxonomy file and finds every skill in a
+  single linear pass over the text, instead of one regex per skill per CV.
+- Canonical skill names (synonyms folded) and the Skill / JobSkill rows that let
+  the database filter applicants and jobs by skill.
+"""
+from collections import deque
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+
+# Entity labels that count as technical skills when comparing a CV with a job
+TECH_LABELS = {'Skill', 'Technology', 'Framework', 'Programming Language', 'Database', 'Tool', 'Platform', 'Cloud', 'Service'}
+# Labels indexed into the Skill tables (adds the job-only 'Software' and the keyword safety net)
+SKILL_INDEX_LABELS = TECH_LABELS | {'Software', 'Skill (Detected)'}
+
+SKILL_SYNONYMS = {
+    "drf": "django rest framework", "reactjs": "react", "js": "javascript",
+    "aws": "amazon web services", "postgres": "postgresql", "k8s": "kubernetes",
+}
+SKILL_NAME_MAX_LENGTH = 100
+
+
+def load_taxonomy(path=None):
+    """Reads the taxonomy file: one skill per line, '#' comments, case-insensitive. Keeps file order."""
+    path = path or settings.SKILLS_TAXONOMY_PATH
+    skills = []
+    seen = set()
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            skill = line.strip().lower()
+            if skill and not skill.startswith('#') and skill not in seen:
+                seen.add(skill)
+                skills.append(skill)
+    return skills
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == '_'
+
+
+def _lower_aligned(text):
+    """
+    text.lower() with exactly one character per input character, so offsets into the result
+    are offsets into `text` ('İ' lower-cases to two characters; it is folded to 'i' instead).
+    """
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return ''.join(ch.lower()[0] for ch in text)
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over lower-cased skill names.
+    Matches must sit on word boundaries, so 'go' does not match inside 'good'
+    (symbol-ended skills like 'c++' or 'c#' only need the boundary on their word side).
+    """
+
+    def __init__(self, skills):
+        self.skills = list(skills)
+        # Node i: goto[i] = {char: node}, fail[i] = node, out[i] = [skills ending here]
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+
+        for skill in self.skills:
+            node = 0
+            for ch in skill:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(skill)
+
+        # Breadth-first pass to wire failure links and merge outputs (depth-1 nodes fail to the root)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find_all(self, text):
+        """Yields (start, end, skill) for every word-bounded occurrence. Text is lower-cased here."""
+        text = _lower_aligned(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        length = len(text)
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for skill in out[node]:
+                start = i - len(skill) + 1
+                if _is_word_char(skill[0]) and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if _is_word_char(skill[-1]) and i + 1 < length and _is_word_char(text[i + 1]):
+                    continue
+                yield start, i + 1, skill
+
+    def find_skills(self, text):
+        """Distinct skills present in the text, in order of first appearance."""
+        return list(dict.fromkeys(skill for _, _, skill in self.find_all(text)))
+
+
+@lru_cache(maxsize=None)
+def get_skill_matcher():
+    """Process-wide matcher built from settings.SKILLS_TAXONOMY_PATH on first use."""
+    return SkillMatcher(load_taxonomy())
+
+
+# --- Canonical skills (database index) ---
+def canonical_skill_name(text):
+    """'  K8s ' -> 'kubernetes'. Lower-cased, trimmed, synonyms folded."""
+    key = ' '.join(text.split()).lower()
+    return SKILL_SYNONYMS.get(key, key)
+
+
+def entity_skill_names(entities):
+    """Canonical names of the skill entities in a gliner_entities / extracted_data list."""
+    names = set()
+    for item in entities or []:
+        if item.get('label') in SKILL_INDEX_LABELS:
+            name = canonical_skill_name(item['text'])
+            if name and len(name) <= SKILL_NAME_MAX_LENGTH:
+                names.add(name)
+    return names
+
+
+def get_skill_ids(names):
+    """Bulk get-or-create of Skill rows. Returns {name: id}."""
+    from .models import Skill
+
+    names = set(names)
+    if not names:
+        return {}
+    Skill.objects.bulk_create([Skill(name=name) for name in names], ignore_conflicts=True)
+    return dict(Skill.objects.filter(name__in=names).values_list('name', 'id'))
+
+
+def replace_skill_links(link_model, owner_field, entities_by_owner):
+    """
+    Rewrites the skill join rows of jobs/applications from their entities
+    ({owner id: entities}); a handful of bulk queries however many owners.
+    """
+    names_by_owner = {owner_id: entity_skill_names(entities) for owner_id, entities in entities_by_owner.items()}
+    skill_ids = get_skill_ids(set().union(*names_by_owner.values()))
+    # One transaction, so a failure between the two never leaves an owner without skills
+    with transaction.atomic():
+        link_model.objects.filter(**{f'{owner_field}__in': list(names_by_owner)}).delete()
+        link_model.objects.bulk_create([
+            link_model(**{owner_field: owner_id, 'skill_id': skill_ids[name]})
+            for owner_id, names in names_by_owner.items() for name in names
+        ], batch_size=1000)
+
+
+def set_job_skills(job):
+    from .models import JobSkill
+
+    replace_skill_links(JobSkill, 'job_id', {job.id: job.gliner_entities})
@@ -0,0 +1,86 @@
+"""
+Stage-level cache keys for the AI pipeline.
+
+Each stage (extract -> entities -> embed) stamps its output with the hash of its input
+and a version string naming the code and model that produced it:
+
+    stage_keys = {'entities': {'input': '<sha1>', 'version': 'cv-entities:1:<gliner>:...'}, ...}
+
+The pipelines (jobs.utils / candidates.utils) and `manage.py reprocess` compare the stamp a
+stage would get now with the stored one and only redo the stages that differ, so a title
+edit redoes nothing and a new Jina model only re-embeds.
+"""
+import hashlib
+import os
+from functools import lru_cache
+
+from django.conf import settings
+
+STAGES = ('extract', 'entities', 'embed')
+
+
+def content_hash(*parts):
+    """sha1 over str / bytes parts (None counts as empty)."""
+    digest = hashlib.sha1()
+    for part in parts:
+        if part is None:
+            part = b''
+        elif isinstance(part, str):
+            part = part.encode('utf-8')
+        digest.update(part)
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+def _directory_fingerprint(path):
+    """Cheap identity of a model directory: file names, sizes and modification times."""
+    if not os.path.isdir(path):
+        return 'missing'
+    entries = []
+    for root, _, files in os.walk(path):
+        for name in sorted(files):
+            full = os.path.join(root, name)
+            stat = os.stat(full)
+            entries.append(f"{os.path.relpath(full, path)}:{stat.st_size}:{stat.st_mtime_ns}")
+    return content_hash(*sorted(entries))[:12]
+
+
+def _file_fingerprint(path):
+    try:
+        with open(path, 'rb') as f:
+            return content_hash(f.read())[:12]
+    except OSError:
+        return 'missing'
+
+
+@lru_cache(maxsize=None)
+def model_versions():
+    """Versions of what the stages depend on, computed once per process."""
+    return {
+        'gliner': settings.GLINER_MODEL_NAME,
+        'jina': settings.JINA_MODEL_VERSION or _directory_fingerprint(settings.JINA_MODEL_PATH),
+        'taxonomy': _file_fingerprint(settings.SKILLS_TAXONOMY_PATH),
+    }
+
+
+def stage_version(kind, stage, code_version):
+    """Version string of one stage: 'job' / 'cv' pipeline, stage name, code version, plus its model settings."""
+    versions = model_versions()
+    parts = [f"{kind}-{stage}", code_version]
+    if stage == 'extract':
+        parts += [settings.PDF_MAX_PAGES, settings.PDF_MAX_TEXT_CHARS]
+    elif stage == 'entities':
+        parts += [versions['gliner'], settings.GLINER_WINDOW_WORDS, settings.GLINER_WINDOW_OVERLAP]
+        if kind == 'cv':
+            parts.append(versions['taxonomy'])  # Keyword safety net
+    elif stage == 'embed':
+        parts.append(versions['jina'])
+    return ':'.join(str(p) for p in parts)
+
+
+def stage_stamp(kind, stage, code_version, input_hash):
+    return {'input': input_hash, 'version': stage_version(kind, stage, code_version)}
+
+
+def is_current(stage_keys, stage, stamp):
+    return (stage_keys or {}).get(stage) == stamp
@@ -1,3 +1,52 @@
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from candidates.models import Application
+from users.models import User
+from .models import Job
+from .skills import SkillMatcher
+
+
+class SkillMatcherTests(SimpleTestCase):
+
+    def test_offsets_index_the_original_text(self):
+        matcher = SkillMatcher(['python', 'django', 'go'])
+        text = 'İİ İstanbul: Python, DJANGO and Go'
+        spans = [(start, end, skill) for start, end, skill in matcher.find_all(text)]
+        self.assertEqual([skill for _, _, skill in spans], ['python', 'django', 'go'])
+        for start, end, skill in spans:
+            self.assertEqual(text[start:end].lower(), skill)
+
+    def test_word_boundaries(self):
+        matcher = SkillMatcher(['go', 'c++'])
+        self.assertEqual(matcher.find_skills('Good C++ developer, going places'), ['c++'])
+
+
+class JobWeightUpdateTests(TestCase):
+
+    def setUp(self):
+        self.hr = User.objects.create_user(email='hr@example.com', password='pass', role='HR', full_name='HR')
+        self.job = Job.objects.create(
+            posted_by=self.hr, title='Backend Developer', description_text='Python and Django developer',
+            gliner_entities=[{'text': 'Python', 'label': 'Skill'}, {'text': 'Django', 'label': 'Skill'}],
+        )
+        candidate = User.objects.create_user(email='c@example.com', password='pass', role='Candidate', full_name='C')
+        self.application = Application.objects.create(
+            job=self.job, candidate=candidate, cv_file='cvs/c.pdf',
+            similarity_score=80.0, skill_coverage=0.5, match_score=0,
+        )
+        self.api = APIClient()
+        self.api.force_authenticate(self.hr)
+
+    def test_put_with_unchanged_text_reranks_on_new_weights(self):
+        response = self.api.put(f'/api/jobs/{self.job.id}/', {
+            'title': self.job.title, 'description_text': self.job.description_text,
+            'similarity_weight': 0, 'skills_weight': 1, 'experience_weight': 0,
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.application.refresh_from_db()
+        self.assertEqual(self.application.match_score, 50.0)  # Skills only: half of them covered
+
+        self.api.patch(f'/api/jobs/{self.job.id}/', {'similarity_weight': 1, 'skills_weight': 0}, format='json')
+        self.application.refresh_from_db()
+        self.assertEqual(self.application.match_score, 80.0)
@@ -1,9 +1,10 @@
 from django.urls import path
-from .views import JobListCreateView, JobDetailView
+from .views import JobListCreateView, JobDetailView, RecommendedJobsView
 
 app_name = 'jobs'
 
 urlpatterns = [
     path('', JobListCreateView.as_view(), name='job-list-create'),
     path('<int:pk>/', JobDetailView.as_view(), name='job-detail'),
+    path('recommended/', RecommendedJobsView.as_view(), name='job-recommended'),
 ]
\ No newline at end of file
@@ -1,26 +1,16 @@
-import fitz  # PyMuPDF
 from django.apps import apps
 import re  # Regex for logic
 from numpy.linalg import norm
 import numpy as np
-
-def extract_text_from_pdf(pdf_file):
-    """
-    Extracts text using 'Layout Analysis' (Blocks).
-    Essential for multi-column Job Descriptions.
-    """
-    text = ""
-    try:
-        with fitz.open(stream=pdf_file.read(), filetype="pdf") as doc:
-            for page in doc:
-                blocks = page.get_text("blocks")
-                # Sort by vertical position (top->bottom), then horizontal (left->right)
-                blocks.sort(key=lambda b: (b[1], b[0]))
-                for b in blocks:
-                    text += b[4] + "\n"
-    except Exception as e:
-        print(f"❌ Error reading PDF: {e}")
-    return text
+from .models import Job
+from .embeddings import get_embedding_batcher
+from .entities import predict_entities_windowed
+from candidates.storage import hash_file
+from .extraction import extract_text_from_pdf
+from .metrics import observe_document, record_error, stage_timer
+from .skills import set_job_skills
+from .stages import content_hash, is_current, stage_stamp
+from .vectors import normalize_vector
 
 def extract_years_required(text):
     """
@@ -42,6 +32,54 @@ def extract_years_required(text):
             return 0
     return 0
 
+def set_processing_status(instance, status):
+    """
+    Writes only the pipeline stage column so the UI can show progress mid-pipeline.
+    Works for both Job and Application.
+    """
+    type(instance).objects.filter(pk=instance.pk).update(processing_status=status)
+    instance.processing_status = status
+
+def queue_job_processing(job_instance):
+    """Marks the job as queued and hands it to the background worker."""
+    from tasks.queue import enqueue
+
+    set_processing_status(job_instance, 'QUEUED')
+    enqueue('process_job', job_id=job_instance.id)
+
+def process_job_task(job_id):
+    """Task handler: runs the AI pipeline for a job (see tasks.queue)."""
+    job = Job.objects.filter(pk=job_id).first()
+    if job is None:
+        return  # Deleted while queued
+    try:
+        # Raises while the model server is down, so the queue retries later
+        apps.get_app_config('jobs').require_models()
+        changed = run_ai_pipeline(job)
+    except Exception:
+        set_processing_status(job, 'FAILED')
+        raise
+
+    if job.processing_status != 'SCORED':
+        return
+    from tasks.queue import enqueue
+
+    # New embedding or entities -> existing applicants' scores are stale
+    if changed & {'entities', 'embed'} and job.applications.exists():
+        enqueue('rescore_job', job_id=job.id)
+    # Shortlist past applicants from the talent pool
+    if 'embed' in changed:
+        enqueue('match_talent_pool', job_id=job.id)
+
+# Bump a stage's number when its code changes; `manage.py reprocess` then redoes that stage
+JOB_STAGE_VERSIONS = {'extract': 1, 'entities': 1, 'embed': 1}
+
+JOB_ENTITY_LABELS = [
+    "Skill", "Technology", "Framework", "Programming Language", 
+    "Software", "Tool", "Platform", "Database", "Cloud", "Service",
+    "Job Title", "Degree", "Qualification", "Experience"
+]
+
 def run_ai_pipeline(job_instance):
     print(f"--- Processing Job: {job_instance.title} ---")
 
@@ -51,85 +89,154 @@ def run_ai_pipeline(job_instance):
         jina = JobsConfig.jina_model
     except LookupError:
         print("⚠️ Jobs app not found.")
-        return
+        set_processing_status(job_instance, 'FAILED')
+        return set()
 
     if not gliner or not jina:
         print("⚠️ AI Models not loaded.")
-        return
+        set_processing_status(job_instance, 'FAILED')
+        return set()
+
+    changed = run_job_stages(job_instance, gliner, on_stage=lambda status: set_processing_status(job_instance, status))
+    if not job_instance.processed_text:
+        set_processing_status(job_instance, 'FAILED')
+        return changed
+
+    job_instance.processing_status = 'SCORED' if job_instance.stage_keys.get('embed') else 'FAILED'
+    with stage_timer('job', 'save'):
+        job_instance.save()
+        # Skill index used by database-side filters
+        if 'entities' in changed:
+            set_job_skills(job_instance)
+    if changed:
+        print(f"✅ Job Processing Complete (ran: {', '.join(sorted(changed))}).")
+    else:
+        print("♻️ Job unchanged since last run; reused every stage.")
+    return changed
+
+def job_extract_stamp(job_instance):
+    file_hash = hash_file(job_instance.description_file) if job_instance.description_file else ''
+    return stage_stamp('job', 'extract', JOB_STAGE_VERSIONS['extract'],
+                       content_hash(job_instance.description_text, file_hash))
+
+def current_job_stamps(job_instance):
+    """Stamps each stage would get from the job's current inputs and stored outputs (dry runs, --adopt)."""
+    text_hash = content_hash(job_instance.processed_text)
+    return {
+        'extract': job_extract_stamp(job_instance),
+        'entities': stage_stamp('job', 'entities', JOB_STAGE_VERSIONS['entities'], text_hash),
+        'embed': stage_stamp('job', 'embed', JOB_STAGE_VERSIONS['embed'], text_hash),
+    }
+
+def run_job_stages(job_instance, gliner, force=False, on_stage=None):
+    """
+    Extract -> GLiNER -> Jina for one job, skipping stages whose stamp (jobs.stages) still matches.
+    Updates the job's AI fields and stage_keys in memory (the caller saves).
+    Returns the set of stages that ran. A failed stage is left unstamped so the next run retries it.
+    """
+    stamps = {} if force else dict(job_instance.stage_keys or {})
+    changed = set()
 
     # 1. Get & Clean Text
+    stamp = job_extract_stamp(job_instance)
+    if not is_current(stamps, 'extract', stamp):
+        if on_stage:
+            on_stage('EXTRACTING')
+        job_instance.processed_text = extract_job_text(job_instance)
+        stamps['extract'] = stamp
+        changed.add('extract')
+
+    clean_text = job_instance.processed_text
+    if not clean_text:
+        job_instance.stage_keys = stamps
+        return changed
+
+    # 2. GLiNER Extraction
+    stamp = stage_stamp('job', 'entities', JOB_STAGE_VERSIONS['entities'], content_hash(clean_text))
+    if not is_current(stamps, 'entities', stamp):
+        try:
+            job_instance.gliner_entities = extract_job_entities(clean_text, gliner)
+            stamps['entities'] = stamp
+        except Exception as e:
+            print(f"❌ GLiNER Error: {e}")
+            job_instance.gliner_entities = []
+            stamps.pop('entities', None)
+        changed.add('entities')
+
+    # 3. Jina Embedding
+    stamp = stage_stamp('job', 'embed', JOB_STAGE_VERSIONS['embed'], content_hash(clean_text))
+    if not is_current(stamps, 'embed', stamp) or job_instance.jina_embedding is None:
+        if on_stage:
+            on_stage('EMBEDDING')
+        try:
+            # Goes through the micro-batcher so concurrent workers share forward passes
+            with stage_timer('job', 'encode'):
+                embedding = get_embedding_batcher().encode(clean_text)
+            job_instance.jina_embedding = normalize_vector(embedding)
+            stamps['embed'] = stamp
+        except Exception as e:
+            print(f"❌ Jina Embedding Error: {e}")
+            stamps.pop('embed', None)
+        changed.add('embed')
+
+    job_instance.stage_keys = stamps
+    return changed
+
+def extract_job_text(job_instance):
+    """Description text plus the PDF's text, cleaned."""
     raw_text = job_instance.description_text or ""
     
     if job_instance.description_file:
         try:
-            file_text = extract_text_from_pdf(job_instance.description_file)
+            with stage_timer('job', 'extract'):
+                file_text = extract_text_from_pdf(job_instance.description_file)
             if file_text:
                 raw_text += "\n" + file_text
-            job_instance.description_file.seek(0)
+            else:
+                record_error('job', 'extract')  # Read errors are logged and come back as empty text
         except Exception as e:
             print(f"⚠️ Failed to process file: {e}")
+    observe_document('job', raw_text)
 
     # Cleaning: Remove bullets but keep structure
-    clean_text = raw_text.replace("•", "").replace("●", "").replace("- ", "")
-    clean_text = re.sub(r'\s+', ' ', clean_text).strip()
+    with stage_timer('job', 'clean'):
+        clean_text = raw_text.replace("•", "").replace("●", "").replace("- ", "")
+        return re.sub(r'\s+', ' ', clean_text).strip()
+
+def extract_job_entities(clean_text, gliner):
+    """GLiNER entities of a job description plus the Min_Years_Req logic entity."""
+    # Windowed + batched so long descriptions are not truncated
+    with stage_timer('job', 'predict_entities'):
+        entities = predict_entities_windowed(gliner, clean_text, JOB_ENTITY_LABELS, threshold=0.3)
     
-    job_instance.processed_text = clean_text
-
-    if not clean_text:
-        return
-
-    # 2. GLiNER Extraction
-    labels = [
-        "Skill", "Technology", "Framework", "Programming Language", 
-        "Software", "Tool", "Platform", "Database", "Cloud", "Service",
-        "Job Title", "Degree", "Qualification", "Experience"
-    ]
+    unique_data = []
+    seen = set()
     
-    try:
-        entities = gliner.predict_entities(clean_text, labels, threshold=0.3)
+    # --- LOGIC STEP: EXTRACT YEARS REQUIREMENT ---
+    # We calculate this mathematically to ensure accuracy
+    req_years = extract_years_required(clean_text)
+    if req_years > 0:
+        # We add a special system label for the Comparison Logic
+        unique_data.append({"label": "Min_Years_Req", "text": str(req_years)})
+        print(f"🔢 Logic Found Requirement: {req_years}+ Years")
+
+    for e in entities:
+        text = e['text'].strip()
+        label = e['label']
         
-        unique_data = []
-        seen = set()
-        
-        # --- LOGIC STEP: EXTRACT YEARS REQUIREMENT ---
-        # We calculate this mathematically to ensure accuracy
-        req_years = extract_years_required(clean_text)
-        if req_years > 0:
-            # We add a special system label for the Comparison Logic
-            unique_data.append({"label": "Min_Years_Req", "text": str(req_years)})
-            print(f"🔢 Logic Found Requirement: {req_years}+ Years")
-
-        for e in entities:
-            text = e['text'].strip()
-            label = e['label']
-            
-            # --- FIX 1: FORCE EXPERIENCE RELABELING ---
-            # Correct Python syntax: check 'year' OR 'years'
-            if "year" in text.lower():
-                label = "Experience"
-
-            # --- FIX 2: FORCE AWS/TECH RELABELING ---
-            if text.upper() in ["AWS", "AZURE", "GCP", "EC2", "RDS", "LAMBDA", "DOCKER", "KUBERNETES", "GIT", "GITHUB", "LINUX"]:
-                if label not in ["Job Title", "Experience"]:
-                    label = "Technology"
-
-            key = (label, text.lower())
-            if key not in seen:
-                seen.add(key)
-                unique_data.append({"label": label, "text": text})
-
-        job_instance.gliner_entities = unique_data
-
-    except Exception as e:
-        print(f"❌ GLiNER Error: {e}")
-        job_instance.gliner_entities = []
-
-    # 3. Jina Embedding
-    try:
-        embedding = jina.encode(clean_text)
-        job_instance.jina_embedding = embedding.tolist()
-    except Exception as e:
-        print(f"❌ Jina Embedding Error: {e}")
-
-    job_instance.save()
-    print("✅ Job Processing Complete.")
\ No newline at end of file
+        # --- FIX 1: FORCE EXPERIENCE RELABELING ---
+        # Correct Python syntax: check 'year' OR 'years'
+        if "year" in text.lower():
+            label = "Experience"
+
+        # --- FIX 2: FORCE AWS/TECH RELABELING ---
+        if text.upper() in ["AWS", "AZURE", "GCP", "EC2", "RDS", "LAMBDA", "DOCKER", "KUBERNETES", "GIT", "GITHUB", "LINUX"]:
+            if label not in ["Job Title", "Experience"]:
+                label = "Technology"
+
+        key = (label, text.lower())
+        if key not in seen:
+            seen.add(key)
+            unique_data.append({"label": label, "text": text})
+
+    return unique_data
@@ -0,0 +1,55 @@
+import numpy as np
+from django.db import models
+
+VECTOR_DTYPE = np.float32
+
+
+def normalize_vector(vec):
+    """Returns the vector as a unit-length float32 array (zero vectors stay zero)."""
+    arr = np.asarray(vec, dtype=VECTOR_DTYPE).ravel()
+    length = np.linalg.norm(arr)
+    if length > 0:
+        arr = arr / length
+    return arr.astype(VECTOR_DTYPE, copy=False)
+
+
+def pack_vector(vec):
+    """Normalises and packs an embedding into raw float32 bytes for storage."""
+    return normalize_vector(vec).tobytes()
+
+
+def unpack_vector(blob):
+    """Zero-copy, read-only float32 view over stored bytes (bytes or memoryview from the DB driver)."""
+    return np.frombuffer(blob, dtype=VECTOR_DTYPE)
+
+
+class VectorField(models.BinaryField):
+    """
+    Embedding column stored as packed, pre-normalised float32 (bytea on Postgres).
+    Loads come back as numpy arrays via np.frombuffer, so there is no JSON parsing
+    and cosine similarity is a single dot product.
+    """
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return None
+        return unpack_vector(value)
+
+    def to_python(self, value):
+        if value is None or isinstance(value, np.ndarray):
+            return value
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return unpack_vector(value)
+        if isinstance(value, str):
+            # Serialized fixtures store base64, like BinaryField
+            return unpack_vector(super().to_python(value))
+        return normalize_vector(value)
+
+    def get_prep_value(self, value):
+        if value is None:
+            return None
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return value
+        if len(value) == 0:
+            return None
+        return pack_vector(value)
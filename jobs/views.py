@@ -1,20 +1,35 @@
+import hmac
+
+import numpy as np
+from django.conf import settings
+from django.http import Http404, HttpResponse
 from rest_framework import generics, permissions
-from .models import Job
-from .serializers import JobSerializer
-from .utils import run_ai_pipeline
-from .permissions import IsHR # Assuming you created this from previous response
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from Smart_Hire_Solutions.fast_lists import FastListMixin
+from candidates.scoring import rank_job_applications
+from .metrics import CONTENT_TYPE, render_metrics
+from .models import Job, RANKING_WEIGHT_FIELDS
+from .recommendations import recommend_jobs
+from .serializers import JobSerializer, RecommendedJobSerializer
+from .utils import queue_job_processing
+from .permissions import IsCandidate, IsHR # Assuming you created this from previous response
+
+RECOMMENDATIONS_MAX_RESULTS = 50
 
-class JobListCreateView(generics.ListCreateAPIView):
+class JobListCreateView(FastListMixin, generics.ListCreateAPIView):
     queryset = Job.objects.all().order_by('-created_at')
     serializer_class = JobSerializer
     permission_classes = [permissions.IsAuthenticated] # Add IsHR if you want strict control
+    # float32 array -> list of Python floats, the same numbers get_jina_embedding returns
+    fast_sources = {'jina_embedding': ('jina_embedding', np.ndarray.tolist)}
 
     def perform_create(self, serializer):
         # Save the job first
         job = serializer.save(posted_by=self.request.user)
         
-        # Run AI Pipeline (Extract -> GLiNER -> Jina)
-        run_ai_pipeline(job)
+        # Queue AI Pipeline (Extract -> GLiNER -> Jina) for the background worker
+        queue_job_processing(job)
 
 class JobDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Job.objects.all()
@@ -26,4 +41,40 @@ class JobDetailView(generics.RetrieveUpdateDestroyAPIView):
         
         # Rerun AI if text/file changed
         if 'description_text' in self.request.data or 'description_file' in self.request.data:
-            run_ai_pipeline(job)
\ No newline at end of file
+            queue_job_processing(job)
+        # New weights: re-rank from the stored score parts, no model needed. Done even when
+        # the description was sent too: an unchanged text reuses every stage and rescores nothing
+        if any(field in serializer.validated_data for field in RANKING_WEIGHT_FIELDS):
+            rank_job_applications(job)
+
+class RecommendedJobsView(APIView):
+    """
+    Candidate's "recommended for you" feed: open jobs ranked by fit with their latest CV.
+    Optional ?k=<results, default 10>.
+    """
+    permission_classes = [IsCandidate]
+
+    def get(self, request):
+        try:
+            k = min(max(int(request.query_params.get('k', 10)), 1), RECOMMENDATIONS_MAX_RESULTS)
+        except ValueError:
+            k = 10
+        jobs = []
+        for job, score in recommend_jobs(request.user, k=k):
+            job.recommendation_score = score
+            jobs.append(job)
+        return Response(RecommendedJobSerializer(jobs, many=True).data)
+
+
+def metrics_view(request):
+    """
+    Pipeline metrics of this process in the Prometheus text format (see jobs.metrics).
+    404 unless METRICS_ENABLED; with METRICS_TOKEN set, scrapers send "Authorization: Bearer <token>".
+    """
+    if not settings.METRICS_ENABLED:
+        raise Http404
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), expected):
+            return HttpResponse(status=401)
+    return HttpResponse(render_metrics(), content_type=CONTENT_TYPE)
@@ -0,0 +1,17 @@
+from django.contrib import admin
+from .models import OutboxEmail, Task
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'run_after', 'created_at')
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'last_error')
+    readonly_fields = ('payload', 'attempts', 'last_error', 'locked_at', 'created_at', 'updated_at')
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'status', 'attempts', 'send_after', 'sent_at', 'created_at')
+    list_filter = ('status',)
+    search_fields = ('subject', 'to', 'last_error')
+    readonly_fields = ('attempts', 'last_error', 'locked_at', 'sent_at', 'created_at', 'updated_at')
@@ -0,0 +1,86 @@
+import threading
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from jobs.embeddings import get_embedding_batcher
+from jobs.metrics import start_metrics_server
+from tasks.queue import claim_next_task, run_task
+
+
+class Command(BaseCommand):
+    help = "Runs background workers that process queued CV and job tasks."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, default=settings.TASK_WORKER_CONCURRENCY,
+            help="Number of worker threads (they share one copy of the AI models).",
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=settings.TASK_POLL_INTERVAL,
+            help="Seconds to sleep when the queue is empty.",
+        )
+        parser.add_argument(
+            '--metrics-port', type=int, default=settings.METRICS_WORKER_PORT,
+            help="Serve this worker's pipeline metrics on http://<host>:<port>/metrics (needs METRICS_ENABLED).",
+        )
+        parser.add_argument(
+            '--burst', action='store_true',
+            help="Exit once the queue is empty instead of polling forever.",
+        )
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options['concurrency'])
+        poll_interval = options['poll_interval']
+        burst = options['burst']
+
+        # Workers are the only processes that actually need the models: warm them up now
+        # rather than on the first task (set MODEL_EAGER_WARMUP=False to load on demand).
+        if settings.MODEL_EAGER_WARMUP:
+            apps.get_app_config('jobs').load_models()
+
+        if options['metrics_port'] and settings.METRICS_ENABLED:
+            start_metrics_server(options['metrics_port'])
+            self.stdout.write(f"📊 Metrics on port {options['metrics_port']}/metrics")
+
+        stop_event = threading.Event()
+        threads = [
+            threading.Thread(
+                target=self.work_loop, args=(stop_event, poll_interval, burst),
+                name=f"task-worker-{i + 1}", daemon=True,
+            )
+            for i in range(concurrency)
+        ]
+
+        self.stdout.write(f"🚀 Starting {concurrency} worker thread(s)...")
+        for t in threads:
+            t.start()
+
+        try:
+            while any(t.is_alive() for t in threads):
+                for t in threads:
+                    t.join(timeout=0.5)
+        except KeyboardInterrupt:
+            self.stdout.write("🛑 Stopping workers (waiting for running tasks)...")
+            stop_event.set()
+            for t in threads:
+                t.join()
+
+        batcher = get_embedding_batcher()
+        if batcher is not None:
+            self.stdout.write(f"📊 Embedding batches: {batcher.stats()}")
+        self.stdout.write(self.style.SUCCESS("Workers stopped."))
+
+    def work_loop(self, stop_event, poll_interval, burst):
+        while not stop_event.is_set():
+            close_old_connections()
+            task = claim_next_task()
+            if task is None:
+                if burst:
+                    break
+                stop_event.wait(poll_interval)
+                continue
+            run_task(task)
+        connection.close()
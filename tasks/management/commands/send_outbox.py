@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tasks.outbox import claim_emails, send_emails
+
+
+class Command(BaseCommand):
+    help = (
+        "Sends every email due in the outbox now, in batches over one SMTP connection each "
+        "(what the 'dispatch_outbox' task does, without a worker). Handy against a local SMTP stand-in."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.EMAIL_OUTBOX_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        while True:
+            emails = claim_emails(options['batch_size'])
+            if not emails:
+                break
+            sent, failed = send_emails(emails)
+            total_sent += sent
+            total_failed += failed
+            self.stdout.write(f"   batch of {len(emails)}: {sent} sent, {failed} failed")
+        self.stdout.write(self.style.SUCCESS(f"✅ Outbox: {total_sent} sent, {total_failed} failed (failures are retried later)."))
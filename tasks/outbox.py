@@ -0,0 +1,143 @@
+"""
+Transactional email outbox.
+
+Views add emails to the outbox inside the transaction that changes the data they announce
+(e.g. shortlisting), so an invite is never sent for a rolled-back change and the request
+never waits on SMTP. The 'dispatch_outbox' task then sends pending emails in batches over
+one reused connection, at most EMAIL_OUTBOX_RATE_PER_SECOND, retrying failures with backoff.
+
+Point EMAIL_HOST / EMAIL_PORT at a local SMTP stand-in (EMAIL_USE_TLS=False) to exercise
+it without Gmail.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F, Min, Q
+from django.utils import timezone
+
+from .models import OutboxEmail, Task
+from .queue import enqueue
+
+
+def build_email(subject, body, to, from_email=None):
+    """An unsaved outbox row; pass a list of them to queue_emails()."""
+    return OutboxEmail(
+        subject=subject, body=body, to=list(to),
+        from_email=from_email or settings.EMAIL_HOST_USER or 'noreply@smarthire.com',
+        max_attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+    )
+
+
+def queue_emails(emails):
+    """Stores the emails and schedules a dispatch, in the caller's transaction. Returns the saved rows."""
+    if not emails:
+        return []
+    emails = OutboxEmail.objects.bulk_create(emails)
+    schedule_dispatch()
+    return emails
+
+
+def schedule_dispatch(run_after=None):
+    """
+    Makes sure a dispatch runs by `run_after` (default now). One pending dispatch is enough,
+    as it reschedules itself while emails wait; a later one (e.g. waiting on an email's retry)
+    is pulled forward instead of leaving new emails behind it.
+    """
+    run_after = run_after or timezone.now()
+    pending = Task.objects.filter(name='dispatch_outbox', status='PENDING')
+    if pending.filter(run_after__lte=run_after).exists():
+        return
+    if not pending.update(run_after=run_after, updated_at=timezone.now()):
+        enqueue('dispatch_outbox', run_after=run_after)
+
+
+def claim_emails(limit):
+    """Locks up to `limit` due emails (and ones stuck in SENDING past TASK_LOCK_TIMEOUT) for this worker."""
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=settings.TASK_LOCK_TIMEOUT)
+    with transaction.atomic():
+        ids = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(Q(status='PENDING', send_after__lte=now) | Q(status='SENDING', locked_at__lt=stale_before))
+            .order_by('send_after', 'id')
+            .values_list('id', flat=True)[:limit]
+        )
+        OutboxEmail.objects.filter(id__in=ids).update(status='SENDING', locked_at=now, attempts=F('attempts') + 1)
+    return list(OutboxEmail.objects.filter(id__in=ids).order_by('id'))
+
+
+def _release(email, error):
+    """Schedules a retry with linear backoff, or gives up after max_attempts."""
+    email.last_error = str(error)
+    email.locked_at = None
+    if email.attempts < email.max_attempts:
+        email.status = 'PENDING'
+        email.send_after = timezone.now() + timedelta(seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * email.attempts)
+    else:
+        email.status = 'FAILED'
+        print(f"❌ Giving up on email #{email.id} to {', '.join(email.to)}: {error}")
+    email.save(update_fields=['status', 'send_after', 'last_error', 'locked_at', 'updated_at'])
+
+
+def send_emails(emails, connection=None):
+    """
+    Sends claimed emails over one connection, paced to EMAIL_OUTBOX_RATE_PER_SECOND.
+    Returns (sent, failed) counts; failed emails are rescheduled or marked FAILED.
+    """
+    connection = connection or get_connection(fail_silently=False)
+    interval = 1 / settings.EMAIL_OUTBOX_RATE_PER_SECOND if settings.EMAIL_OUTBOX_RATE_PER_SECOND > 0 else 0
+    try:
+        connection.open()
+    except Exception as e:
+        print(f"⚠️ Could not connect to the mail server: {e}")
+        for email in emails:
+            _release(email, e)
+        return 0, len(emails)
+
+    sent, failed = [], 0
+    try:
+        for email in emails:
+            started = time.monotonic()
+            message = EmailMessage(email.subject, email.body, email.from_email, email.to, connection=connection)
+            try:
+                connection.send_messages([message])
+                sent.append(email.id)
+            except Exception as e:
+                _release(email, e)
+                failed += 1
+                # The server may have dropped us; reconnect for the rest of the batch
+                connection.close()
+                try:
+                    connection.open()
+                except Exception:
+                    pass
+            wait = interval - (time.monotonic() - started)
+            if wait > 0:
+                time.sleep(wait)
+    finally:
+        connection.close()
+
+    OutboxEmail.objects.filter(id__in=sent).update(
+        status='SENT', sent_at=timezone.now(), locked_at=None, last_error='', updated_at=timezone.now()
+    )
+    return len(sent), failed
+
+
+def dispatch_outbox_task():
+    """Task handler: sends one batch of due emails, then reschedules itself while any are waiting."""
+    emails = claim_emails(settings.EMAIL_OUTBOX_BATCH_SIZE)
+    if emails:
+        sent, failed = send_emails(emails)
+        print(f"📧 Outbox: {sent} sent, {failed} failed")
+
+    # Next pending email, or the moment a SENDING row counts as stale (its worker died)
+    due = [OutboxEmail.objects.filter(status='PENDING').aggregate(due=Min('send_after'))['due']]
+    stuck_since = OutboxEmail.objects.filter(status='SENDING').aggregate(since=Min('locked_at'))['since']
+    if stuck_since is not None:
+        due.append(stuck_since + timedelta(seconds=settings.TASK_LOCK_TIMEOUT))
+    due = [d for d in due if d is not None]
+    if due:
+        schedule_dispatch(run_after=min(due))
@@ -0,0 +1,140 @@
+import threading
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Task
+
+# Task name -> dotted path of the function that runs it.
+# Handlers receive the task payload as keyword arguments.
+TASK_HANDLERS = {
+    'process_job': 'jobs.utils.process_job_task',
+    'process_application': 'candidates.utils.process_application_task',
+    'ingest_cvs': 'candidates.ingestion.ingest_cvs_task',
+    'rescore_job': 'candidates.scoring.rescore_job_task',
+    'match_talent_pool': 'candidates.talent_pool.match_talent_pool_task',
+    'dispatch_outbox': 'tasks.outbox.dispatch_outbox_task',
+}
+
+# Task name -> dotted path of a function called with the payload once the task has failed for good
+# (out of attempts, or its worker was lost on the last one), to settle the rows it was working on.
+TASK_FAILURE_HANDLERS = {
+    'ingest_cvs': 'candidates.ingestion.ingest_cvs_failed',
+}
+
+
+def enqueue(name, max_attempts=None, run_after=None, **payload):
+    """
+    Stores a task for the worker pool and returns immediately (or schedules it for run_after).
+    Runs inside the caller's transaction, so the task only becomes visible once the data it refers to is committed.
+    """
+    if name not in TASK_HANDLERS:
+        raise ValueError(f"Unknown task: {name}")
+    return Task.objects.create(
+        name=name,
+        payload=payload,
+        max_attempts=max_attempts or settings.TASK_MAX_ATTEMPTS,
+        run_after=run_after or timezone.now(),
+    )
+
+
+def claim_next_task():
+    """
+    Locks the next runnable task with SKIP LOCKED so concurrent workers never grab the same row.
+    A running task renews its lock every TASK_HEARTBEAT_INTERVAL, so one whose lock is older than
+    TASK_LOCK_TIMEOUT lost its worker (OOM kill, crash) and is picked up again as a new attempt,
+    or marked FAILED when that was its last one.
+    """
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=settings.TASK_LOCK_TIMEOUT)
+
+    with transaction.atomic():
+        while True:
+            task = (
+                Task.objects.select_for_update(skip_locked=True)
+                .filter(
+                    Q(status='PENDING', run_after__lte=now) |
+                    Q(status='RUNNING', locked_at__lt=stale_before)
+                )
+                .order_by('run_after', 'id')
+                .first()
+            )
+            if task is None:
+                return None
+            if task.status == 'PENDING' or task.attempts < task.max_attempts:
+                break
+            # Its worker died on every attempt (e.g. the input crashes the process): stop reclaiming it
+            task.last_error = f"Worker stopped renewing the lock for {settings.TASK_LOCK_TIMEOUT}s on the last attempt."
+            task.status = 'FAILED'
+            task.locked_at = None
+            task.save(update_fields=['status', 'last_error', 'locked_at', 'updated_at'])
+            print(f"❌ Task {task} failed permanently (worker lost).")
+            _run_failure_handler(task)
+
+        task.status = 'RUNNING'
+        task.attempts += 1
+        task.locked_at = now
+        task.save(update_fields=['status', 'attempts', 'locked_at', 'updated_at'])
+    return task
+
+
+def _run_failure_handler(task):
+    if task.name not in TASK_FAILURE_HANDLERS:
+        return
+    try:
+        with transaction.atomic():
+            import_string(TASK_FAILURE_HANDLERS[task.name])(**task.payload)
+    except Exception:
+        print(f"⚠️ Failure handler of task {task} raised:\n{traceback.format_exc()}")
+
+
+def _renew_lock(task_id, stop):
+    # Runs beside the handler (own thread and DB connection) until `stop` is set
+    try:
+        while not stop.wait(settings.TASK_HEARTBEAT_INTERVAL):
+            Task.objects.filter(pk=task_id, status='RUNNING').update(locked_at=timezone.now())
+    finally:
+        connection.close()
+
+
+def run_task(task):
+    """
+    Executes a claimed task, renewing its lock while the handler runs so long tasks are not reclaimed.
+    Failures are retried with linear backoff until max_attempts is reached.
+    """
+    stop = threading.Event()
+    heartbeat = threading.Thread(target=_renew_lock, args=(task.id, stop), name=f"task-{task.id}-heartbeat", daemon=True)
+    heartbeat.start()
+    error = None
+    try:
+        handler = import_string(TASK_HANDLERS[task.name])
+        handler(**task.payload)
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        stop.set()
+        heartbeat.join()
+
+    task.locked_at = None
+    if error is None:
+        task.status = 'DONE'
+        task.save(update_fields=['status', 'locked_at', 'updated_at'])
+        return True
+
+    task.last_error = error
+    if task.attempts < task.max_attempts:
+        task.status = 'PENDING'
+        task.run_after = timezone.now() + timedelta(seconds=settings.TASK_RETRY_DELAY * task.attempts)
+        print(f"⚠️ Task {task} failed (attempt {task.attempts}), retrying.")
+    else:
+        task.status = 'FAILED'
+        print(f"❌ Task {task} failed permanently.")
+    task.save(update_fields=['status', 'run_after', 'last_error', 'locked_at', 'updated_at'])
+    if task.status == 'FAILED':
+        _run_failure_handler(task)
+    return False
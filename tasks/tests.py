@@ -0,0 +1,100 @@
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from .models import OutboxEmail, Task
+from .outbox import build_email, queue_emails
+from .queue import TASK_HANDLERS, claim_next_task, enqueue, run_task
+
+
+class RejectingBackend(EmailBackend):
+    """locmem backend whose server refuses one mailbox."""
+
+    def send_messages(self, messages):
+        if any('bad@example.com' in message.to for message in messages):
+            raise ConnectionError('550 mailbox unavailable')
+        return super().send_messages(messages)
+
+
+def slow_handler(seconds):
+    """Outlives TASK_LOCK_TIMEOUT, then records whether another worker could take the task over."""
+    time.sleep(seconds)
+    slow_handler.reclaimed = claim_next_task()
+    slow_handler.locked_at = Task.objects.get(name='slow').locked_at
+
+
+def run_due_tasks():
+    while (task := claim_next_task()):
+        run_task(task)
+
+
+@override_settings(EMAIL_OUTBOX_RATE_PER_SECOND=0, EMAIL_OUTBOX_RETRY_DELAY=600)
+class OutboxDispatchTests(TestCase):
+
+    def setUp(self):
+        patcher = mock.patch('tasks.outbox.get_connection', lambda **kwargs: RejectingBackend())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_new_email_is_not_held_behind_one_in_backoff(self):
+        queue_emails([build_email('Invite', 'Hi', ['bad@example.com'])])
+        run_due_tasks()
+        failed = OutboxEmail.objects.get(to=['bad@example.com'])
+        self.assertEqual(failed.status, 'PENDING')
+        self.assertGreater(failed.send_after, timezone.now())
+        # The dispatcher is now waiting for the retry, ten minutes out
+        self.assertFalse(Task.objects.filter(name='dispatch_outbox', status='PENDING', run_after__lte=timezone.now()).exists())
+
+        queue_emails([build_email('Invite', 'Hi', ['good@example.com'])])
+        run_due_tasks()
+
+        self.assertEqual(OutboxEmail.objects.get(to=['good@example.com']).status, 'SENT')
+        self.assertEqual([message.to for message in mail.outbox], [['good@example.com']])
+        self.assertEqual(OutboxEmail.objects.get(to=['bad@example.com']).status, 'PENDING')
+        self.assertEqual(Task.objects.filter(name='dispatch_outbox', status='PENDING').count(), 1)
+
+
+@override_settings(TASK_LOCK_TIMEOUT=600)
+class TaskReclaimTests(TestCase):
+
+    def stale_task(self, attempts):
+        task = enqueue('rescore_job', max_attempts=3, job_id=0)
+        Task.objects.filter(pk=task.pk).update(
+            status='RUNNING', attempts=attempts, locked_at=timezone.now() - timedelta(seconds=601)
+        )
+        return task
+
+    def test_lost_task_is_reclaimed_as_a_new_attempt(self):
+        task = self.stale_task(attempts=1)
+        claimed = claim_next_task()
+        self.assertEqual(claimed.pk, task.pk)
+        self.assertEqual(claimed.attempts, 2)
+
+    def test_lost_task_fails_after_its_last_attempt(self):
+        task = self.stale_task(attempts=3)
+        self.assertIsNone(claim_next_task())
+        task.refresh_from_db()
+        self.assertEqual(task.status, 'FAILED')
+        self.assertIsNone(task.locked_at)
+
+    def test_live_task_is_not_reclaimed(self):
+        task = self.stale_task(attempts=1)
+        Task.objects.filter(pk=task.pk).update(locked_at=timezone.now() - timedelta(seconds=30))
+        self.assertIsNone(claim_next_task())
+
+
+@override_settings(TASK_LOCK_TIMEOUT=1, TASK_HEARTBEAT_INTERVAL=0.1)
+class TaskHeartbeatTests(TransactionTestCase):
+
+    def test_running_task_renews_its_lock(self):
+        with mock.patch.dict(TASK_HANDLERS, {'slow': 'tasks.tests.slow_handler'}):
+            Task.objects.create(name='slow', payload={'seconds': 1.5})
+            task = claim_next_task()
+            self.assertTrue(run_task(task))
+        self.assertIsNone(slow_handler.reclaimed)
+        self.assertGreater(slow_handler.locked_at, task.created_at + timedelta(seconds=1))